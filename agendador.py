@@ -0,0 +1,76 @@
+import heapq
+import itertools
+import unicodedata
+
+from datas import parsear_data_br
+
+# Prioridade das tarefas de coleta: licitações abertas antes das encerradas,
+# as mais recentes antes das antigas (no portal, a página 1 é a mais nova) e,
+# entre iguais, os arquivos menores primeiro. Assim, uma execução interrompida
+# já deixa em disco o que mais interessa.
+
+SITUACOES_ABERTAS = ('aberta', 'em aberto', 'em andamento', 'publicada', 'em julgamento', 'em analise',
+                     'em disputa', 'aguardando')
+SITUACOES_ENCERRADAS = ('encerrada', 'concluida', 'homologada', 'adjudicada', 'cancelada', 'revogada',
+                        'anulada', 'deserta', 'fracassada', 'finalizada')
+TAMANHO_DESCONHECIDO = float('inf')
+# Tamanho típico (bytes) por extensão, para ordenar documentos sem consultar o servidor
+TAMANHO_POR_EXTENSAO = {
+    'txt': 10_000, 'csv': 50_000, 'doc': 100_000, 'docx': 100_000, 'odt': 100_000,
+    'xls': 200_000, 'xlsx': 200_000, 'ods': 200_000, 'pdf': 1_000_000,
+    'zip': 20_000_000, 'rar': 20_000_000, '7z': 20_000_000,
+}
+
+def _sem_acentos(texto):
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower().strip()
+
+def peso_situacao(situacao):
+    """0 = aberta, 1 = desconhecida (ainda não lida), 2 = encerrada"""
+    situacao = _sem_acentos(situacao)
+    if any(termo in situacao for termo in SITUACOES_ABERTAS):
+        return 0
+    if any(termo in situacao for termo in SITUACOES_ENCERRADAS):
+        return 2
+    return 1
+
+def tamanho_estimado(link):
+    """Tamanho típico pelo tipo do arquivo no link (None se a extensão não for conhecida)"""
+    caminho = (link or '').split('?', 1)[0].split('#', 1)[0]
+    extensao = caminho.rsplit('.', 1)[-1].lower() if '.' in caminho.rsplit('/', 1)[-1] else ''
+    return TAMANHO_POR_EXTENSAO.get(extensao)
+
+def prioridade(situacao='', publicacao='', pagina=0, posicao=0, tamanho=None):
+    """Tupla comparável (menor = mais urgente)"""
+    data = parsear_data_br(publicacao)
+    recencia = -data.toordinal() if data else 0  # sem data: depois das datadas, pela página
+    return (
+        peso_situacao(situacao),
+        0 if data else 1,
+        recencia,
+        pagina,
+        TAMANHO_DESCONHECIDO if tamanho is None else tamanho,
+        posicao,
+    )
+
+def prioridade_da_fila(pagina, posicao=0):
+    """Versão numérica para a coluna 'prioridade' da fila distribuída, onde só
+    se conhece a posição na listagem: página mais nova primeiro"""
+    return pagina * 1000 + posicao
+
+class FilaPrioridade:
+    """heapq com desempate pela ordem de chegada (os itens não precisam ser comparáveis)"""
+
+    def __init__(self):
+        self._heap = []
+        self._contador = itertools.count()
+
+    def colocar(self, prioridade, item):
+        heapq.heappush(self._heap, (prioridade, next(self._contador), item))
+
+    def tirar(self):
+        prioridade, _, item = heapq.heappop(self._heap)
+        return prioridade, item
+
+    def __len__(self):
+        return len(self._heap)
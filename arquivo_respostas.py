@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import zlib
+import socket
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:  # sem zstandard as respostas são comprimidas com zlib
+    zstandard = None
+
+# Arquivo das respostas HTML recebidas pelos scrapers, para reextrair os dados
+# sem voltar ao site quando um seletor estiver errado. Cada resposta é
+# comprimida sozinha e acrescentada ao fim de um segmento (nunca reescrito);
+# o índice SQLite guarda, por URL, o segmento, a posição e o tamanho.
+# Cada processo escreve no seu próprio segmento, então vários scrapers (ou
+# trabalhadores da coleta distribuída) podem arquivar na mesma pasta.
+
+PASTA_PADRAO = 'arquivo_respostas'
+ARQUIVO_INDICE = 'indice.sqlite'
+TAMANHO_SEGMENTO = 256 * 1024 * 1024
+TIPOS_ARQUIVADOS = ('text/html', 'application/xhtml+xml')
+
+def comprimir(conteudo):
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=10).compress(conteudo)
+    return 'zlib', zlib.compress(conteudo, 6)
+
+def descomprimir(compressao, dados):
+    if compressao == 'zlib':
+        return zlib.decompress(dados)
+    if zstandard is None:
+        raise RuntimeError("❌ zstandard não está instalado (pip install zstandard)")
+    return zstandard.ZstdDecompressor().decompress(dados)
+
+class ArquivoRespostas:
+
+    def __init__(self, pasta=PASTA_PADRAO):
+        self.pasta = pasta
+        os.makedirs(pasta, exist_ok=True)
+        self.trava = threading.Lock()
+        self.indice = sqlite3.connect(os.path.join(pasta, ARQUIVO_INDICE), timeout=60,
+                                      isolation_level=None, check_same_thread=False)
+        self.indice.execute('PRAGMA busy_timeout = 60000')
+        self.indice.execute('''
+            CREATE TABLE IF NOT EXISTS respostas (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                cabecalhos TEXT NOT NULL,
+                segmento TEXT NOT NULL,
+                posicao INTEGER NOT NULL,
+                tamanho INTEGER NOT NULL,
+                compressao TEXT NOT NULL,
+                capturado_em REAL NOT NULL
+            )
+        ''')
+        self.indice.execute('CREATE INDEX IF NOT EXISTS respostas_url ON respostas (url, id)')
+        self.segmento = None
+        self.arquivo_segmento = None
+        self.sequencia = 0
+
+    def _abrir_segmento(self):
+        if self.arquivo_segmento is not None:
+            self.arquivo_segmento.close()
+        self.sequencia += 1
+        self.segmento = (f"{datetime.now():%Y%m%d-%H%M%S}-{socket.gethostname()}-{os.getpid()}"
+                         f"-{self.sequencia:03d}.seg")
+        self.arquivo_segmento = open(os.path.join(self.pasta, self.segmento), 'ab')
+
+    def guardar(self, url, status, cabecalhos, conteudo, outras_urls=()):
+        """Grava o conteúdo uma vez; outras_urls (ex.: as de um redirecionamento)
+        ganham linhas no índice apontando para os mesmos bytes"""
+        compressao, dados = comprimir(conteudo)
+        with self.trava:
+            if self.arquivo_segmento is None or self.arquivo_segmento.tell() + len(dados) > TAMANHO_SEGMENTO:
+                self._abrir_segmento()
+            posicao = self.arquivo_segmento.tell()
+            self.arquivo_segmento.write(dados)
+            # O registro só entra no índice depois que os bytes estão no segmento
+            self.arquivo_segmento.flush()
+            agora = time.time()
+            linhas = [(endereco, status, json.dumps(cabecalhos), self.segmento, posicao, len(dados), compressao, agora)
+                      for endereco in (url, *outras_urls)]
+            self.indice.execute('BEGIN')
+            try:
+                self.indice.executemany(
+                    'INSERT INTO respostas (url, status, cabecalhos, segmento, posicao, tamanho, compressao, '
+                    'capturado_em) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', linhas
+                )
+                self.indice.execute('COMMIT')
+            except Exception:
+                self.indice.execute('ROLLBACK')
+                raise
+
+    def guardar_resposta(self, resposta):
+        """Arquiva uma requests.Response se for HTML"""
+        tipo = resposta.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if tipo not in TIPOS_ARQUIVADOS:
+            return False
+        cabecalhos = {'Content-Type': resposta.headers.get('Content-Type', '')}
+        if resposta.encoding:
+            cabecalhos['encoding'] = resposta.encoding
+        # O endereço pedido também leva à resposta, caso tenha havido redirecionamento
+        self.guardar(resposta.url, resposta.status_code, cabecalhos, resposta.content,
+                     [anterior.url for anterior in resposta.history])
+        return True
+
+    def buscar(self, url):
+        """Última resposta arquivada para a URL: (status, cabecalhos, conteudo) ou None"""
+        with self.trava:
+            linha = self.indice.execute(
+                'SELECT status, cabecalhos, segmento, posicao, tamanho, compressao FROM respostas '
+                'WHERE url = ? ORDER BY id DESC LIMIT 1', (url,)
+            ).fetchone()
+        if not linha:
+            return None
+        status, cabecalhos, segmento, posicao, tamanho, compressao = linha
+        with open(os.path.join(self.pasta, segmento), 'rb') as f:
+            f.seek(posicao)
+            conteudo = descomprimir(compressao, f.read(tamanho))
+        return status, json.loads(cabecalhos), conteudo
+
+    def estatisticas(self):
+        with self.trava:
+            respostas, urls = self.indice.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT url) FROM respostas'
+            ).fetchone()
+            # Redirecionamentos compartilham os bytes da resposta final
+            comprimido = self.indice.execute(
+                'SELECT COALESCE(SUM(tamanho), 0) FROM (SELECT DISTINCT segmento, posicao, tamanho FROM respostas)'
+            ).fetchone()[0]
+        return {'respostas': respostas, 'urls': urls, 'bytes_comprimidos': comprimido}
+
+    def fechar(self):
+        with self.trava:
+            if self.arquivo_segmento is not None:
+                self.arquivo_segmento.close()
+                self.arquivo_segmento = None
+            self.indice.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Consulta o arquivo de respostas HTML')
+    parser.add_argument('--pasta', default=PASTA_PADRAO)
+    parser.add_argument('--url', help='Mostra a última resposta arquivada para esta URL')
+    args = parser.parse_args()
+
+    arquivo = ArquivoRespostas(args.pasta)
+    if args.url:
+        encontrada = arquivo.buscar(args.url)
+        if encontrada is None:
+            print(f"❌ URL não arquivada: {args.url}")
+        else:
+            status, cabecalhos, conteudo = encontrada
+            print(conteudo.decode(cabecalhos.get('encoding') or 'utf-8', errors='replace'))
+    else:
+        estatisticas = arquivo.estatisticas()
+        print(f"📦 {estatisticas['respostas']} respostas de {estatisticas['urls']} URLs "
+              f"({estatisticas['bytes_comprimidos'] / 1024 / 1024:.1f} MB comprimidos)")
+    arquivo.fechar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import os
+import re
+import sys
+import json
+import timeit
+import hashlib
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos
+
+# Micro-benchmark das extrações com BeautifulSoup sobre páginas gravadas
+# (nenhum acesso à rede durante a medição). Para cada tipo de página mede
+# separadamente o parse do HTML e a extração dos campos, guarda o resultado
+# em benchmarks/historico.jsonl junto com o commit e compara com a referência
+# fixada em benchmarks/referencia.json: se algum caso ficar mais lento que o
+# limite, sai com código 1. Comparar sempre com a mesma referência (e não com
+# a última medição) impede que várias pequenas regressões somem sem aviso.
+#
+# As páginas ficam versionadas em benchmarks/paginas (reproduzem a marcação
+# do portal), então qualquer checkout mede exatamente o mesmo HTML.
+#
+#   python benchmark_extratores.py                       (mede e compara com a referência)
+#   python benchmark_extratores.py fixar                 (mede e grava a nova referência)
+#   python benchmark_extratores.py gravar --de-arquivo   (troca as páginas pelas do arquivo de respostas)
+#   python benchmark_extratores.py gravar --do-site      (troca as páginas por algumas baixadas agora)
+
+PASTA_BENCHMARKS = 'benchmarks'
+PASTA_PAGINAS = os.path.join(PASTA_BENCHMARKS, 'paginas')
+ARQUIVO_PAGINAS = os.path.join(PASTA_PAGINAS, 'paginas.json')
+ARQUIVO_HISTORICO = os.path.join(PASTA_BENCHMARKS, 'historico.jsonl')
+ARQUIVO_REFERENCIA = os.path.join(PASTA_BENCHMARKS, 'referencia.json')
+LIMITE_REGRESSAO = 0.20  # 20% mais lento que a referência
+REPETICOES = 7
+PAGINAS_POR_CASO = 3
+
+# Caso -> (padrão da URL, seção da listagem de onde vêm os detalhes)
+CASOS = {
+    'licitacao_listagem': (r'/licitacoes\?page=\d+$', None),
+    'licitacao_detalhe': (r'/licitacoes/[^?]+$', 'licitacao_listagem'),
+    'noticia_listagem': (r'/noticias\?page=\d+$', None),
+    'noticia_detalhe': (r'/noticias/[^?]+$', 'noticia_listagem'),
+    'legislacao_listagem': (r'/legislacoes\?page=\d+$', None),
+    'videos': (r'/videos\?page=\d+$', None),
+}
+
+def extratores():
+    """Função de extração de cada caso: recebe (soup, url)"""
+    import get_licitacoes
+    import get_noticias
+    import get_publicacoes_legislacao
+    import get_videos
+
+    def base(url):
+        partes = urlparse(url)
+        return f'{partes.scheme}://{partes.netloc}'
+
+    return {
+        'licitacao_listagem': lambda soup, url: get_licitacoes.extrair_links(soup, base(url)),
+        'licitacao_detalhe': get_licitacoes.extrair_licitacao,
+        'noticia_listagem': lambda soup, url: get_noticias.extrair_links(soup, base(url)),
+        'noticia_detalhe': get_noticias.extrair_noticia,
+        'legislacao_listagem': lambda soup, url: get_publicacoes_legislacao.parse_list(soup),
+        'videos': lambda soup, url: get_videos.parse_videos(soup),
+    }
+
+#### ---- GRAVAÇÃO DAS PÁGINAS ---- ####
+
+def salvar_paginas(paginas):
+    """paginas: lista de (caso, url, conteudo em bytes, encoding)"""
+    os.makedirs(PASTA_PAGINAS, exist_ok=True)
+    indice = []
+    contagem = {}
+    for caso, url, conteudo, encoding in paginas:
+        contagem[caso] = contagem.get(caso, 0) + 1
+        arquivo = f'{caso}-{contagem[caso]}.html'
+        with open(os.path.join(PASTA_PAGINAS, arquivo), 'wb') as f:
+            f.write(conteudo)
+        indice.append({'caso': caso, 'arquivo': arquivo, 'url': url, 'encoding': encoding or 'utf-8'})
+    with open(ARQUIVO_PAGINAS, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+    for caso in CASOS:
+        print(f"  {caso:<22} {contagem.get(caso, 0)} páginas")
+    faltando = [caso for caso in CASOS if not contagem.get(caso)]
+    if faltando:
+        print(f"⚠️ Sem páginas para: {', '.join(faltando)}")
+
+def paginas_do_arquivo(pasta, quantidade):
+    from arquivo_respostas import ArquivoRespostas
+    arquivo = ArquivoRespostas(pasta)
+    urls = [linha[0] for linha in arquivo.indice.execute(
+        'SELECT url FROM respostas WHERE status = 200 GROUP BY url ORDER BY MAX(id) DESC'
+    )]
+    paginas = []
+    for caso, (padrao, _) in CASOS.items():
+        for url in [url for url in urls if re.search(padrao, url)][:quantidade]:
+            _, cabecalhos, conteudo = arquivo.buscar(url)
+            paginas.append((caso, url, conteudo, cabecalhos.get('encoding')))
+    arquivo.fechar()
+    return paginas
+
+def paginas_do_site(base_url, quantidade):
+    from requisicoes import obter
+    secoes = {'licitacao_listagem': 'licitacoes', 'noticia_listagem': 'noticias',
+              'legislacao_listagem': 'legislacoes', 'videos': 'videos'}
+    funcoes = extratores()
+    paginas = []
+    for caso, secao in secoes.items():
+        url = f'{base_url}/{secao}?page=1'
+        resposta = obter(url)
+        if resposta.status_code != 200:
+            print(f"⚠️ {url}: {resposta.status_code}")
+            continue
+        paginas.append((caso, url, resposta.content, resposta.encoding))
+
+        # Detalhes a partir dos links desta listagem
+        detalhe = next((nome for nome, (_, origem) in CASOS.items() if origem == caso), None)
+        if detalhe:
+            links = funcoes[caso](BeautifulSoup(resposta.text, 'html.parser'), url)
+            for link in [link for link in links if link][:quantidade]:
+                resposta_detalhe = obter(link)
+                if resposta_detalhe.status_code == 200:
+                    paginas.append((detalhe, link, resposta_detalhe.content, resposta_detalhe.encoding))
+    return paginas
+
+#### ---- MEDIÇÃO ---- ####
+
+def medir(funcao):
+    """Melhor tempo por chamada, em ms (o mínimo é o menos afetado por ruído)"""
+    temporizador = timeit.Timer(funcao)
+    numero, _ = temporizador.autorange()
+    return min(temporizador.repeat(repeat=REPETICOES, number=numero)) / numero * 1000
+
+def executar_medicoes():
+    with open(ARQUIVO_PAGINAS, 'r', encoding='utf-8') as f:
+        indice = json.load(f)
+    funcoes = extratores()
+    resultados = {}
+    for pagina in indice:
+        with open(os.path.join(PASTA_PAGINAS, pagina['arquivo']), 'rb') as f:
+            html = f.read().decode(pagina['encoding'], errors='replace')
+        extrair = funcoes[pagina['caso']]
+        soup = BeautifulSoup(html, 'html.parser')
+        for nome, tempo in (
+            ('parse', medir(lambda: BeautifulSoup(html, 'html.parser'))),
+            ('extracao', medir(lambda: extrair(soup, pagina['url']))),
+        ):
+            chave = f"{pagina['caso']}:{nome}"
+            resultados[chave] = resultados.get(chave, 0.0) + tempo
+    # Média por página de cada caso
+    paginas_por_caso = {}
+    for pagina in indice:
+        paginas_por_caso[pagina['caso']] = paginas_por_caso.get(pagina['caso'], 0) + 1
+    return {chave: round(tempo / paginas_por_caso[chave.split(':')[0]], 4) for chave, tempo in resultados.items()}
+
+def impressao_paginas():
+    """Hash do conjunto de páginas: medições de conjuntos diferentes não se comparam"""
+    with open(ARQUIVO_PAGINAS, 'rb') as f:
+        conteudo = f.read()
+    sha = hashlib.sha256(conteudo)
+    for pagina in json.loads(conteudo):
+        with open(os.path.join(PASTA_PAGINAS, pagina['arquivo']), 'rb') as f:
+            sha.update(f.read())
+    return sha.hexdigest()[:16]
+
+def maquina_atual():
+    return f"{platform.node()} {platform.machine()} {platform.processor() or platform.system()}".strip()
+
+def commit_atual():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        alterado = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                       capture_output=True, text=True).stdout.strip())
+        return commit + ('+alterado' if alterado else '')
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def carregar_historico():
+    if not os.path.exists(ARQUIVO_HISTORICO):
+        return []
+    with open(ARQUIVO_HISTORICO, 'r', encoding='utf-8') as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+def carregar_referencia():
+    if not os.path.exists(ARQUIVO_REFERENCIA):
+        return None
+    with open(ARQUIVO_REFERENCIA, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def referencia(historico, commit=None):
+    """Medição de comparação: a do commit pedido ou a referência fixada"""
+    if commit:
+        candidatas = [entrada for entrada in historico if entrada['commit'].startswith(commit)]
+        return candidatas[-1] if candidatas else None
+    return carregar_referencia()
+
+def referencia_valida(anterior, paginas):
+    """Avisa quando a referência não serve para a comparação (ou serve com ressalvas)"""
+    if anterior.get('paginas') != paginas:
+        print(f"⚠️ A referência ({anterior.get('commit') or 'sem commit'}) foi medida com outro conjunto "
+              f"de páginas: rode 'python {os.path.basename(sys.argv[0])} fixar' para uma nova")
+        return False
+    if anterior.get('maquina') and anterior['maquina'] != maquina_atual():
+        print(f"⚠️ Referência medida em outra máquina ({anterior['maquina']}): as variações incluem a diferença de hardware")
+    return True
+
+def comparar(resultados, anterior, limite):
+    """Imprime a tabela e retorna os casos que passaram do limite"""
+    regressoes = []
+    print(f"\n{'caso':<32} {'ms/página':>10} {'referência':>11} {'variação':>9}")
+    for chave, tempo in sorted(resultados.items()):
+        antes = (anterior or {}).get('resultados', {}).get(chave)
+        if antes:
+            variacao = tempo / antes - 1
+            marca = ' ❌' if variacao > limite else ''
+            print(f"{chave:<32} {tempo:>10.3f} {antes:>11.3f} {variacao:>+8.1%}{marca}")
+            if variacao > limite:
+                regressoes.append(chave)
+        else:
+            print(f"{chave:<32} {tempo:>10.3f} {'-':>11} {'-':>9}")
+    return regressoes
+
+def main():
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Benchmark das extrações com BeautifulSoup'))
+    subparsers = parser.add_subparsers(dest='comando')
+
+    p_gravar = subparsers.add_parser('gravar', help='Grava as páginas usadas na medição')
+    origem = p_gravar.add_mutually_exclusive_group(required=True)
+    origem.add_argument('--de-arquivo', nargs='?', const='', metavar='PASTA',
+                        help='Copia do arquivo de respostas (padrão: a pasta da configuração)')
+    origem.add_argument('--do-site', action='store_true', help='Baixa as páginas do portal agora')
+    p_gravar.add_argument('--quantidade', type=int, default=PAGINAS_POR_CASO, help='Páginas por caso')
+    subparsers.add_parser('fixar', help=f'Mede e grava o resultado como referência ({ARQUIVO_REFERENCIA})')
+
+    parser.add_argument('--limite', type=float, default=LIMITE_REGRESSAO,
+                        help=f'Variação máxima aceita antes de falhar (padrão: {LIMITE_REGRESSAO:.0%})')
+    parser.add_argument('--referencia', metavar='COMMIT',
+                        help='Compara com a medição deste commit no histórico em vez da referência fixada')
+    parser.add_argument('--sem-historico', action='store_true', help='Não acrescenta a medição ao histórico')
+    args = parser.parse_args()
+    config = configuracao_dos_argumentos(args)
+
+    if args.comando == 'gravar':
+        if args.do_site:
+            paginas = paginas_do_site(config['site']['base_url'], args.quantidade)
+        else:
+            paginas = paginas_do_arquivo(args.de_arquivo or config['arquivo_respostas']['pasta'], args.quantidade)
+        print(f"💾 {len(paginas)} páginas gravadas em {PASTA_PAGINAS}")
+        salvar_paginas(paginas)
+        return 0
+
+    if not os.path.exists(ARQUIVO_PAGINAS):
+        print(f"❌ Nenhuma página gravada: rode 'python {os.path.basename(sys.argv[0])} gravar --de-arquivo' antes")
+        return 2
+
+    paginas = impressao_paginas()
+    resultados = executar_medicoes()
+    entrada = {
+        'horario': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_atual(),
+        'python': platform.python_version(),
+        'maquina': maquina_atual(),
+        'paginas': paginas,
+        'resultados': resultados,
+    }
+
+    if args.comando == 'fixar':
+        os.makedirs(PASTA_BENCHMARKS, exist_ok=True)
+        with open(ARQUIVO_REFERENCIA, 'w', encoding='utf-8') as f:
+            json.dump(entrada, f, ensure_ascii=False, indent=2)
+        comparar(resultados, None, args.limite)
+        print(f"\n📌 Referência gravada em {ARQUIVO_REFERENCIA} (commit {entrada['commit'] or 'desconhecido'})")
+        return 0
+
+    historico = carregar_historico()
+    anterior = referencia(historico, args.referencia)
+    if anterior is None:
+        if args.referencia:
+            print(f"⚠️ Nenhuma medição do commit {args.referencia} no histórico")
+        else:
+            print(f"⚠️ Nenhuma referência fixada: rode 'python {os.path.basename(sys.argv[0])} fixar'")
+    elif not referencia_valida(anterior, paginas):
+        anterior = None
+
+    regressoes = comparar(resultados, anterior, args.limite)
+
+    if not args.sem_historico:
+        os.makedirs(PASTA_BENCHMARKS, exist_ok=True)
+        with open(ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + '\n')
+
+    if regressoes:
+        print(f"\n❌ {len(regressoes)} casos mais de {args.limite:.0%} mais lentos que a referência "
+              f"({(anterior or {}).get('commit') or 'sem commit'})")
+        return 1
+    print("\n✅ Nenhuma regressão acima do limite")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import os
+import copy
+import json
+
+# Configuração compartilhada pelos scrapers e pelo uploader. Cada valor vem,
+# em ordem crescente de prioridade, de:
+#   1. PADRAO (abaixo)
+#   2. arquivo JSON (--config, variável JT_CONFIG ou configuracao.json)
+#   3. variáveis de ambiente JT__SECAO__CHAVE (ex.: JT__NOTICIAS__PAGINA_INICIAL=50)
+#   4. segredos do ambiente (CMS_EMAIL, CMS_SENHA), que não devem ir para o arquivo
+#   5. --set secao.chave=valor na linha de comando
+# Com uma instância definida (--instancia), os arquivos de estado (logs, caches,
+# índices, erros) vão para instancias/<nome>/ e várias execuções podem rodar lado a lado.
+
+ARQUIVO_PADRAO = 'configuracao.json'
+VARIAVEL_ARQUIVO = 'JT_CONFIG'
+PREFIXO_AMBIENTE = 'JT__'
+PASTA_INSTANCIAS = 'instancias'
+
+SEGREDOS = {
+    'CMS_EMAIL': ('cms', 'email'),
+    'CMS_SENHA': ('cms', 'senha'),
+}
+
+PADRAO = {
+    'instancia': '',
+    'site': {
+        'base_url': 'https://www.juareztavora.pb.gov.br',
+    },
+    'cms': {
+        'url': 'https://juareztavora.maximatecnologia.com.br/cms/',
+        'email': '',
+        'senha': '',
+    },
+    # Páginas percorridas da inicial até a final (as mais antigas primeiro)
+    'noticias': {'pasta': '.', 'pagina_inicial': 97, 'pagina_final': 1},
+    'licitacoes': {'pasta': 'Licitações', 'pagina_inicial': 63, 'pagina_final': 1},
+    'legislacoes': {'pasta': 'publicacoes/legislacoes', 'pagina_inicial': 47, 'pagina_final': 1},
+    'videos': {'arquivo': 'videos.json', 'pagina_inicial': 10, 'pagina_final': 1},
+    # Limites de rede dos scrapers (ver requisicoes.py). taxa_minima em bytes/s;
+    # prazo_minutos > 0 encerra a coleta de forma ordenada depois desse tempo;
+    # hedge duplica páginas de detalhes lentas (acima do p95), até orcamento_hedge das requisições
+    'rede': {'timeout_conexao': 10, 'timeout_leitura': 60, 'tentativas': 3, 'taxa_minima': 10240,
+             'prazo_minutos': 0, 'hedge': False, 'orcamento_hedge': 0.1},
+    # Gravação dos dados.json em segundo plano (ver escritor.py); fsync: nenhum, lote ou registro
+    'escrita': {'fsync': 'nenhum', 'fila': 256, 'lote': 64},
+    # Páginas HTML recebidas, comprimidas, para reextrair sem rede (ver arquivo_respostas.py)
+    'arquivo_respostas': {'ativo': True, 'pasta': 'arquivo_respostas', 'offline': False},
+    # Onde o uploader procura os registros de cada tipo de conteúdo (as mesmas
+    # pastas em que os scrapers gravam, nas seções acima) e o seletor
+    # CSS do item de cada um no menu lateral do CMS (legislações entram pelo menu
+    # Publicações). O menu e o formulário de licitações ainda não foram
+    # conferidos no CMS: sem seletor, o uploader recusa o tipo em vez de clicar
+    # no lugar errado
+    'upload': {
+        'pastas': {
+            'noticias': '.',
+            'licitacoes': 'Licitações',
+            'legislacoes': 'publicacoes/legislacoes',
+        },
+        'menus': {
+            'noticias': '.fa-fw.fa-newspaper-o',
+            'licitacoes': '',
+            'legislacoes': '.fa-fw.fa-book',
+        },
+    },
+}
+
+def converter_valor(texto):
+    """'97' vira 97, 'true' vira True, '[1, 2]' vira lista; o resto fica texto"""
+    try:
+        return json.loads(texto)
+    except ValueError:
+        return texto
+
+def definir(config, chaves, valor):
+    atual = config
+    for chave in chaves[:-1]:
+        if not isinstance(atual.get(chave), dict):
+            atual[chave] = {}
+        atual = atual[chave]
+    atual[chaves[-1]] = valor
+
+def mesclar(base, novo):
+    for chave, valor in novo.items():
+        if isinstance(valor, dict) and isinstance(base.get(chave), dict):
+            mesclar(base[chave], valor)
+        else:
+            base[chave] = valor
+    return base
+
+def carregar_configuracao(arquivo=None, sobrescritas=(), instancia=None, ambiente=None):
+    """Monta a configuração final. 'sobrescritas' são textos 'secao.chave=valor'."""
+    ambiente = os.environ if ambiente is None else ambiente
+    config = copy.deepcopy(PADRAO)
+
+    arquivo = arquivo or ambiente.get(VARIAVEL_ARQUIVO)
+    if arquivo:
+        if not os.path.exists(arquivo):
+            raise FileNotFoundError(f"Arquivo de configuração não encontrado: {arquivo}")
+    elif os.path.exists(ARQUIVO_PADRAO):
+        arquivo = ARQUIVO_PADRAO
+    if arquivo:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            do_arquivo = json.load(f)
+        if do_arquivo.get('cms', {}).get('senha'):
+            print(f"⚠️ Senha do CMS em {arquivo}: prefira a variável de ambiente CMS_SENHA")
+        mesclar(config, do_arquivo)
+
+    for nome, valor in ambiente.items():
+        if nome.startswith(PREFIXO_AMBIENTE) and len(nome) > len(PREFIXO_AMBIENTE):
+            chaves = nome[len(PREFIXO_AMBIENTE):].lower().split('__')
+            definir(config, chaves, converter_valor(valor))
+
+    for nome, chaves in SEGREDOS.items():
+        if ambiente.get(nome):
+            definir(config, list(chaves), ambiente[nome])
+
+    for item in sobrescritas:
+        caminho, separador, valor = item.partition('=')
+        if not separador or not caminho.strip():
+            raise ValueError(f"Use --set secao.chave=valor (recebido: {item!r})")
+        definir(config, caminho.strip().split('.'), converter_valor(valor))
+
+    if instancia:
+        config['instancia'] = instancia
+    return config
+
+def adicionar_argumentos(parser):
+    """Opções comuns a todos os scripts"""
+    parser.add_argument('--config', help=f'Arquivo JSON de configuração (padrão: {ARQUIVO_PADRAO} se existir)')
+    parser.add_argument('--set', dest='sobrescritas', action='append', default=[], metavar='SECAO.CHAVE=VALOR',
+                        help='Sobrescreve um valor da configuração (pode repetir)')
+    parser.add_argument('--instancia', help='Nome da instância: separa logs, caches e índices de outras execuções')
+    return parser
+
+def configuracao_dos_argumentos(args):
+    return carregar_configuracao(args.config, args.sobrescritas, args.instancia)
+
+def caminho_estado(config, nome_arquivo):
+    """Caminho de um arquivo de estado, dentro da pasta da instância se houver uma"""
+    if not config.get('instancia'):
+        return nome_arquivo
+    pasta = os.path.join(PASTA_INSTANCIAS, config['instancia'])
+    os.makedirs(pasta, exist_ok=True)
+    return os.path.join(pasta, nome_arquivo)
+
+def intervalo_paginas(config, secao):
+    """Páginas da seção na ordem de coleta (ex.: 97, 96, ..., 1)"""
+    inicial = int(config[secao]['pagina_inicial'])
+    final = int(config[secao]['pagina_final'])
+    passo = -1 if inicial >= final else 1
+    return range(inicial, final + passo, passo)
@@ -0,0 +1,336 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos, caminho_estado, intervalo_paginas
+from agendador import prioridade_da_fila
+import requisicoes
+import escritor
+from requisicoes import prazo_esgotado, PrazoEsgotado
+
+# Coleta distribuída: o coordenador ('semear') coloca as páginas de listagem
+# numa fila SQLite; cada trabalhador pega uma tarefa com lease (prazo), renova
+# o prazo com heartbeats enquanto trabalha e, ao processar uma listagem,
+# enfileira os detalhes encontrados. Se um trabalhador morre, o lease vence e
+# a tarefa volta para a fila. Vários processos e máquinas podem usar a mesma
+# fila, desde que enxerguem o mesmo arquivo (volume compartilhado) e gravem
+# os dados numa pasta também compartilhada.
+
+ARQUIVO_FILA = 'fila_crawl.sqlite'
+DURACAO_LEASE = 300  # segundos sem heartbeat até a tarefa voltar para a fila
+MAXIMO_TENTATIVAS = 3
+INTERVALO_OCIOSO = 5
+ESPERA_NOVA_TENTATIVA = 30  # multiplicada pelo número de tentativas já feitas
+ESPERA_GRAVACAO = 120  # segundos para o dados.json chegar ao disco (menor que o lease)
+FONTES = ('noticias', 'licitacoes', 'legislacoes')
+
+class TarefaFalhou(Exception):
+    pass
+
+def abrir_fila(arquivo):
+    """Abre (ou cria) a fila. Sem WAL: o modo WAL não funciona em volumes de rede."""
+    conexao = sqlite3.connect(arquivo, timeout=60, isolation_level=None)
+    conexao.execute('PRAGMA busy_timeout = 60000')
+    conexao.execute('''
+        CREATE TABLE IF NOT EXISTS tarefas (
+            id INTEGER PRIMARY KEY,
+            fonte TEXT NOT NULL,
+            etapa TEXT NOT NULL,
+            chave TEXT UNIQUE NOT NULL,
+            payload TEXT NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'pendente',
+            tentativas INTEGER NOT NULL DEFAULT 0,
+            trabalhador TEXT,
+            lease_ate REAL,
+            erro TEXT,
+            atualizado_em REAL,
+            prioridade INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    colunas = {linha[1] for linha in conexao.execute('PRAGMA table_info(tarefas)')}
+    if 'prioridade' not in colunas:  # filas criadas antes da coluna existir
+        conexao.execute('ALTER TABLE tarefas ADD COLUMN prioridade INTEGER NOT NULL DEFAULT 0')
+    conexao.execute('CREATE INDEX IF NOT EXISTS tarefas_estado ON tarefas (estado, lease_ate)')
+    return conexao
+
+def enfileirar(conexao, fonte, etapa, chave, payload, prioridade=0):
+    """Idempotente: uma chave já existente não é duplicada. Menor prioridade sai antes."""
+    cursor = conexao.execute(
+        'INSERT OR IGNORE INTO tarefas (fonte, etapa, chave, payload, atualizado_em, prioridade) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        (fonte, etapa, chave, json.dumps(payload, ensure_ascii=False), time.time(), prioridade)
+    )
+    return cursor.rowcount
+
+def semear(conexao, config, fontes):
+    """Coordenador: enfileira as páginas de listagem de cada fonte"""
+    conexao.execute('BEGIN IMMEDIATE')
+    novas = 0
+    for fonte in fontes:
+        for pagina in intervalo_paginas(config, fonte):
+            novas += enfileirar(conexao, fonte, 'listagem', f'{fonte}:listagem:{pagina}', {'pagina': pagina},
+                                prioridade_da_fila(pagina))
+    conexao.execute('COMMIT')
+    print(f"🌱 {novas} páginas de listagem enfileiradas")
+
+def pegar_tarefa(conexao, trabalhador):
+    """Reserva atomicamente a próxima tarefa pendente (ou com lease vencido)"""
+    agora = time.time()
+    conexao.execute('BEGIN IMMEDIATE')
+    try:
+        # Leases vencidos de tarefas que já esgotaram as tentativas viram falha
+        conexao.execute(
+            "UPDATE tarefas SET estado = 'falhou', erro = 'lease vencido', atualizado_em = ? "
+            "WHERE estado = 'em_andamento' AND lease_ate < ? AND tentativas >= ?",
+            (agora, agora, MAXIMO_TENTATIVAS)
+        )
+        # Listagens primeiro (elas alimentam a fila de detalhes), depois pela prioridade:
+        # páginas mais novas antes
+        linha = conexao.execute(
+            "SELECT id, fonte, etapa, payload FROM tarefas "
+            "WHERE (estado = 'pendente' AND (lease_ate IS NULL OR lease_ate < ?)) "
+            "OR (estado = 'em_andamento' AND lease_ate < ?) "
+            "ORDER BY etapa = 'detalhe', prioridade, id LIMIT 1",
+            (agora, agora)
+        ).fetchone()
+        if linha:
+            conexao.execute(
+                "UPDATE tarefas SET estado = 'em_andamento', trabalhador = ?, lease_ate = ?, "
+                "tentativas = tentativas + 1, atualizado_em = ? WHERE id = ?",
+                (trabalhador, agora + DURACAO_LEASE, agora, linha[0])
+            )
+        conexao.execute('COMMIT')
+    except Exception:
+        conexao.execute('ROLLBACK')
+        raise
+    if not linha:
+        return None
+    return {'id': linha[0], 'fonte': linha[1], 'etapa': linha[2], 'payload': json.loads(linha[3])}
+
+def concluir_tarefa(conexao, tarefa, trabalhador, erro=None):
+    """Só o dono do lease pode concluir: se ele venceu e outro pegou, o resultado é descartado"""
+    if erro is None:
+        cursor = conexao.execute(
+            "UPDATE tarefas SET estado = 'concluida', lease_ate = NULL, erro = NULL, atualizado_em = ? "
+            "WHERE id = ? AND trabalhador = ? AND estado = 'em_andamento'",
+            (time.time(), tarefa['id'], trabalhador)
+        )
+    else:
+        cursor = conexao.execute(
+            "UPDATE tarefas SET estado = CASE WHEN tentativas >= ? THEN 'falhou' ELSE 'pendente' END, "
+            "lease_ate = ? + ? * tentativas, erro = ?, atualizado_em = ? "
+            "WHERE id = ? AND trabalhador = ? AND estado = 'em_andamento'",
+            (MAXIMO_TENTATIVAS, time.time(), ESPERA_NOVA_TENTATIVA, str(erro), time.time(),
+             tarefa['id'], trabalhador)
+        )
+    if not cursor.rowcount:
+        print(f"  ⚠️ Lease da tarefa {tarefa['id']} foi perdido; resultado descartado")
+
+def liberar_tarefa(conexao, tarefa, trabalhador):
+    """Devolve à fila uma tarefa interrompida pelo prazo, sem gastar a tentativa"""
+    conexao.execute(
+        "UPDATE tarefas SET estado = 'pendente', lease_ate = NULL, tentativas = MAX(tentativas - 1, 0), "
+        "atualizado_em = ? WHERE id = ? AND trabalhador = ? AND estado = 'em_andamento'",
+        (time.time(), tarefa['id'], trabalhador)
+    )
+
+class Heartbeat(threading.Thread):
+    """Renova o lease da tarefa em andamento (conexão própria: sqlite3 não é compartilhável entre threads)"""
+
+    def __init__(self, arquivo, tarefa_id, trabalhador):
+        super().__init__(daemon=True)
+        self.arquivo = arquivo
+        self.tarefa_id = tarefa_id
+        self.trabalhador = trabalhador
+        self.parar = threading.Event()
+
+    def run(self):
+        conexao = abrir_fila(self.arquivo)
+        while not self.parar.wait(DURACAO_LEASE / 3):
+            conexao.execute(
+                "UPDATE tarefas SET lease_ate = ? WHERE id = ? AND trabalhador = ? AND estado = 'em_andamento'",
+                (time.time() + DURACAO_LEASE, self.tarefa_id, self.trabalhador)
+            )
+        conexao.close()
+
+#### ---- EXECUÇÃO DAS TAREFAS (LÓGICA DOS SCRAPERS) ---- ####
+
+def executar_listagem(conexao, config, fonte, pagina):
+    base_url = config['site']['base_url']
+    pasta = config[fonte]['pasta']
+    novas = 0
+    if fonte == 'noticias':
+        import get_noticias
+        links = get_noticias.listar_noticias(base_url, pagina)
+        if links is None:
+            raise TarefaFalhou(f'listagem de notícias {pagina} indisponível')
+        for idx, url in enumerate(links, start=1):
+            if url:
+                destino = os.path.join(pasta, f'pagina{pagina}', f'noticia{idx}')
+                novas += enfileirar(conexao, fonte, 'detalhe', f'{fonte}:{url}', {'url': url, 'pasta': destino},
+                                    prioridade_da_fila(pagina, idx))
+    elif fonte == 'licitacoes':
+        import get_licitacoes
+        links = get_licitacoes.listar_licitacoes(base_url, pagina)
+        if links is None:
+            raise TarefaFalhou(f'listagem de licitações {pagina} indisponível')
+        for idx, url in enumerate(links, start=1):
+            if url:
+                destino = os.path.join(pasta, f'Pagina{pagina}', f'licitacao{idx}')
+                novas += enfileirar(conexao, fonte, 'detalhe', f'{fonte}:{url}', {'url': url, 'pasta': destino},
+                                    prioridade_da_fila(pagina, idx))
+    else:
+        import get_publicacoes_legislacao
+        itens = get_publicacoes_legislacao.list_page(pagina, base_url)
+        if itens is None:
+            raise TarefaFalhou(f'listagem de legislações {pagina} indisponível')
+        for idx, item in enumerate(itens, start=1):
+            chave = f"{fonte}:{item['detalhes'] or item['titulo']}"
+            novas += enfileirar(conexao, fonte, 'detalhe', chave, {'item': item, 'pasta': pasta},
+                                prioridade_da_fila(pagina, idx))
+    return novas
+
+def executar_detalhe(fonte, payload):
+    if fonte == 'noticias':
+        import get_noticias
+        resultado = get_noticias.coletar_noticia(payload['url'], payload['pasta'])
+    elif fonte == 'licitacoes':
+        import get_licitacoes
+        resultado = get_licitacoes.coletar_licitacao(payload['url'], payload['pasta'])
+    else:
+        import get_publicacoes_legislacao
+        resultado = get_publicacoes_legislacao.process_item(payload['item'], payload['pasta'])
+    if resultado is None:
+        raise TarefaFalhou(f"detalhe indisponível: {payload.get('url') or payload['item']['titulo']}")
+
+def trabalhar(arquivo, config, trabalhador=None, esperar=True):
+    """Processa tarefas até a fila esvaziar (sem pendentes nem em andamento)"""
+    trabalhador = trabalhador or f'{socket.gethostname()}:{os.getpid()}'
+    conexao = abrir_fila(arquivo)
+    requisicoes.configurar(config['rede'])
+    requisicoes.configurar_arquivo(config['arquivo_respostas'])
+    escritor.configurar(config['escrita'])
+    feitas = 0
+    print(f"👷 Trabalhador {trabalhador} iniciado")
+    while True:
+        if prazo_esgotado():
+            print(f"⏰ Trabalhador {trabalhador}: prazo da execução esgotado, nenhuma tarefa nova será pega")
+            break
+        tarefa = pegar_tarefa(conexao, trabalhador)
+        if tarefa is None:
+            # Em andamento em outro trabalhador ou aguardando nova tentativa
+            ativas = conexao.execute(
+                "SELECT COUNT(*) FROM tarefas WHERE estado IN ('em_andamento', 'pendente')"
+            ).fetchone()[0]
+            if not esperar or not ativas:
+                break
+            # Outros trabalhadores ainda podem enfileirar detalhes ou abandonar leases
+            time.sleep(INTERVALO_OCIOSO)
+            continue
+
+        heartbeat = Heartbeat(arquivo, tarefa['id'], trabalhador)
+        heartbeat.start()
+        erro = None
+        interrompida = False
+        try:
+            if tarefa['etapa'] == 'listagem':
+                novas = executar_listagem(conexao, config, tarefa['fonte'], tarefa['payload']['pagina'])
+                print(f"  [+] {tarefa['fonte']} página {tarefa['payload']['pagina']}: {novas} detalhes enfileirados")
+            else:
+                executar_detalhe(tarefa['fonte'], tarefa['payload'])
+        except Exception as e:
+            erro = e
+        except PrazoEsgotado:
+            interrompida = True
+        finally:
+            heartbeat.parar.set()
+            heartbeat.join()
+        if erro is None and not interrompida and tarefa['etapa'] == 'detalhe':
+            # A tarefa só é dada como concluída com o dados.json em disco. Sem
+            # heartbeat durante a espera: se o escritor travar, o lease vence e
+            # a tarefa volta para a fila mesmo que este trabalhador não saia daqui
+            try:
+                escritor.aguardar(timeout=ESPERA_GRAVACAO)
+            except escritor.ErroGravacao as e:
+                erro = e
+        if erro is not None:
+            print(f"  ❌ Tarefa {tarefa['id']} ({tarefa['fonte']}/{tarefa['etapa']}): {erro}")
+        if interrompida:
+            liberar_tarefa(conexao, tarefa, trabalhador)
+            print(f"⏰ Tarefa {tarefa['id']} devolvida à fila: prazo da execução esgotado")
+            break
+        concluir_tarefa(conexao, tarefa, trabalhador, erro)
+        feitas += 1
+
+    try:
+        escritor.encerrar()
+    except escritor.ErroGravacao as e:
+        print(f"❌ {e}")
+    conexao.close()
+    print(f"✅ Trabalhador {trabalhador} encerrado: {feitas} tarefas processadas")
+    return feitas
+
+def _processo_trabalhador(arquivo, config, indice):
+    trabalhar(arquivo, config, f'{socket.gethostname()}:{os.getpid()}:{indice}')
+
+def mostrar_status(conexao):
+    print(f"{'fonte':<12} {'etapa':<9} {'estado':<13} {'total':>6}")
+    for fonte, etapa, estado, total in conexao.execute(
+        'SELECT fonte, etapa, estado, COUNT(*) FROM tarefas GROUP BY fonte, etapa, estado ORDER BY fonte, etapa, estado'
+    ):
+        print(f"{fonte:<12} {etapa:<9} {estado:<13} {total:>6}")
+
+def reenfileirar_falhas(conexao):
+    cursor = conexao.execute(
+        "UPDATE tarefas SET estado = 'pendente', tentativas = 0, lease_ate = NULL, erro = NULL, atualizado_em = ? "
+        "WHERE estado = 'falhou'",
+        (time.time(),)
+    )
+    print(f"🔁 {cursor.rowcount} tarefas com falha voltaram para a fila")
+
+def main():
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Coleta distribuída com fila compartilhada'))
+    parser.add_argument('--fila', help=f'Arquivo SQLite da fila, num volume compartilhado (padrão: {ARQUIVO_FILA})')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    p_semear = subparsers.add_parser('semear', help='Enfileira as páginas de listagem')
+    p_semear.add_argument('--fontes', nargs='+', choices=FONTES, default=list(FONTES))
+
+    p_trabalhar = subparsers.add_parser('trabalhar', help='Processa tarefas da fila')
+    p_trabalhar.add_argument('--processos', type=int, default=1, help='Trabalhadores nesta máquina')
+
+    subparsers.add_parser('status', help='Resumo da fila')
+    subparsers.add_parser('reenfileirar', help='Devolve as tarefas com falha para a fila')
+
+    args = parser.parse_args()
+    config = configuracao_dos_argumentos(args)
+    arquivo = args.fila or caminho_estado(config, ARQUIVO_FILA)
+    conexao = abrir_fila(arquivo)
+
+    if args.comando == 'semear':
+        semear(conexao, config, args.fontes)
+    elif args.comando == 'status':
+        mostrar_status(conexao)
+    elif args.comando == 'reenfileirar':
+        reenfileirar_falhas(conexao)
+    else:
+        conexao.close()
+        if args.processos <= 1:
+            trabalhar(arquivo, config)
+        else:
+            processos = [multiprocessing.Process(target=_processo_trabalhador, args=(arquivo, config, indice))
+                         for indice in range(args.processos)]
+            for processo in processos:
+                processo.start()
+            for processo in processos:
+                processo.join()
+        return
+    conexao.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import re
+from datetime import datetime
+
+# Datas no formato do portal, usadas pela exportação e pelo agendador.
+
+MESES = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'abril': 4,
+    'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
+    'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
+}
+
+FORMATOS_DATA = [
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+]
+
+def parsear_data_br(texto):
+    """Converte datas do portal ('23/09/2025', '23/09/2025 às 09:00' ou
+    '23 de setembro de 2025') para datetime. Retorna None se não reconhecer."""
+    if not texto:
+        return None
+    texto = texto.strip().replace(' às ', ' ')
+    texto = re.sub(r'(\d{1,2})h(\d{2})', r'\1:\2', texto)
+    if ',' in texto:
+        texto = texto.split(',', 1)[1].strip()
+
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            pass
+
+    # Formato por extenso: '23 de setembro de 2025'
+    partes = texto.lower().split()
+    if len(partes) >= 5 and partes[1] == 'de' and partes[3] == 'de':
+        mes = MESES.get(partes[2])
+        if mes and partes[0].isdigit() and partes[4].isdigit():
+            try:
+                return datetime(int(partes[4]), mes, int(partes[0]))
+            except ValueError:
+                return None
+    return None
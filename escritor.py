@@ -0,0 +1,215 @@
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+import perfil
+
+try:
+    import orjson
+except ImportError:  # sem orjson o json da biblioteca padrão é usado
+    orjson = None
+
+# Gravação dos dados.json em segundo plano: os scrapers entregam o registro
+# numa fila limitada e seguem para a próxima requisição; uma thread serializa
+# (orjson quando instalado, JSON compacto), cria as pastas e grava em lotes.
+# Política de fsync:
+#   'nenhum'   - o sistema operacional decide quando ir para o disco (mais rápido)
+#   'lote'     - um fsync por arquivo ao final de cada lote
+#   'registro' - fsync de cada arquivo antes de passar ao próximo
+# Toda gravação é atômica (arquivo temporário + os.replace). Uma falha afeta
+# só o registro dela: é contada, e aguardar()/fechar() a levantam como
+# ErroGravacao em vez de retornar como se tudo estivesse no disco.
+
+POLITICAS_FSYNC = ('nenhum', 'lote', 'registro')
+TAMANHO_FILA = 256
+TAMANHO_LOTE = 64
+INTERVALO_VERIFICACAO = 1.0  # segundos entre as checagens de que a thread segue viva
+
+_FIM = object()
+
+class ErroGravacao(Exception):
+    pass
+
+def serializar(dados):
+    if orjson is not None:
+        return orjson.dumps(dados)
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class Escritor(threading.Thread):
+
+    def __init__(self, fsync='nenhum', tamanho_fila=TAMANHO_FILA, tamanho_lote=TAMANHO_LOTE):
+        if fsync not in POLITICAS_FSYNC:
+            raise ValueError(f"Política de fsync inválida: {fsync!r} (use {', '.join(POLITICAS_FSYNC)})")
+        super().__init__(name='escritor', daemon=True)
+        self.fsync = fsync
+        self.tamanho_lote = tamanho_lote
+        self.fila = queue.Queue(maxsize=tamanho_fila)
+        self.pastas_criadas = set()
+        self.gravados = 0
+        self.falhas = 0
+        self.erros = []  # (caminho, exceção) ainda não levantados por aguardar/fechar
+        self.trava = threading.Lock()
+
+    def gravar(self, caminho, dados):
+        """Entrega o registro; só bloqueia se a fila estiver cheia"""
+        while True:
+            if not self.is_alive():
+                raise ErroGravacao(f"Escritor parado: {caminho} não será gravado")
+            try:
+                self.fila.put((caminho, dados), timeout=INTERVALO_VERIFICACAO)
+                return
+            except queue.Full:
+                continue
+
+    def aguardar(self, timeout=None):
+        """Espera tudo o que já foi entregue chegar ao disco; levanta ErroGravacao
+        se algo falhou, se a thread parou ou se o timeout (segundos) venceu"""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self.fila.all_tasks_done:
+            while self.fila.unfinished_tasks:
+                if not self.is_alive():
+                    raise ErroGravacao(f"Escritor parado com {self.fila.unfinished_tasks} registros pendentes")
+                espera = INTERVALO_VERIFICACAO
+                if limite is not None:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise ErroGravacao(f"Gravação não terminou em {timeout}s "
+                                           f"({self.fila.unfinished_tasks} registros pendentes)")
+                    espera = min(espera, restante)
+                self.fila.all_tasks_done.wait(espera)
+        self._levantar_erros()
+
+    def fechar(self):
+        if self.is_alive():
+            self.fila.put(_FIM)
+            self.join()
+        self._levantar_erros()
+
+    def _falhou(self, caminho, erro):
+        with self.trava:
+            self.falhas += 1
+            self.erros.append((caminho, erro))
+        print(f"    ❌ Erro ao gravar {caminho}: {erro}")
+
+    def _levantar_erros(self):
+        with self.trava:
+            erros, self.erros = self.erros, []
+        if erros:
+            caminho, erro = erros[0]
+            raise ErroGravacao(f"{len(erros)} arquivos não puderam ser gravados (o primeiro: {caminho}: {erro})") from erro
+
+    def run(self):
+        while True:
+            lote = [self.fila.get()]
+            while len(lote) < self.tamanho_lote:
+                try:
+                    lote.append(self.fila.get_nowait())
+                except queue.Empty:
+                    break
+            fim = any(item is _FIM for item in lote)
+            try:
+                with perfil.etapa('escritor:lote'):
+                    self._gravar_lote([item for item in lote if item is not _FIM])
+            except Exception as e:
+                self._falhou(f'lote de {len(lote)} registros', e)
+            finally:
+                for _ in lote:
+                    self.fila.task_done()
+            if fim:
+                return
+
+    def _gravar_lote(self, lote):
+        # Só a última versão de cada arquivo no lote precisa ser gravada
+        ultimos = {}
+        for caminho, dados in lote:
+            ultimos[caminho] = dados
+
+        pendentes = []
+        for caminho, dados in ultimos.items():
+            temporario = caminho + '.tmp'
+            f = None
+            try:
+                pasta = os.path.dirname(caminho)
+                if pasta not in self.pastas_criadas:
+                    if pasta:
+                        os.makedirs(pasta, exist_ok=True)
+                    self.pastas_criadas.add(pasta)
+                f = open(temporario, 'wb')
+                f.write(serializar(dados))
+                if self.fsync == 'registro':
+                    f.flush()
+                    os.fsync(f.fileno())
+                if self.fsync == 'lote':
+                    pendentes.append((f, temporario, caminho))
+                    continue
+                f.close()
+                os.replace(temporario, caminho)
+                self.gravados += 1
+            except Exception as e:
+                self._descartar(f, temporario)
+                self._falhou(caminho, e)
+
+        for f, temporario, caminho in pendentes:
+            try:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+                os.replace(temporario, caminho)
+                self.gravados += 1
+            except Exception as e:
+                self._descartar(f, temporario)
+                self._falhou(caminho, e)
+
+    @staticmethod
+    def _descartar(f, temporario):
+        """Fecha e apaga o temporário de uma gravação que falhou"""
+        try:
+            if f is not None:
+                f.close()
+            os.remove(temporario)
+        except OSError:
+            pass
+
+#### ---- ESCRITOR COMPARTILHADO PELOS SCRAPERS ---- ####
+
+_opcoes = {'fsync': 'nenhum', 'tamanho_fila': TAMANHO_FILA, 'tamanho_lote': TAMANHO_LOTE}
+_escritor = None
+_trava = threading.Lock()
+
+def configurar(escrita):
+    """Aplica a seção 'escrita' da configuração (antes da primeira gravação)"""
+    _opcoes['fsync'] = escrita.get('fsync', _opcoes['fsync'])
+    _opcoes['tamanho_fila'] = int(escrita.get('fila', _opcoes['tamanho_fila']))
+    _opcoes['tamanho_lote'] = int(escrita.get('lote', _opcoes['tamanho_lote']))
+
+def _obter_escritor():
+    global _escritor
+    with _trava:
+        if _escritor is None:
+            _escritor = Escritor(**_opcoes)
+            _escritor.start()
+        return _escritor
+
+def gravar_json(caminho, dados):
+    _obter_escritor().gravar(caminho, dados)
+
+def aguardar(timeout=None):
+    if _escritor is not None:
+        _escritor.aguardar(timeout)
+
+def encerrar():
+    """Grava o que ainda está na fila; levanta ErroGravacao se algo se perdeu"""
+    global _escritor
+    with _trava:
+        escritor, _escritor = _escritor, None
+    if escritor is not None:
+        escritor.fechar()
+
+@atexit.register
+def _encerrar_na_saida():
+    try:
+        encerrar()
+    except ErroGravacao as e:
+        print(f"❌ {e}")
@@ -0,0 +1,177 @@
+import os
+import re
+import json
+import glob
+import argparse
+
+from datas import parsear_data_br
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow só é necessário para esta etapa
+    pa = None
+    pq = None
+
+# Pasta gerada pelo get_licitacoes.py
+PASTA_LICITACOES = 'Licitações'
+ARQUIVO_SAIDA = 'licitacoes.parquet'
+ARQUIVO_SAIDA_DOCUMENTOS = 'licitacoes_documentos.parquet'
+# Licitações novas do get_licitacoes.py --incremental, fora da numeração das páginas
+PASTA_NOVAS = 'PaginaNovas'
+
+def numero_da_pasta(nome):
+    """Extrai o número de 'Pagina12' / 'licitacao3' para ordenação e colunas"""
+    encontrado = re.fullmatch(r'(?:Pagina|licitacao)(\d+)', nome)
+    return int(encontrado.group(1)) if encontrado else None
+
+def pagina_e_posicao(pasta_licitacao):
+    """(página, posição na listagem); None nas duas para as de PASTA_NOVAS,
+    que não têm lugar conhecido na listagem"""
+    pasta_pagina = os.path.basename(os.path.dirname(pasta_licitacao))
+    if pasta_pagina == PASTA_NOVAS:
+        return None, None
+    return numero_da_pasta(pasta_pagina), numero_da_pasta(os.path.basename(pasta_licitacao))
+
+def listar_arquivos_dados(pasta_base):
+    padrao = os.path.join(pasta_base, 'Pagina*', 'licitacao*', 'dados.json')
+    caminhos = glob.glob(padrao)
+
+    def ordem(caminho):
+        # As novas vão para o fim, na ordem de chegada
+        pasta_licitacao = os.path.dirname(caminho)
+        pagina, posicao = pagina_e_posicao(pasta_licitacao)
+        if pagina is None:
+            return (1, 0, numero_da_pasta(os.path.basename(pasta_licitacao)) or 0, caminho)
+        return (0, pagina, posicao or 0, caminho)
+
+    caminhos.sort(key=ordem)
+    return caminhos
+
+def montar_registros(caminhos):
+    """Lê os dados.json e devolve as linhas da tabela principal e da de documentos"""
+    licitacoes = []
+    documentos = []
+    for caminho in caminhos:
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            print(f"  ⚠️ Erro ao ler {caminho}: {e}")
+            continue
+
+        pasta_licitacao = os.path.dirname(caminho)
+        pagina, posicao = pagina_e_posicao(pasta_licitacao)
+
+        docs = []
+        for doc in dados.get('Documentos', []):
+            item = {
+                'tipo': doc.get('Tipo', ''),
+                'nome': doc.get('Nome', ''),
+                'link': doc.get('Link', ''),
+                'arquivo': doc.get('Arquivo', ''),
+                'arquivo_salvo': doc.get('ArquivoSalvo', ''),
+            }
+            docs.append(item)
+            documentos.append({
+                'numero_licitacao': dados.get('Número da Licitação', ''),
+                'link_licitacao': dados.get('Link', ''),
+                **item
+            })
+
+        publicacao = parsear_data_br(dados.get('Publicação', ''))
+        realizacao = parsear_data_br(dados.get('Realização', ''))
+
+        licitacoes.append({
+            'pagina': pagina,
+            'posicao': posicao,
+            'pasta': pasta_licitacao,
+            'modalidade': dados.get('Modalidade', ''),
+            'situacao': dados.get('Situação', ''),
+            'numero_licitacao': dados.get('Número da Licitação', ''),
+            'publicacao': publicacao.date() if publicacao else None,
+            'publicacao_texto': dados.get('Publicação', ''),
+            'unidade_gestora': dados.get('Unidade Gestora', ''),
+            'realizacao': realizacao,
+            'realizacao_texto': dados.get('Realização', ''),
+            'codigo_unidade_gestora': dados.get('Código da Unidade Gestora', ''),
+            'objetivo': dados.get('Objetivo', ''),
+            'link': dados.get('Link', ''),
+            'quantidade_documentos': len(docs),
+            'documentos': docs,
+        })
+    return licitacoes, documentos
+
+def esquemas():
+    """Esquemas explícitos para que colunas vazias não virem tipo 'null'"""
+    documento = pa.struct([
+        ('tipo', pa.string()),
+        ('nome', pa.string()),
+        ('link', pa.string()),
+        ('arquivo', pa.string()),
+        ('arquivo_salvo', pa.string()),
+    ])
+    licitacoes = pa.schema([
+        ('pagina', pa.int32()),
+        ('posicao', pa.int32()),
+        ('pasta', pa.string()),
+        ('modalidade', pa.dictionary(pa.int32(), pa.string())),
+        ('situacao', pa.dictionary(pa.int32(), pa.string())),
+        ('numero_licitacao', pa.string()),
+        ('publicacao', pa.date32()),
+        ('publicacao_texto', pa.string()),
+        ('unidade_gestora', pa.dictionary(pa.int32(), pa.string())),
+        ('realizacao', pa.timestamp('s')),
+        ('realizacao_texto', pa.string()),
+        ('codigo_unidade_gestora', pa.string()),
+        ('objetivo', pa.string()),
+        ('link', pa.string()),
+        ('quantidade_documentos', pa.int32()),
+        ('documentos', pa.list_(documento)),
+    ])
+    documentos = pa.schema([
+        ('numero_licitacao', pa.string()),
+        ('link_licitacao', pa.string()),
+        ('tipo', pa.dictionary(pa.int32(), pa.string())),
+        ('nome', pa.string()),
+        ('link', pa.string()),
+        ('arquivo', pa.string()),
+        ('arquivo_salvo', pa.string()),
+    ])
+    return licitacoes, documentos
+
+def exportar(pasta_base, destino, destino_documentos):
+    caminhos = listar_arquivos_dados(pasta_base)
+    print(f"📂 {len(caminhos)} licitações encontradas em '{pasta_base}'")
+
+    licitacoes, documentos = montar_registros(caminhos)
+    esquema_licitacoes, esquema_documentos = esquemas()
+
+    tabela = pa.Table.from_pylist(licitacoes, schema=esquema_licitacoes)
+    pq.write_table(tabela, destino, compression='zstd')
+    print(f"✅ {tabela.num_rows} licitações exportadas para {destino}")
+
+    tabela_docs = pa.Table.from_pylist(documentos, schema=esquema_documentos)
+    pq.write_table(tabela_docs, destino_documentos, compression='zstd')
+    print(f"✅ {tabela_docs.num_rows} documentos exportados para {destino_documentos}")
+
+    sem_data = sum(1 for item in licitacoes if item['publicacao_texto'] and item['publicacao'] is None)
+    if sem_data:
+        print(f"⚠️ {sem_data} datas de publicação não reconhecidas (mantidas em 'publicacao_texto')")
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta as licitações coletadas para Parquet')
+    parser.add_argument('--pasta', default=PASTA_LICITACOES, help='Pasta gerada pelo get_licitacoes.py')
+    parser.add_argument('--saida', default=ARQUIVO_SAIDA, help='Arquivo Parquet das licitações')
+    parser.add_argument('--saida-documentos', default=ARQUIVO_SAIDA_DOCUMENTOS,
+                        help='Arquivo Parquet com um documento por linha')
+    args = parser.parse_args()
+
+    if pa is None:
+        print("❌ pyarrow não está instalado (pip install pyarrow)")
+        return
+
+    exportar(args.pasta, args.saida, args.saida_documentos)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf só é necessário para esta etapa
+    PdfReader = None
+
+# Pastas gravadas por get_licitacoes.py e get_publicacoes_legislacao.py
+PASTAS_PADRAO = ['Licitações', 'publicacoes/legislacoes']
+PASTA_CACHE = '.cache_pdf_texto'
+ARQUIVO_RESUMO = 'textos_pdf.json'
+
+def hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def extrair_pdf(caminho):
+    """Roda no processo filho: extrai o texto e o número de páginas de um PDF"""
+    try:
+        leitor = PdfReader(caminho)
+        paginas = []
+        for pagina in leitor.pages:
+            paginas.append(pagina.extract_text() or '')
+        return {'paginas': len(leitor.pages), 'texto': '\n\f'.join(paginas), 'erro': ''}
+    except Exception as e:
+        return {'paginas': 0, 'texto': '', 'erro': str(e)}
+
+def listar_pdfs(pastas):
+    for pasta in pastas:
+        for root, _, files in os.walk(pasta):
+            for nome in files:
+                if nome.lower().endswith('.pdf'):
+                    yield os.path.join(root, nome)
+
+def ler_cache(pasta_cache, sha):
+    caminho = os.path.join(pasta_cache, f'{sha}.json')
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def gravar_cache(pasta_cache, sha, resultado):
+    caminho = os.path.join(pasta_cache, f'{sha}.json')
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+def salvar_ao_lado(caminho_pdf, sha, resultado, resumos):
+    """Grava <arquivo>.pdf.txt ao lado do PDF e acumula o resumo da pasta"""
+    arquivo_texto = ''
+    if resultado['texto']:
+        arquivo_texto = os.path.basename(caminho_pdf) + '.txt'
+        with open(os.path.join(os.path.dirname(caminho_pdf), arquivo_texto), 'w', encoding='utf-8') as f:
+            f.write(resultado['texto'])
+
+    resumos.setdefault(os.path.dirname(caminho_pdf), {})[os.path.basename(caminho_pdf)] = {
+        'sha256': sha,
+        'paginas': resultado['paginas'],
+        'caracteres': len(resultado['texto']),
+        'arquivo_texto': arquivo_texto,
+        'erro': resultado['erro'],
+    }
+
+def gravar_resumos(resumos):
+    """Atualiza o textos_pdf.json de cada pasta de registro tocada"""
+    for pasta, itens in resumos.items():
+        caminho = os.path.join(pasta, ARQUIVO_RESUMO)
+        existente = {}
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    existente = json.load(f)
+            except Exception:
+                existente = {}
+        existente.update(itens)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(existente, f, ensure_ascii=False, indent=2)
+
+def processar(pastas, pasta_cache, processos):
+    os.makedirs(pasta_cache, exist_ok=True)
+    resumos = {}
+    pendentes = {}
+    em_cache = 0
+
+    # O hash é calculado aqui; só PDFs com conteúdo novo vão para o pool
+    for caminho_pdf in listar_pdfs(pastas):
+        try:
+            sha = hash_arquivo(caminho_pdf)
+        except OSError as e:
+            print(f"  ⚠️ Erro ao ler {caminho_pdf}: {e}")
+            continue
+        resultado = ler_cache(pasta_cache, sha)
+        if resultado is not None:
+            salvar_ao_lado(caminho_pdf, sha, resultado, resumos)
+            em_cache += 1
+        else:
+            pendentes.setdefault(sha, []).append(caminho_pdf)
+
+    print(f"📄 {em_cache} PDFs já em cache, {len(pendentes)} para extrair com {processos} processos")
+
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        futuros = {pool.submit(extrair_pdf, caminhos[0]): sha for sha, caminhos in pendentes.items()}
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            sha = futuros[futuro]
+            resultado = futuro.result()
+            gravar_cache(pasta_cache, sha, resultado)
+            # PDFs idênticos em pastas diferentes são extraídos uma única vez
+            for caminho_pdf in pendentes[sha]:
+                salvar_ao_lado(caminho_pdf, sha, resultado, resumos)
+            if resultado['erro']:
+                print(f"  ❌ {pendentes[sha][0]}: {resultado['erro']}")
+            elif concluidos % 50 == 0:
+                print(f"  [+] {concluidos}/{len(futuros)} PDFs extraídos")
+
+    gravar_resumos(resumos)
+    print(f"\n✅ Extração concluída: {len(resumos)} pastas atualizadas")
+
+def main():
+    parser = argparse.ArgumentParser(description='Extrai o texto dos PDFs baixados pelos scrapers')
+    parser.add_argument('pastas', nargs='*', default=PASTAS_PADRAO)
+    parser.add_argument('--cache', default=PASTA_CACHE, help='Pasta do cache por hash de conteúdo')
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if PdfReader is None:
+        print("❌ pypdf não está instalado (pip install pypdf)")
+        return
+
+    processar(args.pastas, args.cache, max(1, min(args.processos, os.cpu_count() or 1)))
+
+if __name__ == "__main__":
+    main()
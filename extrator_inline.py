@@ -0,0 +1,200 @@
+import os
+import re
+import base64
+import hashlib
+import tempfile
+
+# Extrai imagens embutidas como 'data:image/...;base64,...' gravando direto em
+# disco, em blocos, sem nunca montar a imagem decodificada inteira na memória.
+# Arquivos são nomeados pelo hash do conteúdo, então a mesma imagem repetida
+# na página (ou em outra página salva na mesma pasta) vira um único arquivo.
+
+MARCADOR = b'data:'
+TAMANHO_MAXIMO_CABECALHO = 256
+TAMANHO_BLOCO = 64 * 1024
+
+CABECALHO_VALIDO = re.compile(rb'^data:([\w.+-]+/[\w.+-]+)((?:;[\w.+-]+=[\w.+-]+)*);base64$', re.IGNORECASE)
+FIM_BASE64 = re.compile(rb'[^A-Za-z0-9+/=\s]')
+ESPACOS = b' \t\r\n\f'
+
+EXTENSOES = {
+    'image/jpeg': 'jpeg',
+    'image/svg+xml': 'svg',
+    'image/x-icon': 'ico',
+    'image/vnd.microsoft.icon': 'ico',
+}
+
+def extensao_do_mime(mime):
+    mime = mime.lower()
+    return EXTENSOES.get(mime, mime.split('/')[-1])
+
+class _GravadorBase64:
+    """Decodifica base64 incrementalmente para um arquivo temporário"""
+
+    def __init__(self, pasta, mime):
+        self.pasta = pasta
+        self.mime = mime
+        self.sha = hashlib.sha256()
+        self.resto = b''
+        self.tamanho = 0
+        descritor, self.temporario = tempfile.mkstemp(dir=pasta, suffix='.parcial')
+        self.arquivo = os.fdopen(descritor, 'wb')
+
+    def _gravar(self, dados):
+        self.sha.update(dados)
+        self.arquivo.write(dados)
+        self.tamanho += len(dados)
+
+    def escrever(self, trecho):
+        # Base64 só pode ser decodificado em grupos de 4 caracteres
+        self.resto += trecho.translate(None, ESPACOS)
+        corte = len(self.resto) // 4 * 4
+        if corte:
+            self._gravar(base64.b64decode(self.resto[:corte]))
+            self.resto = self.resto[corte:]
+
+    def concluir(self, prefixo):
+        if self.resto:
+            self._gravar(base64.b64decode(self.resto + b'=' * (-len(self.resto) % 4)))
+        self.arquivo.close()
+
+        sha = self.sha.hexdigest()
+        nome = f"{prefixo}_{sha[:12]}.{extensao_do_mime(self.mime)}"
+        destino = os.path.join(self.pasta, nome)
+        duplicado = os.path.exists(destino)
+        if duplicado:
+            os.remove(self.temporario)
+        else:
+            os.replace(self.temporario, destino)
+        return {
+            'arquivo': nome,
+            'caminho': destino,
+            'mime': self.mime,
+            'sha256': sha,
+            'bytes': self.tamanho,
+            'duplicado': duplicado,
+        }
+
+    def descartar(self):
+        self.arquivo.close()
+        if os.path.exists(self.temporario):
+            os.remove(self.temporario)
+
+def extrair_inline_de_fluxo(blocos, pasta, prefixo='imagem', apenas_imagens=True):
+    """Percorre o HTML em blocos (ex.: response.iter_content()) gravando cada
+    data URI base64 em disco e trocando-a pelo nome do arquivo salvo.
+
+    Retorna (html_em_bytes, ativos). O HTML devolvido já não contém as
+    imagens embutidas, então pode ser parseado pelo BeautifulSoup sem custo."""
+    os.makedirs(pasta, exist_ok=True)
+    saida = []
+    ativos = []
+    vistos = set()
+    pendente = b''
+    estado = 'texto'
+    gravador = None
+
+    def finalizar_ativo():
+        ativo = gravador.concluir(prefixo)
+        # Dentro da mesma página, repetição da mesma imagem também conta como duplicada
+        if ativo['sha256'] in vistos:
+            ativo['duplicado'] = True
+        vistos.add(ativo['sha256'])
+        ativos.append(ativo)
+        saida.append(ativo['arquivo'].encode())
+
+    try:
+        for bloco in blocos:
+            if not bloco:
+                continue
+            pendente += bloco
+
+            while pendente:
+                if estado == 'texto':
+                    posicao = pendente.find(MARCADOR)
+                    if posicao == -1:
+                        # Guarda o final do bloco: o marcador pode estar dividido entre dois blocos
+                        corte = max(0, len(pendente) - (len(MARCADOR) - 1))
+                        saida.append(pendente[:corte])
+                        pendente = pendente[corte:]
+                        break
+                    saida.append(pendente[:posicao])
+                    pendente = pendente[posicao:]
+                    estado = 'cabecalho'
+
+                elif estado == 'cabecalho':
+                    virgula = pendente.find(b',', 0, TAMANHO_MAXIMO_CABECALHO)
+                    if virgula == -1 and len(pendente) < TAMANHO_MAXIMO_CABECALHO:
+                        break  # espera o próximo bloco
+                    encontrado = CABECALHO_VALIDO.match(pendente[:virgula]) if virgula != -1 else None
+                    mime = encontrado.group(1).decode('ascii') if encontrado else ''
+                    if not encontrado or (apenas_imagens and not mime.lower().startswith('image/')):
+                        # Era só o texto 'data:' no meio da página
+                        saida.append(MARCADOR)
+                        pendente = pendente[len(MARCADOR):]
+                        estado = 'texto'
+                        continue
+                    gravador = _GravadorBase64(pasta, mime)
+                    pendente = pendente[virgula + 1:]
+                    estado = 'conteudo'
+
+                else:  # conteudo
+                    fim = FIM_BASE64.search(pendente)
+                    if fim is None:
+                        gravador.escrever(pendente)
+                        pendente = b''
+                        break
+                    gravador.escrever(pendente[:fim.start()])
+                    finalizar_ativo()
+                    gravador = None
+                    pendente = pendente[fim.start():]
+                    estado = 'texto'
+
+        # Fim do fluxo
+        if estado == 'conteudo':
+            finalizar_ativo()
+            gravador = None
+        elif pendente:
+            saida.append(pendente)
+    except Exception:
+        if gravador is not None:
+            gravador.descartar()
+        raise
+
+    return b''.join(saida), ativos
+
+def salvar_data_uri(uri, pasta, prefixo='imagem', apenas_imagens=True):
+    """Grava um único data URI (já em memória, ex.: atributo src) em disco"""
+    cabecalho, separador, _ = uri[:TAMANHO_MAXIMO_CABECALHO].partition(',')
+    if not separador:
+        return None
+    _, ativos = extrair_inline_de_fluxo(
+        (uri[inicio:inicio + TAMANHO_BLOCO].encode('ascii', 'ignore')
+         for inicio in range(0, len(uri), TAMANHO_BLOCO)),
+        pasta, prefixo, apenas_imagens
+    )
+    return ativos[0] if ativos else None
+
+def salvar_imagens_inline(elemento, pasta, prefixo='imagem'):
+    """Para HTML já parseado (BeautifulSoup): grava cada <img src="data:...">
+    do elemento e troca o src pelo nome do arquivo salvo. Retorna os ativos.
+    Uma imagem malformada é registrada e ignorada, sem afetar as demais."""
+    ativos = []
+    vistos = set()
+    for img in elemento.find_all('img'):
+        src = img.get('src', '')
+        if not src.startswith('data:'):
+            continue
+        try:
+            ativo = salvar_data_uri(src, pasta, prefixo)
+        except Exception as e:
+            print(f"    ❌ Erro na imagem embutida {src[:40]}...: {e}")
+            continue
+        if not ativo:
+            continue
+        img['src'] = ativo['arquivo']
+        if ativo['sha256'] in vistos:
+            ativo['duplicado'] = True
+        vistos.add(ativo['sha256'])
+        ativos.append(ativo)
+    return ativos
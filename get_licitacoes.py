@@ -1,194 +1,507 @@
 import requests
 from bs4 import BeautifulSoup
 import os
+import re
 import json
+import hashlib
+import argparse
+from datetime import datetime
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos, intervalo_paginas
+from agendador import FilaPrioridade, prioridade, tamanho_estimado
+import requisicoes
+import escritor
+import perfil
+from requisicoes import obter, baixar, prazo_esgotado, resumo_hedge, PrazoEsgotado
+
+# Detecção de mudanças (--incremental): uma impressão digital por licitação
+# (campos normalizados + links dos documentos), guardada na pasta principal
+ARQUIVO_IMPRESSOES = '.impressoes_licitacoes.json'
+ARQUIVO_MUDANCAS = 'mudancas.jsonl'
+# Licitações novas cuja pasta Pagina<N>/licitacao<idx> já é de outra (a listagem andou)
+PASTA_NOVAS = 'PaginaNovas'
+# Consultas HEAD simultâneas ao medir documentos (--consultar-tamanho)
+MAX_CONSULTAS_TAMANHO = 8
+
+CAMPOS_LICITACAO = ['Modalidade', 'Situação', 'Número da Licitação', 'Publicação', 'Unidade Gestora',
+                    'Realização', 'Código da Unidade Gestora', 'Objetivo']
+
+def listar_licitacoes(base_url, page_number):
+    """Links de detalhes de uma página da listagem, na ordem da página
+    (None no lugar de botões sem link). Retorna None se a página falhar."""
+    url = f'{base_url}/licitacoes?page={page_number}'
+    try:
+        with perfil.etapa('listagem'):
+            response = obter(url)
+    except requests.RequestException as e:
+        print(f"Erro ao acessar a página {page_number}: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"Erro ao acessar a página {page_number}: {response.status_code}")
+        return None
 
-# URL base
-base_url = 'https://www.juareztavora.pb.gov.br'
-
-# Criar pasta principal "Licitações"
-pasta_principal = 'Licitações'
-os.makedirs(pasta_principal, exist_ok=True)
+    with perfil.etapa('parse'):
+        soup = BeautifulSoup(response.text, 'html.parser')
+    with perfil.etapa('extracao'):
+        return extrair_links(soup, base_url)
 
-# Percorrer as páginas de 63 até 1 (começando pela mais recente)
-for page_number in range(63, 0, -1):  # 63, 62, 61, ..., 1
+def extrair_links(soup, base_url):
+    """Links de detalhes da listagem já carregada no BeautifulSoup"""
+    # Encontrar todos os botões "Detalhes" que levam às licitações
+    detail_buttons = soup.find_all('a', class_='tm-execute btn btn-licitacao d-block w-100 d-sm-inline-block')
+    return [urljoin(base_url, button.get('href')) if button.get('href') else None for button in detail_buttons]
+
+def extrair_licitacao(licitacao_soup, licitacao_url):
+    """Lê os campos e a tabela de documentos da página de detalhes, sem baixar nada.
+    'ArquivoSalvo' já vem com o nome que o documento terá em disco."""
+    # Extrair dados da licitação
+    modalidade = ''
+    situacao = ''
+    numero_licitacao = ''
+    publicacao = ''
+    unidade_gestora = ''
+    realizacao = ''
+    codigo_unidade_gestora = ''
+    objetivo = ''
+
+    # Modalidade
+    modalidade_elem = licitacao_soup.find('p', itemprop='bidModality')
+    if modalidade_elem:
+        modalidade = modalidade_elem.get_text(strip=True)
+
+    # Situação
+    situacao_div = licitacao_soup.find('div', class_='informacoes').find_next_sibling('div')
+    if situacao_div:
+        situacao_p = situacao_div.find('p', class_='text-muted')
+        if situacao_p:
+            situacao = situacao_p.get_text(strip=True)
+
+    # Número da Licitação
+    numero_elem = licitacao_soup.find('p', itemprop='bidID')
+    if numero_elem:
+        numero_licitacao = numero_elem.get_text(strip=True)
+
+    # Publicação
+    publicacao_elem = licitacao_soup.find('p', itemprop='publicationDate')
+    if publicacao_elem:
+        publicacao = publicacao_elem.get_text(strip=True)
+
+    # Unidade Gestora
+    unidade_gestora_elem = licitacao_soup.find('p', itemprop='managementUnitName')
+    if unidade_gestora_elem:
+        unidade_gestora = unidade_gestora_elem.get_text(strip=True)
+
+    # Realização
+    realizacao_elem = licitacao_soup.find('p', itemprop='realizationDate')
+    if realizacao_elem:
+        realizacao = realizacao_elem.get_text(strip=True)
+
+    # Código da Unidade Gestora
+    codigo_unidade_elem = licitacao_soup.find('p', itemprop='managementUnitID')
+    if codigo_unidade_elem:
+        codigo_unidade_gestora = codigo_unidade_elem.get_text(strip=True)
+
+    # Objetivo
+    objetivo_elem = licitacao_soup.find('p', itemprop='object')
+    if objetivo_elem:
+        objetivo = objetivo_elem.get_text(strip=True)
+
+    # Extrair documentos da licitação
+    documentos = []
+    documentos_table = licitacao_soup.find('h5', string='Documentos da Licitação:')
+    if documentos_table:
+        documentos_table = documentos_table.find_next('table')
+        if documentos_table:
+            rows = documentos_table.find_all('tr')[1:]  # Pular o cabeçalho
+            for row_idx, row in enumerate(rows, start=1):
+                cells = row.find_all(['th', 'td'])
+                if len(cells) >= 3:
+                    # Tipo do documento
+                    tipo_elem = cells[0]
+                    tipo = tipo_elem.get_text(strip=True) if tipo_elem else ''
+                    
+                    # Nome do documento
+                    nome_elem = cells[1].find('h5')
+                    nome = nome_elem.get_text(strip=True) if nome_elem else ''
+                    
+                    # Link de download
+                    link_elem = cells[2].find('a', download=True)
+                    link = link_elem.get('href') if link_elem else ''
+                    
+                    # Nome do arquivo
+                    arquivo = os.path.basename(link) if link else ''
+                    
+                    if tipo and link:
+                        documentos.append({
+                            "Tipo": tipo,
+                            "Nome": nome,
+                            "Link": link,
+                            "Arquivo": arquivo,
+                            # Criar nome seguro para o arquivo
+                            "ArquivoSalvo": f"documento{row_idx}_{arquivo}"
+                        })
+
+    return {
+        "Modalidade": modalidade,
+        "Situação": situacao,
+        "Número da Licitação": numero_licitacao,
+        "Publicação": publicacao,
+        "Unidade Gestora": unidade_gestora,
+        "Realização": realizacao,
+        "Código da Unidade Gestora": codigo_unidade_gestora,
+        "Objetivo": objetivo,
+        "Link": licitacao_url,
+        "Documentos": documentos
+    }
+
+def baixar_documento(documento, licitacao_dir):
+    """Baixa o PDF do documento; em caso de falha, 'ArquivoSalvo' fica vazio"""
+    try:
+        caminho_arquivo = os.path.join(licitacao_dir, documento['ArquivoSalvo'])
+        with perfil.etapa('download'):
+            status = baixar(documento['Link'], caminho_arquivo)
+        if status == 200:
+            print(f"    📄 Baixado: {documento['ArquivoSalvo']}")
+            return
+        print(f"    ⚠️ Erro ao baixar: {documento['Arquivo']}")
+    except Exception as e:
+        print(f"    ❌ Erro no download: {e}")
+    documento['ArquivoSalvo'] = ""
+
+def obter_detalhes(licitacao_url):
+    """Página de detalhes já extraída (None se falhar depois das novas tentativas)"""
+    try:
+        with perfil.etapa('detalhe'):
+            licitacao_response = obter(licitacao_url, hedge='detalhe_licitacao')
+    except requests.RequestException as e:
+        print(f"Erro ao acessar licitação: {licitacao_url} ({e})")
+        return None
+    if licitacao_response.status_code != 200:
+        print(f"Erro ao acessar licitação: {licitacao_url}")
+        return None
+    with perfil.etapa('parse'):
+        licitacao_soup = BeautifulSoup(licitacao_response.text, 'html.parser')
+    with perfil.etapa('extracao'):
+        return extrair_licitacao(licitacao_soup, licitacao_url)
+
+def salvar_dados(data, licitacao_dir):
+    """Entrega o dados.json ao escritor em segundo plano"""
+    with perfil.etapa('gravacao_json'):
+        escritor.gravar_json(os.path.join(licitacao_dir, 'dados.json'), data)
+
+def coletar_licitacao(licitacao_url, licitacao_dir):
+    """Baixa os dados e documentos de uma licitação e grava o dados.json"""
+    os.makedirs(licitacao_dir, exist_ok=True)
+
+    # Acessar a página da licitação
+    data = obter_detalhes(licitacao_url)
+    if data is None:
+        return None
+    for documento in data['Documentos']:
+        baixar_documento(documento, licitacao_dir)
+    salvar_dados(data, licitacao_dir)
+    return data
+
+#### ---- DETECÇÃO DE MUDANÇAS ---- ####
+
+def normalizar(texto):
+    return re.sub(r'\s+', ' ', texto or '').strip()
+
+def impressao_digital(data):
+    """Campos normalizados + links dos documentos: muda quando a Situação anda
+    ou quando um documento é incluído/removido, e só nesses casos"""
+    campos = {campo: normalizar(data.get(campo)) for campo in CAMPOS_LICITACAO}
+    links = sorted(documento['Link'] for documento in data.get('Documentos', []))
+    conteudo = json.dumps({'campos': campos, 'documentos': links}, ensure_ascii=False, sort_keys=True)
+    return {
+        'impressao': hashlib.sha256(conteudo.encode('utf-8')).hexdigest(),
+        'campos': campos,
+        'documentos': links,
+    }
+
+def carregar_impressoes(pasta_principal):
+    """Impressões salvas; na primeira vez, montadas a partir dos dados.json já coletados"""
+    caminho = os.path.join(pasta_principal, ARQUIVO_IMPRESSOES)
+    if os.path.exists(caminho):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    impressoes = {}
+    for root, _, files in os.walk(pasta_principal):
+        if 'dados.json' not in files:
+            continue
+        with open(os.path.join(root, 'dados.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('Link'):
+            impressoes[data['Link']] = {**impressao_digital(data), 'pasta': root}
+    print(f"🔏 {len(impressoes)} impressões digitais montadas a partir dos dados já coletados")
+    return impressoes
+
+def salvar_impressoes(impressoes, pasta_principal):
+    caminho = os.path.join(pasta_principal, ARQUIVO_IMPRESSOES)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(impressoes, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+def registrar_mudanca(pasta_principal, entrada):
+    entrada = {'horario': datetime.now().isoformat(timespec='seconds'), **entrada}
+    with open(os.path.join(pasta_principal, ARQUIVO_MUDANCAS), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entrada, ensure_ascii=False) + '\n')
+
+def pasta_livre(licitacao_dir, licitacao_url, pasta_principal):
+    """A posição na listagem muda quando entram licitações novas: se a pasta
+    sugerida já guarda outra licitação, a nova vai para PASTA_NOVAS/licitacao<N>,
+    numeradas pela ordem de chegada"""
+    json_path = os.path.join(licitacao_dir, 'dados.json')
+    if not os.path.exists(json_path):
+        return licitacao_dir
+    with open(json_path, 'r', encoding='utf-8') as f:
+        if json.load(f).get('Link') == licitacao_url:
+            return licitacao_dir
+    pasta_novas = os.path.join(pasta_principal, PASTA_NOVAS)
+    numeros = [int(encontrado.group(1)) for encontrado in
+               (re.fullmatch(r'licitacao(\d+)', nome) for nome in
+                (os.listdir(pasta_novas) if os.path.isdir(pasta_novas) else []))
+               if encontrado]
+    return os.path.join(pasta_novas, f'licitacao{max(numeros, default=0) + 1}')
+
+def documentos_pendentes(licitacao_dir):
+    """Links dos documentos cujo download falhou antes ('ArquivoSalvo' vazio ou
+    arquivo ausente). Sem dados.json legível, todos estão pendentes (None)."""
+    try:
+        with open(os.path.join(licitacao_dir, 'dados.json'), 'r', encoding='utf-8') as f:
+            documentos = json.load(f).get('Documentos', [])
+    except (OSError, ValueError):
+        return None
+    return [documento['Link'] for documento in documentos
+            if not documento.get('ArquivoSalvo')
+            or not os.path.exists(os.path.join(licitacao_dir, documento['ArquivoSalvo']))]
+
+def atualizar_licitacao(licitacao_url, licitacao_dir, pasta_principal, impressoes):
+    """Modo incremental: busca só o HTML de detalhes e, se a impressão digital
+    mudou ou algum documento ficou sem baixar, regrava o dados.json baixando
+    apenas os documentos que faltam.
+    Retorna 'nova', 'alterada', 'igual' ou None (falha)."""
+    data = obter_detalhes(licitacao_url)
+    if data is None:
+        return None
+    atual = impressao_digital(data)
+    anterior = impressoes.get(licitacao_url)
+    pendentes = documentos_pendentes(anterior['pasta']) if anterior else []
+    if anterior and anterior['impressao'] == atual['impressao'] and pendentes == []:
+        return 'igual'
+
+    if anterior:
+        licitacao_dir = anterior['pasta']
+    else:
+        licitacao_dir = pasta_livre(licitacao_dir, licitacao_url, pasta_principal)
+    os.makedirs(licitacao_dir, exist_ok=True)
+
+    # Documentos já baixados (e ainda em disco) mantêm o arquivo salvo anteriormente
+    salvos = {}
+    json_path = os.path.join(licitacao_dir, 'dados.json')
+    if anterior and os.path.exists(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            salvos = {documento['Link']: documento.get('ArquivoSalvo', '')
+                      for documento in json.load(f).get('Documentos', [])
+                      if documento.get('ArquivoSalvo')
+                      and os.path.exists(os.path.join(licitacao_dir, documento['ArquivoSalvo']))}
+    for documento in data['Documentos']:
+        if salvos.get(documento['Link']):
+            documento['ArquivoSalvo'] = salvos[documento['Link']]
+        else:
+            baixar_documento(documento, licitacao_dir)
+    salvar_dados(data, licitacao_dir)
+
+    situacao = 'alterada' if anterior else 'nova'
+    entrada = {'tipo': situacao, 'link': licitacao_url, 'pasta': licitacao_dir,
+               'numero': data['Número da Licitação']}
+    if anterior:
+        entrada['campos'] = {
+            campo: [anterior['campos'].get(campo, ''), valor]
+            for campo, valor in atual['campos'].items() if anterior['campos'].get(campo, '') != valor
+        }
+        entrada['documentos_novos'] = [link for link in atual['documentos'] if link not in anterior['documentos']]
+        entrada['documentos_removidos'] = [link for link in anterior['documentos'] if link not in atual['documentos']]
+        if pendentes:
+            entrada['documentos_pendentes'] = [link for link in pendentes if link in atual['documentos']]
+    registrar_mudanca(pasta_principal, entrada)
+    impressoes[licitacao_url] = {**atual, 'pasta': licitacao_dir}
+    return situacao
+
+def processar_pagina(base_url, page_number, pasta_principal='Licitações', impressoes=None):
+    """Com 'impressoes' (modo incremental), só regrava o que mudou"""
     print(f"\nAcessando página {page_number}...")
 
-    url = f'{base_url}/licitacoes?page={page_number}'
-
     # Criar pasta da página DENTRO da pasta principal
     pagina_dir = os.path.join(pasta_principal, f'Pagina{page_number}')
     os.makedirs(pagina_dir, exist_ok=True)
 
-    # Acessar a página de listagem
-    response = requests.get(url)
-    if response.status_code != 200:
-        print(f"Erro ao acessar a página {page_number}: {response.status_code}")
-        continue  # Ir para a próxima página
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # Encontrar todos os botões "Detalhes" que levam às licitações
-    detail_buttons = soup.find_all('a', class_='tm-execute btn btn-licitacao d-block w-100 d-sm-inline-block')
-
-    if not detail_buttons:
+    links = listar_licitacoes(base_url, page_number)
+    if links is None:
+        return  # Ir para a próxima página
+    if not links:
         print(f"Nenhuma licitação encontrada na página {page_number}.")
-        continue
+        return
 
-    for idx, button in enumerate(detail_buttons, start=1):
-        # Extrair link da licitação
-        licitacao_url = button.get('href')
+    for idx, licitacao_url in enumerate(links, start=1):
         if not licitacao_url:
             continue
-            
-        if licitacao_url.startswith('/'):
-            licitacao_url = urljoin(base_url, licitacao_url)
+        if prazo_esgotado():
+            return
 
         # Criar pasta da licitação DENTRO da pasta da página
         licitacao_dir = os.path.join(pagina_dir, f'licitacao{idx}')
-        os.makedirs(licitacao_dir, exist_ok=True)
 
-        # Acessar a página da licitação
-        licitacao_response = requests.get(licitacao_url)
-        if licitacao_response.status_code != 200:
-            print(f"Erro ao acessar licitação: {licitacao_url}")
+        if impressoes is not None:
+            situacao = atualizar_licitacao(licitacao_url, licitacao_dir, pasta_principal, impressoes)
+            if situacao in ('nova', 'alterada'):
+                print(f"Licitação {idx} {situacao}: {impressoes[licitacao_url]['pasta']}")
             continue
 
-        licitacao_soup = BeautifulSoup(licitacao_response.text, 'html.parser')
-
-        # Extrair dados da licitação
-        modalidade = ''
-        situacao = ''
-        numero_licitacao = ''
-        publicacao = ''
-        unidade_gestora = ''
-        realizacao = ''
-        codigo_unidade_gestora = ''
-        objetivo = ''
-
-        # Modalidade
-        modalidade_elem = licitacao_soup.find('p', itemprop='bidModality')
-        if modalidade_elem:
-            modalidade = modalidade_elem.get_text(strip=True)
-
-        # Situação
-        situacao_div = licitacao_soup.find('div', class_='informacoes').find_next_sibling('div')
-        if situacao_div:
-            situacao_p = situacao_div.find('p', class_='text-muted')
-            if situacao_p:
-                situacao = situacao_p.get_text(strip=True)
-
-        # Número da Licitação
-        numero_elem = licitacao_soup.find('p', itemprop='bidID')
-        if numero_elem:
-            numero_licitacao = numero_elem.get_text(strip=True)
-
-        # Publicação
-        publicacao_elem = licitacao_soup.find('p', itemprop='publicationDate')
-        if publicacao_elem:
-            publicacao = publicacao_elem.get_text(strip=True)
-
-        # Unidade Gestora
-        unidade_gestora_elem = licitacao_soup.find('p', itemprop='managementUnitName')
-        if unidade_gestora_elem:
-            unidade_gestora = unidade_gestora_elem.get_text(strip=True)
-
-        # Realização
-        realizacao_elem = licitacao_soup.find('p', itemprop='realizationDate')
-        if realizacao_elem:
-            realizacao = realizacao_elem.get_text(strip=True)
-
-        # Código da Unidade Gestora
-        codigo_unidade_elem = licitacao_soup.find('p', itemprop='managementUnitID')
-        if codigo_unidade_elem:
-            codigo_unidade_gestora = codigo_unidade_elem.get_text(strip=True)
-
-        # Objetivo
-        objetivo_elem = licitacao_soup.find('p', itemprop='object')
-        if objetivo_elem:
-            objetivo = objetivo_elem.get_text(strip=True)
-
-        # Extrair documentos da licitação
-        documentos = []
-        documentos_table = licitacao_soup.find('h5', string='Documentos da Licitação:')
-        if documentos_table:
-            documentos_table = documentos_table.find_next('table')
-            if documentos_table:
-                rows = documentos_table.find_all('tr')[1:]  # Pular o cabeçalho
-                for row_idx, row in enumerate(rows, start=1):
-                    cells = row.find_all(['th', 'td'])
-                    if len(cells) >= 3:
-                        # Tipo do documento
-                        tipo_elem = cells[0]
-                        tipo = tipo_elem.get_text(strip=True) if tipo_elem else ''
-                        
-                        # Nome do documento
-                        nome_elem = cells[1].find('h5')
-                        nome = nome_elem.get_text(strip=True) if nome_elem else ''
-                        
-                        # Link de download
-                        link_elem = cells[2].find('a', download=True)
-                        link = link_elem.get('href') if link_elem else ''
-                        
-                        # Nome do arquivo
-                        arquivo = os.path.basename(link) if link else ''
-                        
-                        if tipo and link:
-                            # Baixar o arquivo PDF
-                            try:
-                                pdf_response = requests.get(link)
-                                if pdf_response.status_code == 200:
-                                    # Criar nome seguro para o arquivo
-                                    nome_arquivo_seguro = f"documento{row_idx}_{arquivo}"
-                                    caminho_arquivo = os.path.join(licitacao_dir, nome_arquivo_seguro)
-                                    
-                                    with open(caminho_arquivo, 'wb') as f:
-                                        f.write(pdf_response.content)
-                                    
-                                    print(f"    📄 Baixado: {nome_arquivo_seguro}")
-                                else:
-                                    print(f"    ⚠️ Erro ao baixar: {arquivo}")
-                                    nome_arquivo_seguro = ""
-                            except Exception as e:
-                                print(f"    ❌ Erro no download: {e}")
-                                nome_arquivo_seguro = ""
-
-                            documento = {
-                                "Tipo": tipo,
-                                "Nome": nome,
-                                "Link": link,
-                                "Arquivo": arquivo,
-                                "ArquivoSalvo": nome_arquivo_seguro
-                            }
-                            documentos.append(documento)
-
-        # Salvar JSON
-        data = {
-            "Modalidade": modalidade,
-            "Situação": situacao,
-            "Número da Licitação": numero_licitacao,
-            "Publicação": publicacao,
-            "Unidade Gestora": unidade_gestora,
-            "Realização": realizacao,
-            "Código da Unidade Gestora": codigo_unidade_gestora,
-            "Objetivo": objetivo,
-            "Link": licitacao_url,
-            "Documentos": documentos
-        }
-
-        json_path = os.path.join(licitacao_dir, 'dados.json')
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        data = coletar_licitacao(licitacao_url, licitacao_dir)
+        if data is None:
+            continue
 
+        documentos = data['Documentos']
         print(f"Licitação {idx} salva em: {licitacao_dir}")
-        print(f"  Número: {numero_licitacao}")
-        print(f"  Modalidade: {modalidade}")
-        print(f"  Situação: {situacao}")
+        print(f"  Número: {data['Número da Licitação']}")
+        print(f"  Modalidade: {data['Modalidade']}")
+        print(f"  Situação: {data['Situação']}")
         print(f"  Documentos baixados: {len([d for d in documentos if d['ArquivoSalvo']])}/{len(documentos)}")
 
-print(f"\nProcesso concluído! Todas as licitações foram salvas na pasta '{pasta_principal}'")
-
+#### ---- COLETA POR PRIORIDADE ---- ####
+
+def consultar_tamanho(link):
+    """Content-Length informado pelo servidor num HEAD (None se não houver)"""
+    try:
+        with perfil.etapa('tamanho_documento'):
+            resposta = obter(link, metodo='HEAD', tentativas=1)
+        tamanho = resposta.headers.get('Content-Length', '')
+        return int(tamanho) if tamanho.isdigit() else None
+    except Exception:
+        return None
+
+def estimar_tamanhos(links, consultas=None):
+    """Tamanho de cada documento para desempatar a fila. Sem 'consultas' usa só
+    a extensão; com um pool, faz os HEADs em paralelo e cai na extensão quando
+    o servidor não informa o tamanho"""
+    if consultas is None:
+        return [tamanho_estimado(link) for link in links]
+    return [tamanho if tamanho is not None else tamanho_estimado(link)
+            for link, tamanho in zip(links, consultas.map(consultar_tamanho, links))]
+
+def coletar_por_prioridade(base_url, paginas, pasta_principal, consultar_servidor=False):
+    """Percorre as listagens primeiro (são baratas) e depois busca detalhes e
+    documentos numa única fila de prioridade: abertas e recentes na frente"""
+    if consultar_servidor:
+        with ThreadPoolExecutor(max_workers=MAX_CONSULTAS_TAMANHO) as consultas:
+            return _coletar_por_prioridade(base_url, paginas, pasta_principal, consultas)
+    return _coletar_por_prioridade(base_url, paginas, pasta_principal)
+
+def _coletar_por_prioridade(base_url, paginas, pasta_principal, consultas=None):
+    fila = FilaPrioridade()
+    for page_number in paginas:
+        if prazo_esgotado():
+            print(f"⏰ Prazo da execução esgotado: listagem interrompida antes da página {page_number}")
+            break
+        print(f"Listando página {page_number}...")
+        for idx, licitacao_url in enumerate(listar_licitacoes(base_url, page_number) or [], start=1):
+            if licitacao_url:
+                licitacao_dir = os.path.join(pasta_principal, f'Pagina{page_number}', f'licitacao{idx}')
+                fila.colocar(prioridade(pagina=page_number, posicao=idx),
+                             ('detalhe', licitacao_url, licitacao_dir, page_number, idx))
+    print(f"\n📋 {len(fila)} licitações na fila")
+
+    dados_por_pasta = {}
+    while fila and not prazo_esgotado():
+        _, tarefa = fila.tirar()
+        if tarefa[0] == 'detalhe':
+            _, licitacao_url, licitacao_dir, page_number, idx = tarefa
+            os.makedirs(licitacao_dir, exist_ok=True)
+            data = obter_detalhes(licitacao_url)
+            if data is None:
+                continue
+            # Agora que a situação e a data são conhecidas, os documentos entram na fila
+            tamanhos = estimar_tamanhos([documento['Link'] for documento in data['Documentos']], consultas)
+            for documento, tamanho in zip(data['Documentos'], tamanhos):
+                nome_arquivo = documento['ArquivoSalvo']
+                documento['ArquivoSalvo'] = ""  # preenchido quando o download acontecer
+                fila.colocar(
+                    prioridade(data['Situação'], data['Publicação'], page_number, idx, tamanho),
+                    ('documento', licitacao_dir, documento, nome_arquivo)
+                )
+            salvar_dados(data, licitacao_dir)
+            dados_por_pasta[licitacao_dir] = data
+            print(f"Licitação salva em: {licitacao_dir} ({data['Situação'] or 'sem situação'}, "
+                  f"{data['Publicação'] or 'sem data'}, {len(data['Documentos'])} documentos na fila)")
+        else:
+            _, licitacao_dir, documento, nome_arquivo = tarefa
+            documento['ArquivoSalvo'] = nome_arquivo
+            baixar_documento(documento, licitacao_dir)
+            # O documento é o mesmo objeto guardado em dados_por_pasta
+            salvar_dados(dados_por_pasta[licitacao_dir], licitacao_dir)
+
+def main():
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Coleta as licitações do portal'))
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--incremental', action='store_true',
+                      help=f'Só regrava licitações novas ou alteradas e anota as mudanças em {ARQUIVO_MUDANCAS}')
+    modo.add_argument('--prioridade', action='store_true',
+                      help='Coleta abertas e mais recentes primeiro (fila de prioridade)')
+    parser.add_argument('--consultar-tamanho', action='store_true',
+                        help='Com --prioridade, pergunta ao servidor (HEAD) o tamanho de cada documento '
+                             'em vez de estimar pela extensão')
+    parser.add_argument('--reextrair', action='store_true',
+                        help='Refaz a extração a partir do arquivo de respostas, sem acessar a rede')
+    perfil.adicionar_argumento(parser)
+    args = parser.parse_args()
+    perfil.iniciar(args.perfil)
+    config = configuracao_dos_argumentos(args)
+    requisicoes.configurar(config['rede'])
+    requisicoes.configurar_arquivo(config['arquivo_respostas'], offline=args.reextrair)
+    escritor.configurar(config['escrita'])
+
+    # Criar pasta principal "Licitações"
+    pasta_principal = config['licitacoes']['pasta']
+    os.makedirs(pasta_principal, exist_ok=True)
+
+    impressoes = carregar_impressoes(pasta_principal) if args.incremental else None
+    if impressoes is None and os.path.exists(os.path.join(pasta_principal, ARQUIVO_IMPRESSOES)):
+        # A coleta completa renumera as pastas: as impressões são refeitas do disco no próximo --incremental
+        os.remove(os.path.join(pasta_principal, ARQUIVO_IMPRESSOES))
+    try:
+        if args.prioridade:
+            coletar_por_prioridade(config['site']['base_url'], intervalo_paginas(config, 'licitacoes'),
+                                   pasta_principal, args.consultar_tamanho)
+        else:
+            # Percorrer as páginas (padrão: de 63 até 1, das mais antigas para a mais recente)
+            for page_number in intervalo_paginas(config, 'licitacoes'):
+                if prazo_esgotado():
+                    break
+                processar_pagina(config['site']['base_url'], page_number, pasta_principal, impressoes)
+    except PrazoEsgotado as e:
+        print(f"\n⏰ {e}")
+    finally:
+        try:
+            escritor.encerrar()
+        finally:
+            if impressoes is not None:
+                salvar_impressoes(impressoes, pasta_principal)
+
+    if resumo_hedge():
+        print(f"⚡ Hedge: {resumo_hedge()}")
+    if prazo_esgotado():
+        print("\n⏰ Prazo da execução esgotado: coleta encerrada antes da última página")
+    elif impressoes is None:
+        print(f"\nProcesso concluído! Todas as licitações foram salvas na pasta '{pasta_principal}'")
+    else:
+        print(f"\nAtualização concluída! Mudanças anotadas em '{os.path.join(pasta_principal, ARQUIVO_MUDANCAS)}'")
+
+if __name__ == "__main__":
+    main()
 
 '''
 import requests
@@ -1,132 +1,312 @@
 import requests
 from bs4 import BeautifulSoup
 import os
-import json
-from urllib.parse import urljoin
+import argparse
+from urllib.parse import urljoin, urlparse, unquote
+from concurrent.futures import ThreadPoolExecutor
+from extrator_inline import salvar_imagens_inline
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos, intervalo_paginas
+import requisicoes
+import escritor
+import perfil
+from requisicoes import obter, baixar, prazo_esgotado, resumo_hedge, PrazoEsgotado
+
+# Downloads simultâneos por notícia (imagens da galeria, do corpo e anexos)
+MAX_DOWNLOADS_POR_NOTICIA = 4
+
+# Extensões de arquivos linkados no corpo que também são migrados
+EXTENSOES_ANEXOS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.pdf', '.doc', '.docx',
+                    '.xls', '.xlsx', '.odt', '.ods', '.ppt', '.pptx', '.zip', '.rar')
+
+# Sessão compartilhada para reaproveitar conexões entre as requisições
+sessao = requisicoes.sessao
+
+# Sanitização do corpo da notícia: só formatação básica vai para o CMS
+TAGS_PERMITIDAS = {'p', 'br', 'strong', 'b', 'em', 'i', 'u', 's', 'sub', 'sup', 'a',
+                   'ul', 'ol', 'li', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote',
+                   'table', 'thead', 'tbody', 'tr', 'th', 'td', 'iframe'}
+TAGS_REMOVIDAS = ['script', 'style', 'noscript', 'form', 'input', 'button', 'img', 'svg']
+ATRIBUTOS_PERMITIDOS = {'a': {'href', 'title'}, 'td': {'colspan', 'rowspan'},
+                        'th': {'colspan', 'rowspan'}, 'iframe': {'src'}}
+DOMINIOS_IFRAME = ('youtube.com', 'www.youtube.com', 'youtube-nocookie.com',
+                   'www.youtube-nocookie.com', 'player.vimeo.com')
+
+def sanitizar_html(elemento, url_pagina):
+    """Gera o HTML do corpo com a formatação preservada e sem scripts, estilos,
+    atributos ou imagens (as imagens vão como arquivos pela lista 'Imagens')."""
+    copia = BeautifulSoup(elemento.decode_contents(), 'html.parser')
+
+    for tag in copia.find_all(TAGS_REMOVIDAS):
+        tag.decompose()
+
+    for tag in copia.find_all(True):
+        if tag.name not in TAGS_PERMITIDAS:
+            tag.unwrap()
+            continue
+        permitidos = ATRIBUTOS_PERMITIDOS.get(tag.name, set())
+        tag.attrs = {nome: valor for nome, valor in tag.attrs.items() if nome in permitidos}
 
-# URL base
-base_url = 'https://www.juareztavora.pb.gov.br'
+        if tag.name == 'a' and tag.get('href'):
+            href = urljoin(url_pagina, tag['href'].strip())
+            if urlparse(href).scheme in ('http', 'https', 'mailto'):
+                tag['href'] = href
+            else:
+                del tag['href']
+        elif tag.name == 'iframe':
+            src = urljoin(url_pagina, tag.get('src', ''))
+            if urlparse(src).hostname not in DOMINIOS_IFRAME:
+                tag.decompose()
+
+    # Parágrafos que ficaram vazios depois da limpeza
+    for paragrafo in copia.find_all('p'):
+        if not paragrafo.get_text(strip=True) and not paragrafo.find(['iframe', 'br']):
+            paragrafo.decompose()
+
+    return str(copia).strip()
+
+def coletar_midias(noticia_soup, noticia_url):
+    """Lista as URLs de todas as imagens e anexos do post, sem repetição.
+    A imagem principal (div.post-img) vem primeiro."""
+    urls = []
+
+    def adicionar(url):
+        if not url:
+            return
+        url = url.strip()
+        if url.startswith('data:'):
+            return  # imagens embutidas são tratadas pelo extrator_inline
+        url = urljoin(noticia_url, url)
+        if url not in urls:
+            urls.append(url)
+
+    # Imagem principal e galeria
+    for post_img in noticia_soup.find_all('div', class_='post-img'):
+        for img in post_img.find_all('img'):
+            adicionar(img.get('src'))
+        for link in post_img.find_all('a', href=True):
+            if urlparse(link['href']).path.lower().endswith(EXTENSOES_ANEXOS):
+                adicionar(link['href'])
+
+    # Imagens e arquivos linkados no corpo
+    content_div = noticia_soup.find('div', class_='content')
+    if content_div:
+        for img in content_div.find_all('img'):
+            adicionar(img.get('src'))
+        for link in content_div.find_all('a', href=True):
+            if urlparse(link['href']).path.lower().endswith(EXTENSOES_ANEXOS):
+                adicionar(link['href'])
+
+    return urls
+
+def nomes_de_arquivo(urls):
+    """Gera nomes únicos (e sem vírgula, que separa a lista 'Imagens') para cada URL"""
+    nomes = []
+    usados = set()
+    for posicao, url in enumerate(urls, start=1):
+        nome = unquote(os.path.basename(urlparse(url).path)).strip().replace(',', '_') or f'arquivo{posicao}'
+        if nome in usados:
+            nome = f'{posicao}_{nome}'
+        usados.add(nome)
+        nomes.append(nome)
+    return nomes
+
+def baixar_arquivo(url, caminho):
+    try:
+        with perfil.etapa('download'):
+            status = baixar(url, caminho, sessao)
+        if status != 200:
+            print(f"    ⚠️ Erro ao baixar {url}: {status}")
+            return False
+        return True
+    except Exception as e:
+        print(f"    ❌ Erro no download de {url}: {e}")
+        return False
+
+def baixar_midias(urls, noticia_dir):
+    """Baixa as mídias da notícia em paralelo e retorna os nomes salvos, na ordem original"""
+    nomes = nomes_de_arquivo(urls)
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOADS_POR_NOTICIA) as pool:
+        resultados = pool.map(
+            lambda item: baixar_arquivo(item[0], os.path.join(noticia_dir, item[1])),
+            zip(urls, nomes)
+        )
+        return [nome for nome, ok in zip(nomes, resultados) if ok]
+
+def listar_noticias(base_url, page_number):
+    """Links das notícias de uma página da listagem, na posição de cada artigo
+    (None no lugar de artigos sem link, para manter a numeração das pastas).
+    Retorna None se a página falhar."""
+    url = f'{base_url}/noticias?page={page_number}'
+    try:
+        with perfil.etapa('listagem'):
+            response = obter(url, sessao)
+    except requests.RequestException as e:
+        print(f"Erro ao acessar a página {page_number}: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"Erro ao acessar a página {page_number}: {response.status_code}")
+        return None
 
-# Percorrer as páginas de 97 até 1
-for page_number in range(97, 0, -1):  # 97, 96, 95, ..., 1
-    print(f"\nAcessando página {page_number}...")
+    with perfil.etapa('parse'):
+        soup = BeautifulSoup(response.text, 'html.parser')
+    with perfil.etapa('extracao'):
+        return extrair_links(soup, base_url)
 
-    url = f'{base_url}/noticias?page={page_number}'
+def extrair_links(soup, base_url):
+    """Links da listagem já carregada no BeautifulSoup"""
+    links = []
+    for article in soup.find_all('article', class_='d-flex flex-column'):
+        title_elem = article.find('h2', class_='title').find('a')
+        links.append(urljoin(base_url, title_elem.get('href')) if title_elem and title_elem.get('href') else None)
+    return links
 
-    # Criar pasta da página
-    pagina_dir = f'pagina{page_number}'
-    os.makedirs(pagina_dir, exist_ok=True)
+def extrair_noticia(noticia_soup, noticia_url):
+    """Lê os campos da página da notícia, sem baixar nada ('Imagens' fica vazio)"""
+    title = ''
+    date = ''
+    text = ''
+    author = ''
+    category = ''
 
-    # Acessar a página de listagem
-    response = requests.get(url)
-    if response.status_code != 200:
-        print(f"Erro ao acessar a página {page_number}: {response.status_code}")
-        continue  # Ir para a próxima página
+    # Título
+    title_tag = noticia_soup.find('h2', class_='title')
+    if title_tag:
+        title = title_tag.get_text(strip=True)
 
-    soup = BeautifulSoup(response.text, 'html.parser')
-    articles = soup.find_all('article', class_='d-flex flex-column')
+    # Data
+    time_tag = noticia_soup.find('time')
+    if time_tag:
+        date = time_tag.get_text(strip=True)
 
-    if not articles:
-        print(f"Nenhuma notícia encontrada na página {page_number}.")
-        continue
+    # Texto (ajustado para capturar de ambas as formas)
+    content_div = noticia_soup.find('div', class_='content')
+    if content_div:
+        text_elem = content_div.find('a')
+        if text_elem:
+            text = text_elem.get_text(strip=True)
+        else:
+            text = content_div.get_text(strip=True)
 
-    for idx, article in enumerate(articles, start=1):
-        # Extrair link da notícia
-        title_elem = article.find('h2', class_='title').find('a')
-        if not title_elem:
-            continue
-        noticia_url = title_elem.get('href')
-        if noticia_url.startswith('/'):
-            noticia_url = urljoin(base_url, noticia_url)
+    # Corpo com a formatação original (enviado ao CMS de uma só vez)
+    text_html = sanitizar_html(content_div, noticia_url) if content_div else ''
 
-        # Criar pasta da notícia
-        noticia_dir = os.path.join(pagina_dir, f'noticia{idx}')
-        os.makedirs(noticia_dir, exist_ok=True)
+    # Autor
+    cats_ul = noticia_soup.find('ul', class_='cats')
+    if cats_ul:
+        cat_li = cats_ul.find('li')
+        if cat_li:
+            author = cat_li.get_text(strip=True)
 
-        # Acessar a página da notícia
-        noticia_response = requests.get(noticia_url)
-        if noticia_response.status_code != 200:
-            print(f"Erro ao acessar notícia: {noticia_url}")
-            continue
+    # Categoria
+    tags_ul = noticia_soup.find('ul', class_='tags')
+    if tags_ul:
+        tag_li = tags_ul.find('li')
+        if tag_li:
+            category = tag_li.get_text(strip=True)
+
+    return {
+        "Titulo": title,
+        "Data": date,
+        "Texto": text,
+        "TextoHTML": text_html,
+        "Imagens": '',
+        "Categoria": category,
+        "Autor": author,
+        "Link": noticia_url
+    }
 
+def coletar_noticia(noticia_url, noticia_dir):
+    """Baixa uma notícia (dados, imagens e anexos) para noticia_dir e grava o dados.json"""
+    os.makedirs(noticia_dir, exist_ok=True)
+
+    # Acessar a página da notícia
+    try:
+        with perfil.etapa('detalhe'):
+            noticia_response = obter(noticia_url, sessao, hedge='detalhe_noticia')
+    except requests.RequestException as e:
+        print(f"Erro ao acessar notícia: {noticia_url} ({e})")
+        return None
+    if noticia_response.status_code != 200:
+        print(f"Erro ao acessar notícia: {noticia_url}")
+        return None
+
+    with perfil.etapa('parse'):
         noticia_soup = BeautifulSoup(noticia_response.text, 'html.parser')
+    with perfil.etapa('extracao'):
+        data = extrair_noticia(noticia_soup, noticia_url)
+    content_div = noticia_soup.find('div', class_='content')
 
-        # Extrair dados
-        title = ''
-        date = ''
-        text = ''
-        author = ''
-        category = ''
-        img_filename = ''
-
-        # Título
-        title_tag = noticia_soup.find('h2', class_='title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-
-        # Data
-        time_tag = noticia_soup.find('time')
-        if time_tag:
-            date = time_tag.get_text(strip=True)
-
-        # Texto (ajustado para capturar de ambas as formas)
-        content_div = noticia_soup.find('div', class_='content')
-        if content_div:
-            text_elem = content_div.find('a')
-            if text_elem:
-                text = text_elem.get_text(strip=True)
-            else:
-                text = content_div.get_text(strip=True)
-
-        # Autor
-        cats_ul = noticia_soup.find('ul', class_='cats')
-        if cats_ul:
-            cat_li = cats_ul.find('li')
-            if cat_li:
-                author = cat_li.get_text(strip=True)
-
-        # Categoria
-        tags_ul = noticia_soup.find('ul', class_='tags')
-        if tags_ul:
-            tag_li = tags_ul.find('li')
-            if tag_li:
-                category = tag_li.get_text(strip=True)
-
-        # Imagem
-        img_tag = noticia_soup.find('div', class_='post-img')
-        if img_tag:
-            img_tag = img_tag.find('img')
-            if img_tag:
-                img_url = img_tag.get('src')
-                if img_url:
-                    img_url = img_url.strip()
-                    if img_url.startswith('/'):
-                        img_url = urljoin(base_url, img_url)
-                    img_response = requests.get(img_url)
-                    if img_response.status_code == 200:
-                        img_filename = os.path.basename(img_url).strip()
-                        img_path = os.path.join(noticia_dir, img_filename)
-                        with open(img_path, 'wb') as f:
-                            f.write(img_response.content)
-
-        # Salvar JSON
-        data = {
-            "Titulo": title,
-            "Data": date,
-            "Texto": text,
-            "Imagens": img_filename,
-            "Categoria": category,
-            "Autor": author,
-            "Link": noticia_url
-        }
-
-        json_path = os.path.join(noticia_dir, 'dados.json')
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-        print(f"Notícia {idx} salva em: {noticia_dir}")
-
-print("\nProcesso concluído para todas as páginas.")
+    # Imagens e anexos (galeria, imagens do corpo e arquivos linkados)
+    arquivos = baixar_midias(coletar_midias(noticia_soup, noticia_url), noticia_dir)
+    if content_div:
+        with perfil.etapa('imagens_inline'):
+            for ativo in salvar_imagens_inline(content_div, noticia_dir):
+                if ativo['arquivo'] not in arquivos:
+                    arquivos.append(ativo['arquivo'])
+    data['Imagens'] = ', '.join(arquivos)
+
+    # Salvar JSON
+    with perfil.etapa('gravacao_json'):
+        escritor.gravar_json(os.path.join(noticia_dir, 'dados.json'), data)
+    return data
+
+def processar_pagina(base_url, page_number, pasta_base='.'):
+    print(f"\nAcessando página {page_number}...")
+
+    # Criar pasta da página
+    pagina_dir = os.path.join(pasta_base, f'pagina{page_number}')
+    os.makedirs(pagina_dir, exist_ok=True)
+
+    links = listar_noticias(base_url, page_number)
+    if links is None:
+        return  # Ir para a próxima página
+    if not links:
+        print(f"Nenhuma notícia encontrada na página {page_number}.")
+        return
+
+    for idx, noticia_url in enumerate(links, start=1):
+        if not noticia_url:
+            continue
+        if prazo_esgotado():
+            return
+        noticia_dir = os.path.join(pagina_dir, f'noticia{idx}')
+        data = coletar_noticia(noticia_url, noticia_dir)
+        if data is not None:
+            quantidade = len([nome for nome in data['Imagens'].split(', ') if nome])
+            print(f"Notícia {idx} salva em: {noticia_dir} ({quantidade} arquivos)")
+
+def main():
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Coleta as notícias do portal'))
+    parser.add_argument('--reextrair', action='store_true',
+                        help='Refaz a extração a partir do arquivo de respostas, sem acessar a rede')
+    perfil.adicionar_argumento(parser)
+    args = parser.parse_args()
+    perfil.iniciar(args.perfil)
+    config = configuracao_dos_argumentos(args)
+    requisicoes.configurar(config['rede'])
+    requisicoes.configurar_arquivo(config['arquivo_respostas'], offline=args.reextrair)
+    escritor.configurar(config['escrita'])
+
+    # Percorrer as páginas (padrão: de 97 até 1)
+    try:
+        for page_number in intervalo_paginas(config, 'noticias'):
+            if prazo_esgotado():
+                break
+            processar_pagina(config['site']['base_url'], page_number, config['noticias']['pasta'])
+    except PrazoEsgotado as e:
+        print(f"\n⏰ {e}")
+    finally:
+        escritor.encerrar()
+
+    if resumo_hedge():
+        print(f"⚡ Hedge: {resumo_hedge()}")
+    if prazo_esgotado():
+        print("\n⏰ Prazo da execução esgotado: coleta encerrada antes da última página")
+    else:
+        print("\nProcesso concluído para todas as páginas.")
+
+if __name__ == "__main__":
+    main()
 
 '''
 import requests
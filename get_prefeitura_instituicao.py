@@ -1,18 +1,32 @@
 import requests
 from bs4 import BeautifulSoup
-import base64
 import os
+import argparse
+from extrator_inline import extrair_inline_de_fluxo
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos, PADRAO
+import requisicoes
+from requisicoes import obter
 
-def coletar_dados_prefeitura():
-    url = "https://www.juareztavora.pb.gov.br/instituicao"
+def coletar_dados_prefeitura(base_url=PADRAO['site']['base_url']):
+    url = f"{base_url}/instituicao"
+    pasta = "prefeitura_instituicao"
     
     try:
-        # Fazer requisição à página
-        response = requests.get(url)
+        # Criar pasta prefeitura_instituicao se não existir
+        if not os.path.exists(pasta):
+            os.makedirs(pasta)
+            print(f"Pasta '{pasta}' criada!")
+
+        # Fazer requisição à página em modo streaming: as imagens em base64
+        # vão direto para o disco enquanto o HTML é recebido
+        response = obter(url, stream=True)
         response.raise_for_status()
+        html, imagens_inline = extrair_inline_de_fluxo(
+            response.iter_content(chunk_size=64 * 1024), pasta, prefixo='imagem_historia'
+        )
         
-        # Parse do HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Parse do HTML (já sem o conteúdo base64)
+        soup = BeautifulSoup(html, 'html.parser')
         
         # Encontrar o elemento container principal
         container = soup.find('div', class_='container p-4')
@@ -24,48 +38,34 @@ def coletar_dados_prefeitura():
         # Coletar todo o texto do container
         texto_completo = container.get_text(separator='\n', strip=True)
         
-        # Encontrar a imagem
-        imagem_element = container.find('img')
-        imagem_data = None
-        formato_imagem = None
-        
-        if imagem_element and 'src' in imagem_element.attrs:
-            src = imagem_element['src']
-            
-            # Verificar se é uma imagem em base64
-            if src.startswith('data:image/'):
-                # Extrair dados base64
-                header, data = src.split(',', 1)
-                formato_imagem = header.split('/')[1].split(';')[0]
-                imagem_data = base64.b64decode(data)
-        
-        # Criar pasta prefeitura_instituicao se não existir
-        pasta = "prefeitura_instituicao"
-        if not os.path.exists(pasta):
-            os.makedirs(pasta)
-            print(f"Pasta '{pasta}' criada!")
+        # Imagens do container: o src agora aponta para o arquivo salvo
+        srcs_container = {img.get('src') for img in container.find_all('img')}
+        imagens = []
+        for ativo in imagens_inline:
+            if ativo['arquivo'] in srcs_container:
+                if ativo['caminho'] not in imagens:
+                    imagens.append(ativo['caminho'])
+            elif not ativo['duplicado'] and os.path.exists(ativo['caminho']):
+                # Imagem embutida fora do conteúdo (ícones, logos): descarta
+                os.remove(ativo['caminho'])
+        formato_imagem = imagens[0].rsplit('.', 1)[-1] if imagens else None
         
         # Salvar o texto na pasta prefeitura_instituicao
         arquivo_texto = os.path.join(pasta, "texto_completo.txt")
         with open(arquivo_texto, 'w', encoding='utf-8') as f:
             f.write(texto_completo)
         
-        # Salvar a imagem na pasta prefeitura_instituicao se existir
-        if imagem_data and formato_imagem:
-            arquivo_imagem = os.path.join(pasta, f"imagem_historia.{formato_imagem}")
-            with open(arquivo_imagem, 'wb') as f:
-                f.write(imagem_data)
-        
         print(f"✓ Dados salvos na pasta '{pasta}':")
         print(f"  - Texto completo: {arquivo_texto}")
-        if imagem_data:
-            print(f"  - Imagem: {arquivo_imagem}")
+        if imagens:
+            for arquivo_imagem in imagens:
+                print(f"  - Imagem: {arquivo_imagem}")
         else:
             print(f"  - Imagem: Não foi possível baixar a imagem")
         
         return {
             'texto': texto_completo,
-            'imagem_data': imagem_data,
+            'imagens': imagens,
             'formato_imagem': formato_imagem
         }
         
@@ -78,8 +78,12 @@ def coletar_dados_prefeitura():
 
 # Executar o script
 if __name__ == "__main__":
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Coleta a página da instituição'))
+    config = configuracao_dos_argumentos(parser.parse_args())
+    requisicoes.configurar(config['rede'])
+    requisicoes.configurar_arquivo(config['arquivo_respostas'])
     print("Coletando dados da prefeitura...")
-    dados = coletar_dados_prefeitura()
+    dados = coletar_dados_prefeitura(config['site']['base_url'])
     
     if dados:
         print("\n" + "="*60)
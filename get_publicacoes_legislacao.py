@@ -1,45 +1,41 @@
 import os
 import re
-import json
-import requests
+import argparse
 from bs4 import BeautifulSoup
 from time import sleep
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos, intervalo_paginas
+import requisicoes
+import escritor
+import perfil
+from requisicoes import obter, baixar, prazo_esgotado, resumo_hedge, PrazoEsgotado
 
 BASE_URL = "https://www.juareztavora.pb.gov.br"
 BASE_DIR = "publicacoes/legislacoes"
-os.makedirs(BASE_DIR, exist_ok=True)
 
 def sanitize_folder_name(name: str) -> str:
     return re.sub(r'[^a-zA-Z0-9]', '_', name.strip())
 
-def process_page(page_number: int):
-    url = f"{BASE_URL}/legislacoes?page={page_number}"
-    print(f"\n=== Página {page_number} ===")
+def list_page(page_number: int, base_url: str = BASE_URL):
+    """Itens (titulo, data, link de detalhes) de uma página da listagem; None se falhar"""
+    url = f"{base_url}/legislacoes?page={page_number}"
     try:
-        resp = requests.get(url)
+        with perfil.etapa('listagem'):
+            resp = obter(url)
         resp.raise_for_status()
     except Exception as e:
         print(f"[!] Erro ao acessar {url}: {e}")
-        return
+        return None
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    with perfil.etapa('parse'):
+        soup = BeautifulSoup(resp.text, "html.parser")
+    with perfil.etapa('extracao'):
+        return parse_list(soup)
 
+def parse_list(soup):
+    """Itens da listagem já carregada no BeautifulSoup"""
+    itens = []
     # Pega todos os títulos
-    titulos = soup.find_all("h5", class_="text-md-left text-uppercase")
-
-    if not titulos:
-        print(f"[!] Nenhuma lei encontrada na página {page_number}")
-        return
-
-    for titulo_tag in titulos:
-        titulo = titulo_tag.get_text(strip=True)
-        print(f"Processando: {titulo}")
-
-        # Pasta da lei
-        folder_name = sanitize_folder_name(titulo)
-        folder_path = os.path.join(BASE_DIR, folder_name)
-        os.makedirs(folder_path, exist_ok=True)
-
+    for titulo_tag in soup.find_all("h5", class_="text-md-left text-uppercase"):
         # Data
         li_data = titulo_tag.find_next("li", class_="mr-md-4 p-1")
         data_text = li_data.get_text(strip=True) if li_data else ""
@@ -48,54 +44,118 @@ def process_page(page_number: int):
         detalhes_div = titulo_tag.find_parent().find_next("div", class_="job-right my-4 flex-shrink-0")
         detalhes_url = detalhes_div.find("a")["href"] if detalhes_div else None
 
-        descricao = ""
-        pdf_filename = ""
+        itens.append({"titulo": titulo_tag.get_text(strip=True), "data": data_text, "detalhes": detalhes_url})
+    return itens
+
+def process_item(item: dict, base_dir: str = BASE_DIR):
+    """Baixa descrição e PDF de uma lei e grava o dados.json na pasta dela
+    (None se a página de detalhes não puder ser acessada)"""
+    titulo = item["titulo"]
+    print(f"Processando: {titulo}")
 
-        if detalhes_url:
-            try:
-                resp_det = requests.get(detalhes_url)
-                resp_det.raise_for_status()
+    # Pasta da lei
+    folder_name = sanitize_folder_name(titulo)
+    folder_path = os.path.join(base_dir, folder_name)
+    os.makedirs(folder_path, exist_ok=True)
+
+    detalhes_url = item["detalhes"]
+    descricao = ""
+    pdf_filename = ""
+
+    if detalhes_url:
+        try:
+            with perfil.etapa('detalhe'):
+                resp_det = obter(detalhes_url, hedge='detalhe_legislacao')
+            resp_det.raise_for_status()
+        except Exception as e:
+            print(f"[!] Erro ao acessar detalhes da lei {titulo}: {e}")
+            return None
+
+        try:
+            with perfil.etapa('parse'):
                 soup_det = BeautifulSoup(resp_det.text, "html.parser")
 
-                # Descrição
-                desc_tag = soup_det.find("div", class_="mt-4")
-                if desc_tag and desc_tag.find("p"):
-                    descricao = desc_tag.find("p").get_text(strip=True)
-
-                # PDF
-                alert_div = soup_det.find("div", class_="alert alert-warning")
-                if alert_div and alert_div.find("a"):
-                    pdf_url = alert_div.find("a")["href"]
-                    pdf_filename = os.path.basename(pdf_url)
-                    pdf_path = os.path.join(folder_path, pdf_filename)
-
-                    pdf_resp = requests.get(pdf_url)
-                    if pdf_resp.status_code == 200:
-                        with open(pdf_path, "wb") as f:
-                            f.write(pdf_resp.content)
-                        print(f"  [+] PDF salvo: {pdf_path}")
-            except Exception as e:
-                print(f"[!] Erro ao processar detalhes da lei {titulo}: {e}")
-
-        # JSON
-        data_json = {
-            "titulo": titulo,
-            "data": data_text,
-            "descricao": descricao,
-            "arquivo": pdf_filename
-        }
-        json_path = os.path.join(folder_path, "dados.json")
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data_json, f, ensure_ascii=False, indent=4)
-
-        print(f"  [+] JSON salvo: {json_path}")
+            # Descrição
+            desc_tag = soup_det.find("div", class_="mt-4")
+            if desc_tag and desc_tag.find("p"):
+                descricao = desc_tag.find("p").get_text(strip=True)
+
+            # PDF
+            alert_div = soup_det.find("div", class_="alert alert-warning")
+            if alert_div and alert_div.find("a"):
+                pdf_url = alert_div.find("a")["href"]
+                pdf_filename = os.path.basename(pdf_url)
+                pdf_path = os.path.join(folder_path, pdf_filename)
+
+                with perfil.etapa('download'):
+                    status = baixar(pdf_url, pdf_path)
+                if status == 200:
+                    print(f"  [+] PDF salvo: {pdf_path}")
+        except Exception as e:
+            print(f"[!] Erro ao processar detalhes da lei {titulo}: {e}")
+
+    # JSON
+    data_json = {
+        "titulo": titulo,
+        "data": item["data"],
+        "descricao": descricao,
+        "arquivo": pdf_filename
+    }
+    json_path = os.path.join(folder_path, "dados.json")
+    with perfil.etapa('gravacao_json'):
+        escritor.gravar_json(json_path, data_json)
+
+    print(f"  [+] JSON salvo: {json_path}")
+    return data_json
+
+def process_page(page_number: int, base_url: str = BASE_URL, base_dir: str = BASE_DIR):
+    print(f"\n=== Página {page_number} ===")
+    itens = list_page(page_number, base_url)
+    if itens is None:
+        return
+
+    if not itens:
+        print(f"[!] Nenhuma lei encontrada na página {page_number}")
+        return
+
+    for item in itens:
+        if prazo_esgotado():
+            return
+        process_item(item, base_dir)
 
     # Pausa curta para não sobrecarregar o servidor
     sleep(1)
 
-# Loop da página 47 até a 1
-for page in range(47, 0, -1):
-    process_page(page)
+def main():
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Coleta as legislações do portal'))
+    parser.add_argument('--reextrair', action='store_true',
+                        help='Refaz a extração a partir do arquivo de respostas, sem acessar a rede')
+    perfil.adicionar_argumento(parser)
+    args = parser.parse_args()
+    perfil.iniciar(args.perfil)
+    config = configuracao_dos_argumentos(args)
+    requisicoes.configurar(config['rede'])
+    requisicoes.configurar_arquivo(config['arquivo_respostas'], offline=args.reextrair)
+    escritor.configurar(config['escrita'])
+    base_dir = config['legislacoes']['pasta']
+    os.makedirs(base_dir, exist_ok=True)
+
+    # Loop da página 47 até a 1 (padrão)
+    try:
+        for page in intervalo_paginas(config, 'legislacoes'):
+            if prazo_esgotado():
+                print("[!] Prazo da execução esgotado: coleta encerrada antes da última página")
+                break
+            process_page(page, config['site']['base_url'], base_dir)
+    except PrazoEsgotado as e:
+        print(f"[!] {e}")
+    finally:
+        escritor.encerrar()
+    if resumo_hedge():
+        print(f"[+] Hedge: {resumo_hedge()}")
+
+if __name__ == "__main__":
+    main()
 
 
 
@@ -1,15 +1,17 @@
-import requests
 from bs4 import BeautifulSoup
 import json
 import time
-
-BASE_URL = "https://www.juareztavora.pb.gov.br/videos?page={}"
+import argparse
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos, intervalo_paginas
+import requisicoes
+from requisicoes import obter, prazo_esgotado
 
 def scrape_videos(url):
-    response = requests.get(url)
+    response = obter(url)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
+    return parse_videos(BeautifulSoup(response.text, "html.parser"))
 
+def parse_videos(soup):
     videos = []
     video_divs = soup.find_all("div", class_="col-lg-3 mt-3")
 
@@ -28,11 +30,19 @@ def scrape_videos(url):
     return videos
 
 def main():
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Coleta os vídeos do portal'))
+    config = configuracao_dos_argumentos(parser.parse_args())
+    requisicoes.configurar(config['rede'])
+    requisicoes.configurar_arquivo(config['arquivo_respostas'])
+    url_listagem = config['site']['base_url'].rstrip('/') + '/videos?page={}'
     all_videos = []
 
-    # Loop da página 10 até a 1
-    for page in range(10, 0, -1):
-        url = BASE_URL.format(page)
+    # Loop da página 10 até a 1 (padrão)
+    for page in intervalo_paginas(config, 'videos'):
+        if prazo_esgotado():
+            print("⏰ Prazo da execução esgotado: salvando os vídeos coletados até aqui")
+            break
+        url = url_listagem.format(page)
         print(f"🔎 Coletando vídeos da página {page}...")
         try:
             videos = scrape_videos(url)
@@ -43,7 +53,7 @@ def main():
         time.sleep(1)  # Pausa leve para não sobrecarregar o servidor
 
     # Salvar em JSON
-    with open("videos.json", "w", encoding="utf-8") as f:
+    with open(config['videos']['arquivo'], "w", encoding="utf-8") as f:
         json.dump(all_videos, f, ensure_ascii=False, indent=4)
 
     print("\n📂 Coleta concluída!")
@@ -0,0 +1,208 @@
+import os
+import glob
+import json
+import time
+import sqlite3
+import argparse
+
+# Onde cada scraper grava seus registros
+PASTA_NOTICIAS = '.'  # get_noticias.py grava pagina*/noticia* no diretório atual
+PASTA_LEGISLACOES = 'publicacoes/legislacoes'
+PASTA_LICITACOES = 'Licitações'
+ARQUIVO_INDICE = 'indice_busca.sqlite'
+
+# Para cada tipo: padrão dos dados.json e como tirar título, data, texto e link
+FONTES = {
+    'noticia': {
+        'padrao': os.path.join('pagina*', 'noticia*', 'dados.json'),
+        'titulo': lambda d: d.get('Titulo', ''),
+        'data': lambda d: d.get('Data', ''),
+        'texto': lambda d: d.get('Texto', ''),
+        'link': lambda d: d.get('Link', ''),
+    },
+    'legislacao': {
+        'padrao': os.path.join('*', 'dados.json'),
+        'titulo': lambda d: d.get('titulo', ''),
+        'data': lambda d: d.get('data', ''),
+        'texto': lambda d: d.get('descricao', ''),
+        # O dados.json das legislações não guarda o endereço da página: o
+        # resultado mostra o caminho do dados.json, cuja pasta tem o PDF
+        'link': lambda d: '',
+    },
+    'licitacao': {
+        'padrao': os.path.join('Pagina*', 'licitacao*', 'dados.json'),
+        'titulo': lambda d: ' '.join(filter(None, [d.get('Modalidade', ''), d.get('Número da Licitação', '')])),
+        'data': lambda d: d.get('Publicação', ''),
+        'texto': lambda d: d.get('Objetivo', ''),
+        'link': lambda d: d.get('Link', ''),
+    },
+}
+
+def abrir_indice(arquivo_indice):
+    """Abre (ou cria) o índice SQLite com a tabela FTS5.
+
+    O tokenizador unicode61 com remove_diacritics faz o 'accent folding':
+    'licitação', 'licitacao' e 'LICITAÇÃO' caem no mesmo termo, tanto na
+    indexação quanto na consulta."""
+    conexao = sqlite3.connect(arquivo_indice)
+    conexao.execute('PRAGMA journal_mode=WAL')
+    conexao.execute('PRAGMA synchronous=NORMAL')
+    conexao.execute('''
+        CREATE TABLE IF NOT EXISTS registros (
+            id INTEGER PRIMARY KEY,
+            caminho TEXT UNIQUE NOT NULL,
+            tipo TEXT NOT NULL,
+            mtime REAL NOT NULL,
+            titulo TEXT,
+            data TEXT,
+            link TEXT
+        )
+    ''')
+    conexao.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS busca USING fts5(
+            titulo, texto,
+            tokenize = "unicode61 remove_diacritics 2"
+        )
+    ''')
+    return conexao
+
+def listar_fontes(pastas):
+    """Gera (tipo, caminho) para todos os dados.json encontrados"""
+    for tipo, pasta in pastas.items():
+        if not pasta or not os.path.isdir(pasta):
+            continue
+        for caminho in glob.glob(os.path.join(pasta, FONTES[tipo]['padrao'])):
+            yield tipo, os.path.abspath(caminho)
+
+def indexar(conexao, pastas):
+    """Atualiza o índice de forma incremental: só relê arquivos novos ou
+    modificados (pelo mtime) e remove do índice os que sumiram do disco."""
+    inicio = time.perf_counter()
+    existentes = {
+        caminho: (id_registro, mtime)
+        for id_registro, caminho, mtime in conexao.execute('SELECT id, caminho, mtime FROM registros')
+    }
+    vistos = set()
+    novos = atualizados = 0
+
+    with conexao:
+        for tipo, caminho in listar_fontes(pastas):
+            vistos.add(caminho)
+            try:
+                mtime = os.stat(caminho).st_mtime
+            except OSError:
+                continue
+
+            anterior = existentes.get(caminho)
+            if anterior and anterior[1] == mtime:
+                continue
+
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+            except Exception as e:
+                print(f"  ⚠️ Erro ao ler {caminho}: {e}")
+                continue
+
+            fonte = FONTES[tipo]
+            titulo = fonte['titulo'](dados)
+            texto = fonte['texto'](dados)
+
+            if anterior:
+                id_registro = anterior[0]
+                conexao.execute(
+                    'UPDATE registros SET mtime = ?, titulo = ?, data = ?, link = ? WHERE id = ?',
+                    (mtime, titulo, fonte['data'](dados), fonte['link'](dados), id_registro)
+                )
+                conexao.execute('DELETE FROM busca WHERE rowid = ?', (id_registro,))
+                atualizados += 1
+            else:
+                cursor = conexao.execute(
+                    'INSERT INTO registros (caminho, tipo, mtime, titulo, data, link) VALUES (?, ?, ?, ?, ?, ?)',
+                    (caminho, tipo, mtime, titulo, fonte['data'](dados), fonte['link'](dados))
+                )
+                id_registro = cursor.lastrowid
+                novos += 1
+            conexao.execute('INSERT INTO busca (rowid, titulo, texto) VALUES (?, ?, ?)',
+                            (id_registro, titulo, texto))
+
+        removidos = [existentes[caminho][0] for caminho in existentes.keys() - vistos]
+        for id_registro in removidos:
+            conexao.execute('DELETE FROM busca WHERE rowid = ?', (id_registro,))
+            conexao.execute('DELETE FROM registros WHERE id = ?', (id_registro,))
+
+    duracao = time.perf_counter() - inicio
+    print(f"✅ Índice atualizado em {duracao:.2f}s: {novos} novos, "
+          f"{atualizados} atualizados, {len(removidos)} removidos")
+
+def montar_consulta(termos):
+    """Coloca cada termo entre aspas para que pontuação não vire sintaxe FTS5;
+    um '*' no final do termo mantém a busca por prefixo."""
+    partes = []
+    for termo in termos.split():
+        prefixo = termo.endswith('*')
+        termo = termo.rstrip('*').replace('"', '""')
+        if termo:
+            partes.append(f'"{termo}"*' if prefixo else f'"{termo}"')
+    return ' '.join(partes)
+
+def buscar(conexao, termos, tipo=None, limite=20, consulta_bruta=False):
+    """Retorna os registros mais relevantes (bm25, título pesa mais que o texto)"""
+    consulta = termos if consulta_bruta else montar_consulta(termos)
+    if not consulta:
+        return []
+    sql = '''
+        SELECT r.tipo, r.titulo, r.data, r.link, r.caminho,
+               snippet(busca, 1, '[', ']', '…', 16)
+        FROM busca
+        JOIN registros r ON r.id = busca.rowid
+        WHERE busca MATCH ?
+    '''
+    parametros = [consulta]
+    if tipo:
+        sql += ' AND r.tipo = ?'
+        parametros.append(tipo)
+    sql += ' ORDER BY bm25(busca, 5.0, 1.0) LIMIT ?'
+    parametros.append(limite)
+    return conexao.execute(sql, parametros).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description='Índice de busca textual sobre os dados coletados')
+    parser.add_argument('--indice', default=ARQUIVO_INDICE, help='Arquivo SQLite do índice')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    p_indexar = subparsers.add_parser('indexar', help='Cria ou atualiza o índice')
+    p_indexar.add_argument('--noticias', default=PASTA_NOTICIAS)
+    p_indexar.add_argument('--legislacoes', default=PASTA_LEGISLACOES)
+    p_indexar.add_argument('--licitacoes', default=PASTA_LICITACOES)
+
+    p_buscar = subparsers.add_parser('buscar', help='Pesquisa no índice')
+    p_buscar.add_argument('termos')
+    p_buscar.add_argument('--tipo', choices=sorted(FONTES))
+    p_buscar.add_argument('--limite', type=int, default=20)
+    p_buscar.add_argument('--bruta', action='store_true',
+                          help='Usa a consulta como sintaxe FTS5 (AND, OR, NEAR, "frase")')
+
+    args = parser.parse_args()
+    conexao = abrir_indice(args.indice)
+
+    if args.comando == 'indexar':
+        indexar(conexao, {
+            'noticia': args.noticias,
+            'legislacao': args.legislacoes,
+            'licitacao': args.licitacoes,
+        })
+    else:
+        inicio = time.perf_counter()
+        resultados = buscar(conexao, args.termos, args.tipo, args.limite, args.bruta)
+        duracao = (time.perf_counter() - inicio) * 1000
+        for tipo, titulo, data, link, caminho, trecho in resultados:
+            print(f"\n[{tipo}] {titulo} ({data})")
+            print(f"  {trecho}")
+            print(f"  {link or caminho}")
+        print(f"\n🔎 {len(resultados)} resultado(s) em {duracao:.1f} ms")
+
+    conexao.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import sys
+import time
+
+_inicio = time.perf_counter()
+
+import atexit
+import runpy
+import builtins
+import threading
+
+# Ponto de entrada leve para os scripts (pensado para o cron): só importa o
+# script pedido, e cada script só importa as dependências pesadas (selenium,
+# webdriver_manager) quando a etapa que precisa delas começa.
+#
+#   python iniciar.py                          lista os comandos
+#   python iniciar.py licitacoes --incremental
+#   python iniciar.py --tempo-inicio upload --dry-run
+
+COMANDOS = {
+    'noticias': ('get_noticias', 'Coleta as notícias'),
+    'licitacoes': ('get_licitacoes', 'Coleta as licitações'),
+    'legislacoes': ('get_publicacoes_legislacao', 'Coleta as legislações'),
+    'videos': ('get_videos', 'Coleta os vídeos'),
+    'vice-prefeito': ('get_prefeito_viceprefeito', 'Coleta a página do vice-prefeito'),
+    'instituicao': ('get_prefeitura_instituicao', 'Coleta a página da instituição'),
+    'distribuido': ('crawl_distribuido', 'Coleta distribuída com fila compartilhada'),
+    'upload': ('upload_noticias_novo', 'Cadastra no CMS os registros coletados'),
+    'pdfs': ('extrair_texto_pdfs', 'Extrai o texto dos PDFs'),
+    'imagens': ('otimizar_imagens', 'Otimiza as imagens coletadas'),
+    'indexar': ('indexar_busca', 'Índice de busca dos registros'),
+    'parquet': ('exportar_licitacoes_parquet', 'Exporta as licitações para Parquet'),
+    'arquivo': ('arquivo_respostas', 'Consulta o arquivo de respostas HTML'),
+    'benchmark': ('benchmark_extratores', 'Benchmark das extrações'),
+}
+
+class MedidorImportacoes:
+    """Soma o tempo de cada importação feita pela primeira vez, contando só a
+    de fora (importar o selenium inclui os submódulos dele)"""
+
+    def __init__(self):
+        self.tempos = {}
+        self.local = threading.local()
+        self.original = builtins.__import__
+
+    def __call__(self, nome, globais=None, locais=None, lista=(), nivel=0):
+        if nivel or nome in sys.modules or getattr(self.local, 'dentro', False):
+            return self.original(nome, globais, locais, lista, nivel)
+        self.local.dentro = True
+        inicio = time.perf_counter()
+        try:
+            return self.original(nome, globais, locais, lista, nivel)
+        finally:
+            self.local.dentro = False
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + time.perf_counter() - inicio
+
+    def instalar(self):
+        builtins.__import__ = self
+
+def mostrar_tempos(medidor, comeco_script):
+    fim = time.perf_counter()
+    mais_caras = sorted(medidor.tempos.items(), key=lambda item: item[1], reverse=True)[:8]
+    print(f"\n⏱️ Inicialização: {(comeco_script - _inicio) * 1000:.0f} ms até o script começar, "
+          f"{(fim - _inicio) * 1000:.0f} ms no total", file=sys.stderr)
+    for nome, tempo in mais_caras:
+        print(f"   {tempo * 1000:7.1f} ms  import {nome}", file=sys.stderr)
+
+def listar_comandos():
+    print("Uso: python iniciar.py [--tempo-inicio] COMANDO [opções do comando]\n")
+    for comando, (modulo, descricao) in COMANDOS.items():
+        print(f"  {comando:<15} {descricao} ({modulo}.py)")
+    print("\nOpções de cada comando: python iniciar.py COMANDO --help")
+
+def main(argumentos):
+    medir = '--tempo-inicio' in argumentos[:1]
+    if medir:
+        argumentos = argumentos[1:]
+    if not argumentos or argumentos[0] in ('-h', '--help'):
+        listar_comandos()
+        return 0
+    if argumentos[0] not in COMANDOS:
+        print(f"❌ Comando desconhecido: {argumentos[0]}\n")
+        listar_comandos()
+        return 2
+
+    modulo = COMANDOS[argumentos[0]][0]
+    if medir:
+        medidor = MedidorImportacoes()
+        medidor.instalar()
+        atexit.register(mostrar_tempos, medidor, time.perf_counter())
+    sys.argv = [f'{modulo}.py'] + argumentos[1:]
+    runpy.run_module(modulo, run_name='__main__', alter_sys=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,173 @@
+import os
+import glob
+import json
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow só é necessário para esta etapa
+    Image = None
+    ImageOps = None
+
+PASTA_NOTICIAS = '.'  # get_noticias.py grava pagina*/noticia* no diretório atual
+PASTA_CACHE = '.cache_imagens'
+PASTA_OTIMIZADAS = 'otimizadas'
+ARQUIVO_MANIFESTO = 'otimizadas.json'  # lido pelo upload_noticias_novo.py
+
+DIMENSAO_MAXIMA = 1600
+QUALIDADE = 82
+# GIFs ficam de fora para não perder animações
+EXTENSOES_IMAGEM = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tif', '.tiff')
+
+def hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def otimizar_imagem(origem, destino, dimensao_maxima, formato, qualidade):
+    """Roda no processo filho: reduz, recomprime e remove metadados (EXIF/ICC)"""
+    temporario = destino + '.tmp'
+    try:
+        with Image.open(origem) as imagem:
+            imagem = ImageOps.exif_transpose(imagem)  # aplica a rotação antes de descartar o EXIF
+            imagem.thumbnail((dimensao_maxima, dimensao_maxima), Image.LANCZOS)
+
+            if formato == 'jpeg' and imagem.mode not in ('RGB', 'L'):
+                # JPEG não tem transparência: compõe sobre fundo branco
+                fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+                convertida = imagem.convert('RGBA')
+                fundo.paste(convertida, mask=convertida.split()[-1])
+                imagem = fundo
+
+            if formato == 'webp':
+                imagem.save(temporario, 'WEBP', quality=qualidade, method=6)
+            else:
+                imagem.save(temporario, 'JPEG', quality=qualidade, optimize=True, progressive=True)
+        os.replace(temporario, destino)
+    except BaseException:
+        # Uma gravação interrompida não pode ficar para trás como arquivo parcial
+        remover_temporario(temporario)
+        raise
+    return os.path.getsize(origem), os.path.getsize(destino)
+
+def remover_temporario(caminho):
+    try:
+        os.remove(caminho)
+    except FileNotFoundError:
+        pass
+
+def listar_imagens(pasta_base):
+    """Gera (pasta_noticia, nome_arquivo) para cada imagem listada em 'Imagens'"""
+    for caminho_json in glob.glob(os.path.join(pasta_base, 'pagina*', 'noticia*', 'dados.json')):
+        try:
+            with open(caminho_json, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            print(f"  ⚠️ Erro ao ler {caminho_json}: {e}")
+            continue
+        pasta_noticia = os.path.dirname(caminho_json)
+        imagens_str = dados.get('Imagens', '')
+        for nome in (img.strip() for img in imagens_str.split(',') if img.strip()):
+            if nome.lower().endswith(EXTENSOES_IMAGEM) and os.path.exists(os.path.join(pasta_noticia, nome)):
+                yield pasta_noticia, nome
+
+def atualizar_manifestos(resultados):
+    for pasta_noticia, itens in resultados.items():
+        caminho = os.path.join(pasta_noticia, ARQUIVO_MANIFESTO)
+        manifesto = {}
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                manifesto = json.load(f)
+        manifesto.update(itens)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+def publicar(pasta_noticia, nome, arquivo_cache, extensao, resultados):
+    """Copia do cache para <noticia>/otimizadas/ e registra no manifesto"""
+    pasta_destino = os.path.join(pasta_noticia, PASTA_OTIMIZADAS)
+    os.makedirs(pasta_destino, exist_ok=True)
+    # A extensão original fica no nome: foto.png e foto.jpg da mesma notícia não colidem
+    nome_destino = nome + extensao
+    destino = os.path.join(pasta_destino, nome_destino)
+    try:
+        shutil.copyfile(arquivo_cache, destino + '.tmp')
+        os.replace(destino + '.tmp', destino)
+    except BaseException:
+        remover_temporario(destino + '.tmp')
+        raise
+    resultados.setdefault(pasta_noticia, {})[nome] = os.path.join(PASTA_OTIMIZADAS, nome_destino)
+
+def processar(pasta_base, pasta_cache, dimensao_maxima, formato, qualidade, processos):
+    os.makedirs(pasta_cache, exist_ok=True)
+    extensao = '.webp' if formato == 'webp' else '.jpg'
+    pendentes = {}
+    resultados = {}
+    em_cache = 0
+
+    for pasta_noticia, nome in listar_imagens(pasta_base):
+        origem = os.path.join(pasta_noticia, nome)
+        sha = hash_arquivo(origem)
+        arquivo_cache = os.path.join(pasta_cache, f'{sha}_{dimensao_maxima}_{qualidade}{extensao}')
+        if os.path.exists(arquivo_cache):
+            if os.path.getsize(arquivo_cache) < os.path.getsize(origem):
+                publicar(pasta_noticia, nome, arquivo_cache, extensao, resultados)
+            em_cache += 1
+        else:
+            pendentes.setdefault(arquivo_cache, []).append((pasta_noticia, nome))
+
+    print(f"🖼️ {em_cache} imagens já em cache, {len(pendentes)} para otimizar com {processos} processos")
+
+    bytes_antes = bytes_depois = 0
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        futuros = {}
+        for arquivo_cache, destinos in pendentes.items():
+            pasta_noticia, nome = destinos[0]
+            futuro = pool.submit(otimizar_imagem, os.path.join(pasta_noticia, nome),
+                                 arquivo_cache, dimensao_maxima, formato, qualidade)
+            futuros[futuro] = arquivo_cache
+
+        for futuro in as_completed(futuros):
+            arquivo_cache = futuros[futuro]
+            try:
+                antes, depois = futuro.result()
+            except Exception as e:
+                print(f"  ❌ {pendentes[arquivo_cache][0]}: {e}")
+                continue
+            if depois >= antes:
+                # Já estava bem comprimida: o upload continua usando a original
+                continue
+            bytes_antes += antes
+            bytes_depois += depois
+            for pasta_noticia, nome in pendentes[arquivo_cache]:
+                publicar(pasta_noticia, nome, arquivo_cache, extensao, resultados)
+
+    atualizar_manifestos(resultados)
+    if bytes_antes:
+        print(f"📉 {bytes_antes / 1024 / 1024:.1f} MB → {bytes_depois / 1024 / 1024:.1f} MB "
+              f"({100 - bytes_depois * 100 / bytes_antes:.0f}% menos para enviar)")
+    print(f"\n✅ Otimização concluída: {len(resultados)} notícias atualizadas")
+
+def main():
+    parser = argparse.ArgumentParser(description='Otimiza as imagens das notícias antes do upload no CMS')
+    parser.add_argument('--pasta', default=PASTA_NOTICIAS, help='Pasta com pagina*/noticia*')
+    parser.add_argument('--cache', default=PASTA_CACHE)
+    parser.add_argument('--dimensao-maxima', type=int, default=DIMENSAO_MAXIMA)
+    parser.add_argument('--formato', choices=['jpeg', 'webp'], default='jpeg')
+    parser.add_argument('--qualidade', type=int, default=QUALIDADE)
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if Image is None:
+        print("❌ Pillow não está instalado (pip install Pillow)")
+        return
+
+    processar(args.pasta, args.cache, args.dimensao_maxima, args.formato,
+              args.qualidade, max(1, args.processos))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import atexit
+import threading
+import contextlib
+from collections import defaultdict
+
+# Perfil de desempenho por etapa (--profile). O código marca trechos com
+#     with perfil.etapa('detalhe'):
+# e, com o perfil ligado, o tempo de cada etapa é somado (em todas as threads,
+# com etapas aninhadas). Ao final são gravados:
+#   <prefixo>.folded - pilhas de etapas no formato "a;b;c microssegundos",
+#                      aceito por flamegraph.pl, speedscope e inferno
+#   <prefixo>.prof   - estatísticas do cProfile por função (pstats / snakeviz)
+#   <prefixo>.txt    - resumo com as N etapas e funções mais caras
+# Sem --profile, etapa() devolve um contexto vazio e não custa quase nada.
+
+PREFIXO_PADRAO = 'perfil'
+TOP_N = 25
+
+_ativo = False
+_nulo = contextlib.nullcontext()
+_trava = threading.Lock()
+_local = threading.local()
+_tempos = defaultdict(float)
+_contagens = defaultdict(int)
+_pilhas = defaultdict(float)  # tempo próprio (sem as etapas filhas) por pilha
+_perfis = []
+_estado = {'prefixo': PREFIXO_PADRAO, 'inicio': 0.0, 'raiz': ''}
+
+class _Etapa:
+    __slots__ = ('nome', 'inicio', 'filhos')
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        pilha = getattr(_local, 'pilha', None)
+        if pilha is None:
+            pilha = _local.pilha = []
+        pilha.append(self)
+        self.filhos = 0.0
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        duracao = time.perf_counter() - self.inicio
+        pilha = _local.pilha
+        chave = ';'.join([_estado['raiz']] + [etapa.nome for etapa in pilha])
+        pilha.pop()
+        if pilha:
+            pilha[-1].filhos += duracao
+        with _trava:
+            _tempos[self.nome] += duracao
+            _contagens[self.nome] += 1
+            _pilhas[chave] += duracao - self.filhos
+        return False
+
+def etapa(nome):
+    if not _ativo:
+        return _nulo
+    return _Etapa(nome)
+
+def adicionar_argumento(parser):
+    parser.add_argument('--profile', dest='perfil', nargs='?', const=PREFIXO_PADRAO, metavar='PREFIXO',
+                        help=f'Mede o tempo por etapa e grava PREFIXO.folded/.prof/.txt (padrão: {PREFIXO_PADRAO})')
+    return parser
+
+def iniciar(prefixo):
+    """Liga o perfil para o resto do processo (nada acontece se prefixo for vazio)"""
+    global _ativo
+    if not prefixo or _ativo:
+        return
+    import cProfile  # cProfile e pstats só quando o perfil é pedido
+    _ativo = True
+    _estado.update(prefixo=prefixo, inicio=time.perf_counter(),
+                   raiz=os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python')
+    perfil = cProfile.Profile()
+    _perfis.append(perfil)
+    perfil.enable()
+    atexit.register(finalizar)
+
+def perfilado(funcao):
+    """Envolve uma função que roda em outra thread: até o Python 3.11 o cProfile
+    só enxerga a thread em que foi ligado, então cada thread ganha o seu e tudo
+    é somado no fim. A partir do 3.12 ele usa o sys.monitoring, que vale para o
+    processo inteiro: o perfil principal já cobre as threads e um segundo não liga"""
+    def executar(*args, **kwargs):
+        if not _ativo or sys.version_info >= (3, 12):
+            return funcao(*args, **kwargs)
+        import cProfile
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:  # outra ferramenta de perfil já ativa: roda sem perfil próprio
+            return funcao(*args, **kwargs)
+        with _trava:
+            _perfis.append(perfil)
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            perfil.disable()
+    return executar
+
+def _resumo(estatisticas):
+    total = time.perf_counter() - _estado['inicio']
+    linhas = [f"Tempo total: {total:.2f}s", '', f"{'etapa':<28} {'vezes':>7} {'total (s)':>10} {'média (ms)':>11} {'%':>6}"]
+    for nome, tempo in sorted(_tempos.items(), key=lambda item: item[1], reverse=True)[:TOP_N]:
+        linhas.append(f"{nome:<28} {_contagens[nome]:>7} {tempo:>10.2f} "
+                      f"{tempo / _contagens[nome] * 1000:>11.1f} {tempo / total * 100:>6.1f}")
+    linhas += ['', f"Funções mais caras (tempo acumulado, top {TOP_N}):"]
+    if estatisticas is not None:
+        for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in sorted(
+                estatisticas.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_N]:
+            linhas.append(f"{acumulado:>9.2f}s {proprio:>8.2f}s {chamadas:>9}  "
+                          f"{os.path.basename(arquivo)}:{linha}({funcao})")
+    return '\n'.join(linhas)
+
+def finalizar():
+    global _ativo
+    if not _ativo:
+        return
+    import pstats
+    for perfil in _perfis:
+        perfil.disable()
+    _ativo = False
+    prefixo = _estado['prefixo']
+
+    estatisticas = None
+    for perfil in _perfis:
+        try:
+            if estatisticas is None:
+                estatisticas = pstats.Stats(perfil)
+            else:
+                estatisticas.add(perfil)
+        except TypeError:  # thread perfilada que não chegou a executar nada
+            continue
+    if estatisticas is not None:
+        estatisticas.dump_stats(f'{prefixo}.prof')
+
+    with open(f'{prefixo}.folded', 'w', encoding='utf-8') as f:
+        for pilha, tempo in sorted(_pilhas.items()):
+            microssegundos = int(tempo * 1_000_000)
+            if microssegundos:
+                f.write(f"{pilha} {microssegundos}\n")
+
+    resumo = _resumo(estatisticas)
+    with open(f'{prefixo}.txt', 'w', encoding='utf-8') as f:
+        f.write(resumo + '\n')
+    print(f"\n⏱️ Perfil por etapa (detalhes em {prefixo}.txt, flamegraph: {prefixo}.folded, cProfile: {prefixo}.prof)")
+    print(resumo.split('\n\nFunções')[0])
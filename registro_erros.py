@@ -0,0 +1,119 @@
+import os
+import re
+import json
+import logging
+import threading
+from datetime import datetime
+
+# Registro de erros do upload: cada falha vira uma linha JSONL (caminho, etapa,
+# exceção, horário, captura de tela) gravada por um único arquivo aberto durante
+# toda a execução. O arquivo texto legível continua sendo escrito, mas os
+# cabeçalhos já escritos ficam em memória em vez de reler o arquivo a cada erro.
+
+ARQUIVO_ERROS = 'arquivos-erro.jsonl'
+ARQUIVO_ERROS_TEXTO = 'arquivos-erro.txt'
+PASTA_CAPTURAS = 'capturas_erro'
+
+class UltimoErroHandler(logging.Handler):
+    """Guarda a última mensagem de ERROR de cada thread. As etapas do uploader
+    só devolvem True/False, então é daqui que sai o texto da exceção."""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self._local = threading.local()
+
+    def emit(self, record):
+        self._local.mensagem = record.getMessage()
+
+    def consumir(self):
+        mensagem = getattr(self._local, 'mensagem', '')
+        self._local.mensagem = ''
+        return mensagem
+
+class RegistroErros:
+    def __init__(self, arquivo=ARQUIVO_ERROS, arquivo_texto=ARQUIVO_ERROS_TEXTO, pasta_capturas=PASTA_CAPTURAS):
+        self.arquivo = arquivo
+        self.arquivo_texto = arquivo_texto
+        self.pasta_capturas = pasta_capturas
+        self.execucao = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+        self.total = 0
+        self._trava = threading.Lock()
+
+        # Lido uma única vez: daqui em diante os cabeçalhos ficam só em memória
+        self._cabecalhos = set()
+        if os.path.exists(arquivo_texto):
+            with open(arquivo_texto, 'r', encoding='utf-8') as f:
+                self._cabecalhos = {linha.rstrip('\n') for linha in f if linha.startswith('#### ')}
+
+        self._jsonl = open(arquivo, 'a', encoding='utf-8', buffering=64 * 1024)
+        self._texto = open(arquivo_texto, 'a', encoding='utf-8', buffering=64 * 1024)
+
+        self.ultimo_erro = UltimoErroHandler()
+        logging.getLogger().addHandler(self.ultimo_erro)
+
+    def capturar_tela(self, navegador, caminho):
+        """Salva um screenshot do navegador no momento da falha ('' se não conseguir)"""
+        os.makedirs(self.pasta_capturas, exist_ok=True)
+        nome = re.sub(r'[^\w.-]+', '_', os.path.relpath(caminho)).strip('_')[-150:]
+        destino = os.path.join(self.pasta_capturas, f"{self.execucao}_{self.total:05d}_{nome}.png")
+        try:
+            return destino if navegador.save_screenshot(destino) else ''
+        except Exception as e:
+            logging.warning(f"Não foi possível capturar a tela: {str(e)}")
+            return ''
+
+    def registrar(self, caminho, etapa, excecao='', tipo='', navegador=None):
+        """Registra a falha de um dados.json. Sem excecao, usa o último erro logado pela thread."""
+        excecao = str(excecao) if excecao else self.ultimo_erro.consumir()
+        captura = self.capturar_tela(navegador, caminho) if navegador is not None else ''
+        entrada = {
+            'execucao': self.execucao,
+            'horario': datetime.now().isoformat(timespec='seconds'),
+            'tipo': tipo,
+            'caminho': caminho,
+            'etapa': etapa,
+            'excecao': excecao,
+            'captura': captura,
+        }
+        cabecalho = f"#### {tipo or os.path.basename(os.path.dirname(caminho))} - {etapa} ####"
+        with self._trava:
+            self.total += 1
+            self._jsonl.write(json.dumps(entrada, ensure_ascii=False) + '\n')
+            if cabecalho not in self._cabecalhos:
+                self._cabecalhos.add(cabecalho)
+                self._texto.write(f"{cabecalho}\n")
+            self._texto.write(f"{caminho}\n")
+            # Uma chamada de sistema por erro, sem reabrir nem reler nada
+            self._jsonl.flush()
+            self._texto.flush()
+
+    def fechar(self):
+        logging.getLogger().removeHandler(self.ultimo_erro)
+        with self._trava:
+            self._jsonl.close()
+            self._texto.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+def carregar_para_reprocessar(arquivo=ARQUIVO_ERROS, execucao=None, tipo=None):
+    """Lista de trabalho para nova tentativa: os caminhos que falharam na
+    execução indicada (por padrão, a última registrada), sem repetições."""
+    if not os.path.exists(arquivo):
+        return []
+    entradas = []
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        for linha in f:
+            if linha.strip():
+                entradas.append(json.loads(linha))
+    if not entradas:
+        return []
+    execucao = execucao or entradas[-1]['execucao']
+    caminhos = [
+        entrada['caminho'] for entrada in entradas
+        if entrada['execucao'] == execucao and (tipo is None or entrada['tipo'] == tipo)
+    ]
+    return list(dict.fromkeys(caminhos))
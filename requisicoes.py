@@ -0,0 +1,279 @@
+import os
+import time
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeout
+import requests
+
+# Camada única de acesso à rede dos scrapers. Toda requisição tem timeout de
+# conexão e de leitura; timeouts, quedas de conexão e respostas 429/5xx voltam
+# para novas tentativas em vez de prender o processo. Downloads abaixo de uma
+# taxa mínima (bytes/s) são abortados e tentados de novo. Um prazo opcional para
+# a execução inteira faz os scrapers pararem de começar trabalho novo.
+#
+# Hedge (opcional, para páginas de detalhes): se a resposta não chega dentro do
+# p95 das latências recentes daquele tipo de página, uma cópia da requisição é
+# disparada e vale a que responder primeiro. As cópias ficam limitadas a uma
+# fração das requisições (orçamento) para não sobrecarregar o servidor.
+#
+# Com um ArquivoRespostas (arquivo_respostas.py), toda página HTML recebida é
+# arquivada; no modo offline (reextração) as páginas vêm só do arquivo e
+# nenhuma requisição sai para a rede.
+
+TIMEOUT_CONEXAO = 10
+TIMEOUT_LEITURA = 60
+TENTATIVAS = 3
+ESPERA_BASE = 2  # segundos, dobrando a cada tentativa
+STATUS_RETENTAVEIS = (429, 500, 502, 503, 504)
+TAXA_MINIMA = 10 * 1024  # bytes/s
+TOLERANCIA_TAXA = 30  # segundos iniciais em que a taxa ainda não é cobrada
+# Depois do prazo, requisições de itens já começados ainda têm esta folga
+FOLGA_PRAZO = 120
+# Blocos pequenos: a taxa é conferida a cada bloco recebido
+TAMANHO_BLOCO = 8 * 1024
+HEDGE_ATIVO = False
+ORCAMENTO_HEDGE = 0.1  # no máximo 1 cópia a cada 10 requisições
+JANELA_LATENCIAS = 200
+MINIMO_AMOSTRAS = 20  # antes disso o p95 não é confiável e não há cópia
+
+sessao = requests.Session()
+_prazo_final = None
+
+_trava = threading.Lock()
+_latencias = defaultdict(lambda: deque(maxlen=JANELA_LATENCIAS))
+_contagem_hedge = {'requisicoes': 0, 'copias': 0, 'vitorias_copia': 0}
+_executor = None
+_arquivo = None
+_offline = False
+
+class PrazoEsgotado(BaseException):
+    """Fim do prazo da execução. Herda de BaseException para não ser engolida
+    pelos 'except Exception' dos scrapers e deixar um registro pela metade."""
+
+class DownloadLento(requests.exceptions.Timeout):
+    pass
+
+# Falhas que valem nova tentativa (o servidor travou, caiu ou cortou a resposta)
+ERROS_TRANSITORIOS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                      requests.exceptions.ChunkedEncodingError)
+
+def configurar(rede):
+    """Aplica a seção 'rede' da configuração"""
+    global TIMEOUT_CONEXAO, TIMEOUT_LEITURA, TENTATIVAS, TAXA_MINIMA, HEDGE_ATIVO, ORCAMENTO_HEDGE
+    TIMEOUT_CONEXAO = float(rede.get('timeout_conexao', TIMEOUT_CONEXAO))
+    TIMEOUT_LEITURA = float(rede.get('timeout_leitura', TIMEOUT_LEITURA))
+    TENTATIVAS = max(1, int(rede.get('tentativas', TENTATIVAS)))
+    TAXA_MINIMA = float(rede.get('taxa_minima', TAXA_MINIMA))
+    HEDGE_ATIVO = bool(rede.get('hedge', HEDGE_ATIVO))
+    ORCAMENTO_HEDGE = float(rede.get('orcamento_hedge', ORCAMENTO_HEDGE))
+    if rede.get('prazo_minutos'):
+        definir_prazo(float(rede['prazo_minutos']) * 60)
+
+def configurar_arquivo(opcoes, offline=False):
+    """Aplica a seção 'arquivo_respostas' da configuração"""
+    offline = offline or bool(opcoes.get('offline'))
+    if not (offline or opcoes.get('ativo')):
+        return usar_arquivo(None)
+    from arquivo_respostas import ArquivoRespostas
+    usar_arquivo(ArquivoRespostas(opcoes.get('pasta') or 'arquivo_respostas'), offline)
+    if offline:
+        print(f"📦 Modo offline: as páginas vêm de '{_arquivo.pasta}', sem acesso à rede")
+
+def usar_arquivo(arquivo, offline=False):
+    global _arquivo, _offline
+    if offline and arquivo is None:
+        raise ValueError('O modo offline precisa de um arquivo de respostas')
+    _arquivo, _offline = arquivo, offline
+
+def definir_prazo(segundos):
+    global _prazo_final
+    _prazo_final = time.monotonic() + segundos if segundos else None
+
+def prazo_esgotado():
+    """True quando não se deve começar nenhum item novo"""
+    return _prazo_final is not None and time.monotonic() >= _prazo_final
+
+def _verificar_prazo(url):
+    if _prazo_final is not None and time.monotonic() >= _prazo_final + FOLGA_PRAZO:
+        raise PrazoEsgotado(f'prazo da execução esgotado antes de {url}')
+
+def _esperar(tentativa):
+    time.sleep(ESPERA_BASE * 2 ** (tentativa - 1))
+
+def obter(url, sessao_http=None, metodo='GET', tentativas=None, hedge=None, **kwargs):
+    """requests.get/head com timeouts e novas tentativas. Devolve a última
+    resposta (o chamador confere o status) ou levanta a última exceção de rede.
+    'hedge' nomeia a janela de latências (ex.: 'detalhe_licitacao') e habilita
+    a cópia da requisição quando o hedge está ativo."""
+    if _offline:
+        return _resposta_arquivada(url, metodo)
+    tentativas = tentativas or TENTATIVAS
+    if hedge and HEDGE_ATIVO and metodo == 'GET' and not kwargs.get('stream'):
+        resposta = _obter_com_hedge(hedge, url, sessao_http, tentativas, kwargs)
+    else:
+        resposta = _obter_da_rede(url, sessao_http, metodo, tentativas, kwargs)
+    # Só a resposta devolvida é arquivada (com hedge, a que chegou primeiro)
+    if _arquivo is not None and metodo == 'GET' and not kwargs.get('stream'):
+        _arquivar(resposta)
+    return resposta
+
+def _obter_da_rede(url, sessao_http, metodo, tentativas, kwargs):
+    kwargs.setdefault('timeout', (TIMEOUT_CONEXAO, TIMEOUT_LEITURA))
+    if metodo == 'HEAD':
+        kwargs.setdefault('allow_redirects', True)
+    for tentativa in range(1, tentativas + 1):
+        _verificar_prazo(url)
+        try:
+            resposta = (sessao_http or sessao).request(metodo, url, **kwargs)
+        except ERROS_TRANSITORIOS as e:
+            if tentativa == tentativas:
+                raise
+            print(f"    ⏱️ {type(e).__name__} em {url}, nova tentativa ({tentativa}/{tentativas})")
+            _esperar(tentativa)
+            continue
+        if resposta.status_code in STATUS_RETENTAVEIS and tentativa < tentativas:
+            print(f"    ⏱️ HTTP {resposta.status_code} em {url}, nova tentativa ({tentativa}/{tentativas})")
+            resposta.close()
+            _esperar(tentativa)
+            continue
+        return resposta
+
+def _arquivar(resposta):
+    try:
+        _arquivo.guardar_resposta(resposta)
+    except Exception as e:  # o arquivo nunca deve derrubar a coleta
+        print(f"    ⚠️ Resposta de {resposta.url} não arquivada: {e}")
+
+def _resposta_arquivada(url, metodo):
+    """requests.Response montada a partir do arquivo (404 se a URL não estiver lá)"""
+    resposta = requests.models.Response()
+    resposta.url = url
+    encontrada = _arquivo.buscar(url) if metodo == 'GET' else None
+    if encontrada is None:
+        resposta.status_code = 404
+        resposta.reason = 'Não arquivada'
+        resposta._content = b''
+        return resposta
+    status, cabecalhos, conteudo = encontrada
+    resposta.status_code = status
+    resposta.reason = 'Arquivada'
+    resposta.headers['Content-Type'] = cabecalhos.get('Content-Type', '')
+    resposta.encoding = cabecalhos.get('encoding')
+    resposta._content = conteudo
+    return resposta
+
+#### ---- HEDGE ---- ####
+
+def percentil_95(classe):
+    with _trava:
+        amostras = sorted(_latencias[classe])
+    if len(amostras) < MINIMO_AMOSTRAS:
+        return None
+    return amostras[int(len(amostras) * 0.95) - 1]
+
+def _executor_hedge():
+    global _executor
+    with _trava:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='hedge')
+        return _executor
+
+def _registrar_latencia(classe, inicio):
+    """Latência da requisição original (a cópia não entra, para não puxar o p95 para baixo)"""
+    def registrar(futuro):
+        if futuro.exception() is None and futuro.result().status_code == 200:
+            with _trava:
+                _latencias[classe].append(time.monotonic() - inicio)
+    return registrar
+
+def _descartar(futuro):
+    if futuro.exception() is None:
+        futuro.result().close()
+
+def _obter_com_hedge(classe, url, sessao_http, tentativas, kwargs):
+    executor = _executor_hedge()
+    original = executor.submit(_obter_da_rede, url, sessao_http, 'GET', tentativas, dict(kwargs))
+    original.add_done_callback(_registrar_latencia(classe, time.monotonic()))
+    limite = percentil_95(classe)
+    with _trava:
+        _contagem_hedge['requisicoes'] += 1
+    if limite is None:
+        return original.result()
+    try:
+        return original.result(timeout=limite)
+    except FuturesTimeout:
+        pass
+
+    with _trava:
+        permitido = _contagem_hedge['copias'] < ORCAMENTO_HEDGE * _contagem_hedge['requisicoes']
+        if permitido:
+            _contagem_hedge['copias'] += 1
+    if not permitido:
+        return original.result()
+
+    copia = executor.submit(_obter_da_rede, url, sessao_http, 'GET', tentativas, dict(kwargs))
+    pendentes = {original, copia}
+    while pendentes:
+        prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+        for futuro in prontos:
+            if futuro.exception() is None:
+                for outro in pendentes:
+                    outro.add_done_callback(_descartar)
+                if futuro is copia:
+                    with _trava:
+                        _contagem_hedge['vitorias_copia'] += 1
+                return futuro.result()
+            falha = futuro
+    return falha.result()  # as duas falharam: levanta o erro
+
+def resumo_hedge():
+    """Texto para o fim da execução (vazio se o hedge não foi usado)"""
+    with _trava:
+        contagem = dict(_contagem_hedge)
+    if not contagem['requisicoes']:
+        return ''
+    return (f"{contagem['copias']} cópias em {contagem['requisicoes']} requisições "
+            f"({contagem['vitorias_copia']} responderam antes da original)")
+
+#### ---- DOWNLOADS ---- ####
+
+def _gravar_com_taxa_minima(resposta, caminho, taxa_minima):
+    temporario = caminho + '.parcial'
+    inicio = time.monotonic()
+    recebidos = 0
+    try:
+        with open(temporario, 'wb') as f:
+            for bloco in resposta.iter_content(chunk_size=TAMANHO_BLOCO):
+                f.write(bloco)
+                recebidos += len(bloco)
+                decorrido = time.monotonic() - inicio
+                if decorrido > TOLERANCIA_TAXA and recebidos / decorrido < taxa_minima:
+                    raise DownloadLento(f'{recebidos / decorrido / 1024:.1f} KB/s após {decorrido:.0f}s')
+        os.replace(temporario, caminho)
+    finally:
+        resposta.close()
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    return recebidos
+
+def baixar(url, caminho, sessao_http=None, tentativas=None, taxa_minima=None):
+    """Baixa url para caminho em blocos. Devolve o status HTTP (o arquivo só é
+    gravado com 200); downloads travados ou lentos demais são tentados de novo."""
+    if _offline:
+        # Reextração: arquivos já baixados continuam valendo, nada novo é buscado
+        return 200 if os.path.exists(caminho) else 404
+    tentativas = tentativas or TENTATIVAS
+    taxa_minima = TAXA_MINIMA if taxa_minima is None else taxa_minima
+    for tentativa in range(1, tentativas + 1):
+        resposta = obter(url, sessao_http, stream=True)
+        if resposta.status_code != 200:
+            resposta.close()
+            return resposta.status_code
+        try:
+            _gravar_com_taxa_minima(resposta, caminho, taxa_minima)
+            return 200
+        except ERROS_TRANSITORIOS as e:
+            if tentativa == tentativas:
+                raise
+            print(f"    ⏱️ Download interrompido ({e}), nova tentativa ({tentativa}/{tentativas}): {url}")
+            _esperar(tentativa)
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import logging
+from urllib.parse import urlparse
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # sem cryptography o login é feito a cada execução
+    Fernet = None
+    InvalidToken = None
+
+# Cookies da sessão autenticada do CMS, cifrados com Fernet. A chave vem da
+# variável CMS_CHAVE_SESSAO ou é gerada uma vez em ARQUIVO_CHAVE (só o dono lê).
+ARQUIVO_SESSAO = '.sessao_cms.bin'
+ARQUIVO_CHAVE = '.sessao_cms.chave'
+VARIAVEL_CHAVE = 'CMS_CHAVE_SESSAO'
+
+def _gravar_privado(caminho, conteudo):
+    """Grava de forma atômica e com permissão 600 (lanes podem salvar ao mesmo tempo)"""
+    temporario = f"{caminho}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+    descritor = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descritor, 'wb') as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
+
+def obter_cifra(arquivo_chave=ARQUIVO_CHAVE):
+    if Fernet is None:
+        return None
+    chave = os.environ.get(VARIAVEL_CHAVE)
+    if chave:
+        return Fernet(chave.encode())
+    if not os.path.exists(arquivo_chave):
+        _gravar_privado(arquivo_chave, Fernet.generate_key())
+    with open(arquivo_chave, 'rb') as f:
+        return Fernet(f.read().strip())
+
+def salvar_cookies(cookies, url, arquivo=ARQUIVO_SESSAO):
+    try:
+        cifra = obter_cifra()
+    except ValueError as e:
+        logging.warning(f"Chave da sessão inválida ({VARIAVEL_CHAVE}), a sessão não será salva: {e}")
+        return False
+    if cifra is None:
+        logging.warning("❌ cryptography não está instalado (pip install cryptography): a sessão não será salva")
+        return False
+    conteudo = json.dumps({'url': url, 'salvo_em': time.time(), 'cookies': cookies})
+    _gravar_privado(arquivo, cifra.encrypt(conteudo.encode()))
+    return True
+
+def carregar_cookies(url, arquivo=ARQUIVO_SESSAO):
+    """Cookies ainda não expirados da sessão salva para este CMS (None se não houver)"""
+    if Fernet is None or not os.path.exists(arquivo):
+        return None
+    try:
+        # Uma chave malformada em CMS_CHAVE_SESSAO também cai aqui: login normal
+        cifra = obter_cifra()
+        with open(arquivo, 'rb') as f:
+            sessao = json.loads(cifra.decrypt(f.read()))
+    except (InvalidToken, ValueError) as e:
+        logging.warning(f"Sessão salva ilegível, será descartada: {type(e).__name__}")
+        descartar_sessao(arquivo)
+        return None
+    if urlparse(sessao.get('url', '')).netloc != urlparse(url).netloc:
+        return None
+    agora = time.time()
+    cookies = [cookie for cookie in sessao.get('cookies', []) if cookie.get('expiry', agora + 1) > agora]
+    return cookies or None
+
+def descartar_sessao(arquivo=ARQUIVO_SESSAO):
+    try:
+        os.remove(arquivo)
+    except FileNotFoundError:  # outra lane já descartou
+        pass
+
+#### ---- NAVEGADOR (SELENIUM) ---- ####
+
+def sessao_valida(navegador):
+    """Verificação barata: fora da sessão o CMS sempre mostra o formulário de login"""
+    from selenium.webdriver.common.by import By  # só aqui: o resto do módulo não precisa do selenium
+    return not navegador.find_elements(By.CSS_SELECTOR, 'input[name="email"]')
+
+def salvar_sessao(navegador, url, arquivo=ARQUIVO_SESSAO):
+    return salvar_cookies(navegador.get_cookies(), url, arquivo)
+
+def restaurar_sessao(navegador, url, arquivo=ARQUIVO_SESSAO):
+    """Coloca os cookies salvos no navegador e confere se a sessão ainda vale"""
+    cookies = carregar_cookies(url, arquivo)
+    if not cookies:
+        return False
+    # O Firefox só aceita cookies do domínio da página aberta
+    navegador.get(url)
+    for cookie in cookies:
+        if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+            cookie.pop('sameSite', None)
+        try:
+            navegador.add_cookie(cookie)
+        except Exception as e:
+            logging.warning(f"Cookie {cookie.get('name')} não restaurado: {str(e)}")
+    navegador.get(url)
+    if sessao_valida(navegador):
+        logging.info('Sessão do CMS restaurada, login dispensado')
+        return True
+    logging.info('Sessão salva expirou, será feito um novo login')
+    descartar_sessao(arquivo)
+    return False
@@ -0,0 +1,30 @@
+import os
+import json
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+import otimizar_imagens
+
+def test_imagens_com_o_mesmo_nome_nao_colidem(tmp_path):
+    """foto.png e foto.jpg na mesma notícia viram dois arquivos otimizados distintos"""
+    noticia = tmp_path / 'noticias' / 'pagina1' / 'noticia1'
+    noticia.mkdir(parents=True)
+    Image.new('RGB', (800, 600), (200, 30, 30)).save(noticia / 'foto.png')
+    Image.new('RGB', (800, 600), (30, 30, 200)).save(noticia / 'foto.jpg', quality=100)
+    with open(noticia / 'dados.json', 'w', encoding='utf-8') as f:
+        json.dump({'Imagens': 'foto.png, foto.jpg'}, f)
+
+    otimizar_imagens.processar(str(tmp_path / 'noticias'), str(tmp_path / 'cache'),
+                               dimensao_maxima=100, formato='jpeg', qualidade=80, processos=1)
+
+    with open(noticia / otimizar_imagens.ARQUIVO_MANIFESTO, 'r', encoding='utf-8') as f:
+        manifesto = json.load(f)
+    assert set(manifesto) == {'foto.png', 'foto.jpg'}
+    assert manifesto['foto.png'] != manifesto['foto.jpg']
+    for nome, otimizada in manifesto.items():
+        with Image.open(noticia / otimizada) as imagem:
+            vermelho, _, azul = imagem.convert('RGB').getpixel((0, 0))
+        assert (vermelho > azul) == (nome == 'foto.png')
+    assert not [nome for nome in os.listdir(noticia / otimizar_imagens.PASTA_OTIMIZADAS) if nome.endswith('.tmp')]
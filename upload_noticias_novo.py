@@ -1,15 +1,67 @@
 import os
+import glob
 import json
 import time
+import re
+import shutil
 import logging
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.firefox.service import Service
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.common.exceptions import NoSuchElementException
+import difflib
+import argparse
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from html import escape
+from urllib.parse import urlparse, quote
+from registro_erros import RegistroErros, carregar_para_reprocessar, ARQUIVO_ERROS, ARQUIVO_ERROS_TEXTO, PASTA_CAPTURAS
+from sessao_cms import restaurar_sessao, salvar_sessao, sessao_valida, ARQUIVO_SESSAO
+from configuracao import adicionar_argumentos, configuracao_dos_argumentos, caminho_estado
+import perfil
+
+ARQUIVO_LOG = 'log - {nome}.txt'
+# Lista de categorias do CMS salva na última sessão (uma por tipo), usada na validação offline
+ARQUIVO_CATEGORIAS = 'categorias_cms_{tipo}.json'
+# Limite conservador por arquivo enviado pelo formulário
+TAMANHO_MAXIMO_ARQUIVO = 20 * 1024 * 1024
+# Semelhança mínima (0 a 1) para aceitar uma categoria com grafia diferente
+LIMIAR_SEMELHANCA_CATEGORIA = 0.85
+# Índice local do que já existe no CMS (um arquivo por menu) e sua validade
+ARQUIVO_PUBLICADOS = 'publicados_cms_{menu}.jsonl'
+VALIDADE_PUBLICADOS = 12 * 60 * 60
+# Muda quando a leitura da listagem muda: índices locais de outra versão são relidos do CMS
+VERSAO_PUBLICADOS = 2
+MAXIMO_PAGINAS_LISTAGEM = 1000
+
+PADRAO_DATA = re.compile(r'\b(\d{2}/\d{2}/\d{4})\b')
+
+# Caminho do geckodriver resolvido na primeira execução: as seguintes não
+# consultam o webdriver_manager (nem a rede) enquanto o arquivo existir
+ARQUIVO_GECKODRIVER = '.geckodriver_caminho'
+# Requisições a estes hosts são desviadas para uma porta fechada e falham na hora
+HOSTS_BLOQUEADOS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'facebook.net',
+    'hotjar.com',
+)
+
+# Selenium só é importado quando um navegador vai ser aberto (carregar_selenium):
+# --help, --dry-run e a validação não pagam esse custo
+webdriver = By = WebDriverWait = EC = Service = Options = None
+_trava_selenium = threading.Lock()
+
+def carregar_selenium():
+    global webdriver, By, WebDriverWait, EC, Service, Options
+    with _trava_selenium:
+        if webdriver is not None:
+            return
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.firefox.service import Service
+        from selenium.webdriver.firefox.options import Options
+        from selenium import webdriver  # por último: marca o carregamento como completo
 
 #### ---- FUNÇÕES AUXILIARES ---- ####
 
@@ -21,52 +73,130 @@ def configurar_logging(pasta_nome):
     
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(message)s',
+        format='%(asctime)s - [%(threadName)s] %(message)s',
         handlers=[
-            logging.FileHandler(f'log - {pasta_nome}.txt'),
+            logging.FileHandler(ARQUIVO_LOG.format(nome=pasta_nome)),
             logging.StreamHandler()
         ]
     )
 
-def registrar_erro_em_tempo_real(pasta_base, ano, nome_arquivo, arquivo_erros='arquivos-erro.txt'):
-    """Registra um erro no arquivo em tempo real, organizado por pasta/ano."""
-    cabecalho = f"#### {os.path.basename(pasta_base)} - {ano} ####"
-    
-    # Verifica se o cabeçalho já foi escrito no arquivo
-    cabecalho_existente = False
-    if os.path.exists(arquivo_erros):
-        with open(arquivo_erros, 'r', encoding='utf-8') as f:
-            conteudo = f.read()
-            cabecalho_existente = cabecalho in conteudo
-    
-    # Escreve no arquivo (modo append)
-    with open(arquivo_erros, 'a', encoding='utf-8') as f:
-        if not cabecalho_existente:
-            f.write(f"{cabecalho}\n")
-        f.write(f"{nome_arquivo}\n")
+def arquivo_categorias(tipo):
+    return ARQUIVO_CATEGORIAS.format(tipo=normalizar_texto(tipo).replace(' ', '_'))
 
-def selecionar_categoria(navegador, nome_categoria):
+def carregar_categorias_em_cache(tipo='Noticias'):
+    """Lê as categorias salvas na última sessão (None se ainda não houver cache)"""
+    arquivo = arquivo_categorias(tipo)
+    if not os.path.exists(arquivo):
+        return None
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"Cache de categorias inválido ({arquivo}): {str(e)}")
+        return None
+
+def salvar_categorias_em_cache(categorias, tipo='Noticias'):
+    with open(arquivo_categorias(tipo), 'w', encoding='utf-8') as f:
+        json.dump(categorias, f, ensure_ascii=False, indent=2)
+
+# Categorias lidas do formulário, uma vez por sessão:
+# {(caminho do formulário, seletor): {nome normalizado: (texto, value)}}
+_categorias_por_formulario = {}
+
+SCRIPT_LER_OPCOES = """
+return Array.from(document.querySelector(arguments[0]).options)
+    .map(opcao => [opcao.text.trim(), opcao.value]);
+"""
+
+SCRIPT_DEFINIR_VALOR = """
+const select = document.querySelector(arguments[0]);
+select.value = arguments[1];
+select.dispatchEvent(new Event('change', {bubbles: true}));
+return select.value;
+"""
+
+def normalizar_texto(texto):
+    """Minúsculas, sem acentos e com espaços simples (para comparar nomes)"""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.lower().split())
+
+def indexar_categorias(opcoes):
+    """[(texto, value)] -> {nome normalizado: (texto, value)}"""
+    return {normalizar_texto(texto): (texto, valor) for texto, valor in opcoes if texto}
+
+def resolver_categoria(nome_categoria, categorias):
+    """Procura pelo nome normalizado e, se não houver, pelo mais parecido acima
+    de LIMIAR_SEMELHANCA_CATEGORIA. Retorna (texto, value) ou None."""
+    chave = normalizar_texto(nome_categoria)
+    if chave in categorias:
+        return categorias[chave]
+    parecidas = difflib.get_close_matches(chave, list(categorias), n=1, cutoff=LIMIAR_SEMELHANCA_CATEGORIA)
+    if parecidas:
+        logging.warning(f"Categoria '{nome_categoria}' aproximada para '{categorias[parecidas[0]][0]}'")
+        return categorias[parecidas[0]]
+    return None
+
+def carregar_categorias(navegador, seletor='#category_contents_id', tipo='Noticias'):
+    """Lê as opções do select na primeira vez que o formulário aparece na sessão"""
+    WebDriverWait(navegador, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, seletor))
+    )
+    chave = (urlparse(navegador.current_url).path, seletor)
+    if chave not in _categorias_por_formulario:
+        opcoes = [(texto, valor) for texto, valor in navegador.execute_script(SCRIPT_LER_OPCOES, seletor) if valor]
+        _categorias_por_formulario[chave] = indexar_categorias(opcoes)
+        # Atualiza o cache usado pela validação offline das próximas execuções
+        salvar_categorias_em_cache([texto for texto, _ in opcoes], tipo)
+        logging.info(f"{len(opcoes)} categorias carregadas do CMS")
+    return _categorias_por_formulario[chave]
+
+def selecionar_categoria(navegador, nome_categoria, seletor='#category_contents_id', tipo='Noticias'):
     try:
         logging.info(f"Selecionando categoria: {nome_categoria}")
-        categoria_select = WebDriverWait(navegador, 10).until(
-            EC.presence_of_element_located((By.XPATH, '//*[@id="category_contents_id"]'))
-        )
-        select = Select(categoria_select)
-        try:
-            select.select_by_visible_text(nome_categoria)
-            logging.info("Categoria selecionada pelo texto")
-            return True
-        except NoSuchElementException:
-            options = [option.text for option in select.options]
-            logging.warning(f"Categoria não encontrada! Opções disponíveis: {options}")
+        categorias = carregar_categorias(navegador, seletor, tipo)
+        encontrada = resolver_categoria(nome_categoria, categorias)
+        if not encontrada:
+            opcoes = [texto for texto, _ in categorias.values()]
+            logging.warning(f"Categoria não encontrada! Opções disponíveis: {opcoes}")
             return False
+        texto, valor = encontrada
+        if navegador.execute_script(SCRIPT_DEFINIR_VALOR, seletor, valor) != valor:
+            logging.error(f"O CMS não aceitou a categoria '{texto}'")
+            return False
+        logging.info(f"Categoria selecionada: {texto}")
+        return True
     except Exception as e:
         logging.error(f"Erro ao selecionar categoria: {str(e)}")
         return False
 
+def caminho_para_upload(caminho_pasta, nome_arquivo, manifesto='otimizadas.json', registrar=True):
+    """Usa a versão gerada pelo otimizar_imagens.py quando ela existir"""
+    caminho_original = os.path.join(caminho_pasta, nome_arquivo)
+    caminho_manifesto = os.path.join(caminho_pasta, manifesto)
+    if os.path.exists(caminho_manifesto):
+        try:
+            with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+                otimizado = json.load(f).get(nome_arquivo)
+            if otimizado and os.path.exists(os.path.join(caminho_pasta, otimizado)):
+                caminho_otimizado = os.path.join(caminho_pasta, otimizado)
+                if registrar:
+                    logging.info(f"Usando imagem otimizada: {otimizado} "
+                                 f"({os.path.getsize(caminho_original) // 1024} KB → "
+                                 f"{os.path.getsize(caminho_otimizado) // 1024} KB)")
+                return caminho_otimizado
+        except Exception as e:
+            logging.warning(f"Manifesto de imagens otimizadas inválido em {caminho_pasta}: {str(e)}")
+    return caminho_original
+
 def parsear_data(data_str):
     """Converte datas no formato 'terça-feira, 23 de setembro de 2025' para '23/09/2025'"""
     try:
+        # Licitações e legislações já trazem a data como dd/mm/aaaa
+        encontrada = PADRAO_DATA.search(data_str)
+        if encontrada:
+            return encontrada.group(1)
+
         if ',' in data_str:
             data_str = data_str.split(',', 1)[1].strip()
         
@@ -95,13 +225,307 @@ def parsear_data(data_str):
         logging.error(f"Erro ao parsear data: {str(e)}")
         return None
 
+def listar_imagens(dados):
+    imagens_str = dados.get('Imagens', '')
+    return [img.strip() for img in imagens_str.split(',') if img.strip()] if imagens_str else []
+
+#### ---- MAPEADORES POR TIPO DE CONTEÚDO ---- ####
+# Cada mapeador traduz o dados.json de um scraper para os campos do formulário
+# do CMS: titulo, data (dd/mm/aaaa), texto, texto_html, categoria, autor e
+# arquivos [(nome, descrição)]. 'data_original' guarda o texto para os logs.
+
+def mapear_noticia(dados):
+    """dados.json do get_noticias.py"""
+    titulo = dados.get('Titulo', '')
+    return {
+        'titulo': titulo,
+        'data_original': dados.get('Data', ''),
+        'data': parsear_data(dados['Data']) if dados.get('Data') else None,
+        'texto': dados.get('Texto', ''),
+        'texto_html': dados.get('TextoHTML', ''),
+        'categoria': dados.get('Categoria', ''),
+        'autor': dados.get('Autor', ''),
+        'arquivos': [(nome, titulo) for nome in listar_imagens(dados)],
+    }
+
+def mapear_licitacao(dados):
+    """dados.json do get_licitacoes.py: Objetivo vira o texto, os demais campos
+    uma lista no corpo, Modalidade a categoria e os Documentos os anexos"""
+    modalidade = dados.get('Modalidade', '')
+    numero = dados.get('Número da Licitação', '')
+    objetivo = dados.get('Objetivo', '')
+    detalhes = [
+        ('Modalidade', modalidade),
+        ('Número', numero),
+        ('Situação', dados.get('Situação', '')),
+        ('Unidade Gestora', dados.get('Unidade Gestora', '')),
+        ('Código da Unidade Gestora', dados.get('Código da Unidade Gestora', '')),
+        ('Publicação', dados.get('Publicação', '')),
+        ('Realização', dados.get('Realização', '')),
+    ]
+    detalhes = [(rotulo, valor) for rotulo, valor in detalhes if valor]
+    texto_html = f"<p>{escape(objetivo)}</p>" if objetivo else ''
+    if detalhes:
+        texto_html += '<ul>' + ''.join(
+            f"<li><strong>{escape(rotulo)}:</strong> {escape(valor)}</li>" for rotulo, valor in detalhes
+        ) + '</ul>'
+    return {
+        'titulo': ' '.join(filter(None, [modalidade, numero])),
+        'data_original': dados.get('Publicação', ''),
+        'data': parsear_data(dados['Publicação']) if dados.get('Publicação') else None,
+        'texto': '\n'.join([objetivo] + [f"{rotulo}: {valor}" for rotulo, valor in detalhes]).strip(),
+        'texto_html': texto_html,
+        'categoria': modalidade,
+        'autor': '',
+        'arquivos': [
+            (doc['ArquivoSalvo'], doc.get('Nome') or doc.get('Tipo') or doc['ArquivoSalvo'])
+            for doc in dados.get('Documentos', []) if doc.get('ArquivoSalvo')
+        ],
+    }
+
+PADRAO_TIPO_DE_ATO = re.compile(r'^\s*(.+?)\s+N\s*[º°o.]', re.IGNORECASE)
+
+def mapear_legislacao(dados):
+    """dados.json do get_publicacoes_legislacao.py: o tipo do ato ('LEI',
+    'DECRETO', ...) no início do título é usado como categoria"""
+    titulo = dados.get('titulo', '')
+    tipo_de_ato = PADRAO_TIPO_DE_ATO.match(titulo)
+    descricao = dados.get('descricao', '')
+    return {
+        'titulo': titulo,
+        'data_original': dados.get('data', ''),
+        'data': parsear_data(dados['data']) if dados.get('data') else None,
+        'texto': descricao or titulo,
+        'texto_html': '',
+        'categoria': tipo_de_ato.group(1) if tipo_de_ato else '',
+        'autor': '',
+        'arquivos': [(dados['arquivo'], titulo)] if dados.get('arquivo') else [],
+    }
+
+# Tipos de conteúdo que o uploader sabe cadastrar. 'secao' indica a pasta
+# (upload.pastas.<secao>) e o seletor do item no menu lateral do CMS
+# (upload.menus.<secao>) na configuração; 'obrigatorios' são os campos sem os
+# quais o registro é inválido (a categoria fora dessa lista é preenchida só
+# quando existir no CMS) e 'padrao' é onde o scraper grava cada dados.json.
+TIPOS_DE_CONTEUDO = {
+    'Noticias': {
+        'secao': 'noticias',
+        'mapear': mapear_noticia,
+        'obrigatorios': ('titulo', 'data', 'texto', 'categoria'),
+        'padrao': os.path.join('pagina*', 'noticia*', 'dados.json'),
+    },
+    'Licitações': {
+        # Usa os campos do formulário de notícias; o formulário de licitações do
+        # CMS ainda não foi conferido (por isso não há seletor de menu padrão)
+        'secao': 'licitacoes',
+        'mapear': mapear_licitacao,
+        'obrigatorios': ('titulo', 'data', 'texto'),
+        'padrao': os.path.join('Pagina*', 'licitacao*', 'dados.json'),
+    },
+    'Legislações': {
+        'secao': 'legislacoes',
+        'mapear': mapear_legislacao,
+        'obrigatorios': ('titulo', 'data'),
+        'padrao': os.path.join('*', 'dados.json'),
+    },
+}
+
+def mapear(dados, tipo):
+    return TIPOS_DE_CONTEUDO[tipo]['mapear'](dados)
+
+#### ---- PUBLICAÇÕES JÁ EXISTENTES NO CMS ---- ####
+
+SCRIPT_LER_LISTAGEM = """
+const tabela = document.querySelector('table');
+if (!tabela) return {cabecalhos: [], linhas: []};
+return {
+    cabecalhos: Array.from(tabela.querySelectorAll('thead th, thead td')).map(celula => celula.innerText.trim()),
+    linhas: Array.from(tabela.querySelectorAll('tbody tr')).map(linha =>
+        Array.from(linha.querySelectorAll('td')).map(celula => celula.innerText.trim())),
+};
+"""
+# Cabeçalhos (normalizados) das colunas de título e data na listagem do CMS
+CABECALHOS_TITULO = ('titulo', 'nome', 'assunto')
+CABECALHOS_DATA = ('data', 'data de publicacao', 'publicacao', 'publicado em')
+
+def chave_publicacao(titulo, data_publicacao):
+    """Título normalizado (como enviado, até 120 caracteres) + data dd/mm/aaaa"""
+    return f"{normalizar_texto((titulo or '')[:120])}|{data_publicacao or ''}"
+
+def colunas_listagem(cabecalhos):
+    """Posições das colunas de título e data pelo texto do cabeçalho (None se não houver)"""
+    nomes = [normalizar_texto(cabecalho) for cabecalho in cabecalhos]
+    titulo = next((i for i, nome in enumerate(nomes) if nome in CABECALHOS_TITULO), None)
+    data = next((i for i, nome in enumerate(nomes) if nome in CABECALHOS_DATA), None)
+    return titulo, data
+
+def ler_linha_listagem(celulas, coluna_titulo=None, coluna_data=None):
+    """Título e data de uma linha da tabela do CMS. Sem cabeçalho reconhecido, a
+    data é a primeira célula dd/mm/aaaa e o título a primeira célula de texto
+    que não seja número nem data"""
+    if coluna_data is not None and coluna_data < len(celulas):
+        encontrada = PADRAO_DATA.search(celulas[coluna_data])
+        data_publicacao = encontrada.group(1) if encontrada else ''
+    else:
+        data_publicacao = ''
+        for celula in celulas:
+            encontrada = PADRAO_DATA.search(celula)
+            if encontrada and len(celula) <= 20:
+                data_publicacao = encontrada.group(1)
+                break
+    if coluna_titulo is not None and coluna_titulo < len(celulas):
+        return celulas[coluna_titulo], data_publicacao
+    titulo = next((celula for celula in celulas
+                   if celula and not celula.isdigit() and not (PADRAO_DATA.search(celula) and len(celula) <= 20)), '')
+    return titulo, data_publicacao
+
+def ler_publicados_do_cms(navegador, url_listagem):
+    """Percorre a listagem paginada do CMS (?page=N) e devolve [(titulo, data)]"""
+    publicados = []
+    anterior = None
+    paginas_lidas = 0
+    separador = '&' if '?' in url_listagem else '?'
+    for pagina in range(1, MAXIMO_PAGINAS_LISTAGEM + 1):
+        navegador.get(f"{url_listagem}{separador}page={pagina}")
+        WebDriverWait(navegador, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'table'))
+        )
+        listagem = navegador.execute_script(SCRIPT_LER_LISTAGEM)
+        linhas = listagem['linhas']
+        # Página vazia ou repetida (o CMS devolve a última página para números maiores)
+        if not linhas or linhas == anterior:
+            break
+        if not paginas_lidas:
+            coluna_titulo, coluna_data = colunas_listagem(listagem['cabecalhos'])
+            if coluna_titulo is None:
+                logging.warning(f"Coluna de título não encontrada nos cabeçalhos {listagem['cabecalhos']}: "
+                                f"usando a primeira célula de texto de cada linha")
+        anterior = linhas
+        paginas_lidas += 1
+        publicados.extend(ler_linha_listagem(celulas, coluna_titulo, coluna_data) for celulas in linhas if celulas)
+    logging.info(f"{len(publicados)} publicações lidas em {paginas_lidas} páginas da listagem do CMS")
+    return publicados
+
+def carregar_publicados(navegador, url_listagem, menu, forcar_atualizacao=False):
+    """Índice das publicações existentes no CMS. Reaproveita o arquivo local
+    enquanto estiver dentro da validade; senão, relê a listagem do CMS."""
+    arquivo = ARQUIVO_PUBLICADOS.format(menu=normalizar_texto(menu).replace(' ', '_'))
+    publicados = {'arquivo': arquivo, 'chaves': set()}
+
+    if not forcar_atualizacao and os.path.exists(arquivo):
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            cabecalho = json.loads(f.readline() or '{}')
+            if (cabecalho.get('versao') == VERSAO_PUBLICADOS
+                    and time.time() - cabecalho.get('atualizado_em', 0) < VALIDADE_PUBLICADOS):
+                for linha in f:
+                    if linha.strip():
+                        publicados['chaves'].add(json.loads(linha)['chave'])
+                logging.info(f"{len(publicados['chaves'])} publicações existentes carregadas de {arquivo}")
+                return publicados
+
+    for titulo, data_publicacao in ler_publicados_do_cms(navegador, url_listagem):
+        publicados['chaves'].add(chave_publicacao(titulo, data_publicacao))
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'versao': VERSAO_PUBLICADOS, 'atualizado_em': time.time(), 'url': url_listagem}) + '\n')
+        for chave in sorted(publicados['chaves']):
+            f.write(json.dumps({'chave': chave}, ensure_ascii=False) + '\n')
+
+    # Volta para a listagem, de onde parte o fluxo de cadastro
+    navegador.get(url_listagem)
+    return publicados
+
+def registrar_publicado(publicados, titulo, data_publicacao):
+    """Marca como publicado logo após o 'Salvar', para que uma nova execução não repita"""
+    chave = chave_publicacao(titulo, data_publicacao)
+    publicados['chaves'].add(chave)
+    with open(publicados['arquivo'], 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'chave': chave}, ensure_ascii=False) + '\n')
+
+def ja_publicado(publicados, dados, tipo='Noticias'):
+    registro = mapear(dados, tipo)
+    return chave_publicacao(registro['titulo'], registro['data']) in publicados['chaves']
+
+#### ---- VALIDAÇÃO OFFLINE (ANTES DE ABRIR O NAVEGADOR) ---- ####
+
+def validar_registro(dados, caminho_pasta, tipo='Noticias', categorias=None):
+    """Confere tudo que o formulário vai exigir. Retorna (problemas, bytes_para_enviar)"""
+    problemas = []
+    registro = mapear(dados, tipo)
+    obrigatorios = TIPOS_DE_CONTEUDO[tipo]['obrigatorios']
+    for campo in obrigatorios:
+        if campo == 'data' and registro['data_original']:
+            continue  # conferida abaixo, com a mensagem certa
+        if not str(registro.get(campo) or '').strip():
+            problemas.append(f"Campo obrigatório vazio: {campo}")
+
+    if registro['data_original']:
+        if registro['data'] is None:
+            problemas.append(f"Data não reconhecida: {registro['data_original']}")
+        else:
+            try:
+                datetime.strptime(registro['data'], '%d/%m/%Y')
+            except ValueError:
+                problemas.append(f"Data inválida: {registro['data_original']}")
+
+    if (categorias is not None and 'categoria' in obrigatorios and registro['categoria']
+            and not resolver_categoria(registro['categoria'], categorias)):
+        problemas.append(f"Categoria inexistente no CMS: {registro['categoria']}")
+
+    bytes_para_enviar = 0
+    for nome_arquivo, _ in registro['arquivos']:
+        caminho_arquivo = caminho_para_upload(caminho_pasta, nome_arquivo, registrar=False)
+        if not os.path.isfile(caminho_arquivo):
+            problemas.append(f"Arquivo não encontrado: {nome_arquivo}")
+            continue
+        tamanho = os.path.getsize(caminho_arquivo)
+        if tamanho > TAMANHO_MAXIMO_ARQUIVO:
+            problemas.append(f"Arquivo com {tamanho // 1024 // 1024} MB: {nome_arquivo}")
+        bytes_para_enviar += tamanho
+
+    return problemas, bytes_para_enviar
+
+def validar_registros(caminhos_json, tipo='Noticias', categorias=None):
+    """Lê e valida todos os dados.json. Retorna ([(caminho, dados)], {caminho: problemas})"""
+    inicio = time.perf_counter()
+    validos = []
+    invalidos = {}
+    bytes_total = 0
+    if categorias is None:
+        logging.warning(f"Sem cache de categorias ({arquivo_categorias(tipo)}): categorias não serão conferidas")
+    else:
+        categorias = indexar_categorias((texto, None) for texto in categorias)
+
+    for caminho_json in caminhos_json:
+        try:
+            with open(caminho_json, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            invalidos[caminho_json] = [f"Erro ao ler JSON: {str(e)}"]
+            continue
+        problemas, bytes_para_enviar = validar_registro(dados, os.path.dirname(caminho_json), tipo, categorias)
+        if problemas:
+            invalidos[caminho_json] = problemas
+        else:
+            validos.append((caminho_json, dados))
+            bytes_total += bytes_para_enviar
+
+    for caminho_json, problemas in invalidos.items():
+        logging.warning(f"Inválido: {caminho_json}: {'; '.join(problemas)}")
+    logging.info(f"Validação de {tipo} concluída em {time.perf_counter() - inicio:.2f}s: "
+                 f"{len(validos)} válidos, {len(invalidos)} inválidos, "
+                 f"{bytes_total / 1024 / 1024:.1f} MB de arquivos para enviar")
+    return validos, invalidos
+
 #### ---- FUNÇÕES DE CADASTRO MODULARIZADAS ---- ####
 
-def cadastrar_categoria(navegador, nome_da_categoria):
+def cadastrar_categoria(navegador, nome_da_categoria, tipo='Noticias', obrigatoria=True):
     """Seleciona a categoria na página de cadastro"""
     try:
         logging.info(f'Selecionando categoria: {nome_da_categoria}')
-        if not selecionar_categoria(navegador, nome_da_categoria):
+        if not selecionar_categoria(navegador, nome_da_categoria, tipo=tipo):
+            if not obrigatoria:
+                logging.warning("Categoria não encontrada no CMS, seguindo com a categoria padrão do formulário")
+                return True
             logging.error("Falha ao selecionar categoria")
             return False
         return True
@@ -169,18 +593,46 @@ def cadastrar_data(navegador, data_publicacao):
         logging.error(f"Erro em cadastrar_data: {str(e)}")
         return False
 
-def cadastrar_texto(navegador, texto):
+# Preenche o Summernote de uma vez: usa a API do editor quando o jQuery está na
+# página e, sem ele, escreve direto no div editável e no campo original do form
+SCRIPT_PREENCHER_TEXTO = """
+const html = arguments[0];
+const editor = document.querySelector('div.note-editor');
+const original = editor ? editor.previousElementSibling : null;
+if (window.jQuery && original && jQuery(original).data('summernote')) {
+    jQuery(original).summernote('code', html);
+} else {
+    const editavel = document.querySelector('div.note-editable');
+    editavel.innerHTML = html;
+    editavel.dispatchEvent(new Event('input', {bubbles: true}));
+    if (original && 'value' in original) {
+        original.value = html;
+        original.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+}
+return document.querySelector('div.note-editable').innerHTML.trim().length;
+"""
+
+def texto_para_html(texto):
+    """Converte o texto puro em parágrafos HTML (para registros sem 'TextoHTML')"""
+    linhas = [linha.strip() for linha in texto.splitlines() if linha.strip()]
+    return ''.join(f'<p>{escape(linha)}</p>' for linha in linhas)
+
+def cadastrar_texto(navegador, texto, texto_html=''):
     """Preenche o campo de texto principal"""
     try:
         # Mostra apenas os primeiros 100 caracteres do texto no log para não poluir
         texto_preview = texto[:100] + "..." if len(texto) > 100 else texto
         logging.info(f'Preenchendo texto principal: {texto_preview}')
         
-        campo_texto = WebDriverWait(navegador, 10).until(
+        WebDriverWait(navegador, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, 'div.note-editable'))
         )
-        campo_texto.clear()
-        campo_texto.send_keys(texto)
+        conteudo = texto_html or texto_para_html(texto)
+        caracteres = navegador.execute_script(SCRIPT_PREENCHER_TEXTO, conteudo)
+        if not caracteres:
+            logging.error("Editor continuou vazio após inserir o texto")
+            return False
         return True
     except Exception as e:
         logging.error(f"Erro em cadastrar_texto: {str(e)}")
@@ -194,7 +646,7 @@ def adicionar_arquivo(nome_arquivo, navegador, caminho_pasta, titulo):
         time.sleep(2)
         
         input_arquivo = navegador.find_element(By.CLASS_NAME, 'archives')
-        caminho_arquivo = os.path.join(caminho_pasta, nome_arquivo)
+        caminho_arquivo = caminho_para_upload(caminho_pasta, nome_arquivo)
         logging.info(f"Subindo o arquivo: {caminho_arquivo}")
         input_arquivo.send_keys(caminho_arquivo)
 
@@ -228,185 +680,339 @@ def clicar_no_salvar(navegador):
         logging.error(f"Erro ao clicar no botão 'Salvar': {str(e)}")
         return False
 
-def cadastrar_publicacao_com_upload(dados, caminho_pasta, navegador):
-    """Função principal que coordena todo o processo de cadastro para uma notícia"""
+def cadastrar_publicacao_com_upload(dados, caminho_pasta, navegador, tipo='Noticias', erros=None):
+    """Função principal que coordena todo o processo de cadastro para um registro.
+    Se receber o registro de erros, anota nele a etapa que falhou."""
+    caminho_json = os.path.join(caminho_pasta, 'dados.json')
+    etapa = 'dados'
+
+    def falhou(excecao=''):
+        if erros is not None:
+            erros.registrar(caminho_json, etapa, excecao, tipo, navegador if etapa != 'dados' else None)
+        return False
+
+    if erros is not None:
+        erros.ultimo_erro.consumir()  # descarta erros de registros anteriores
     try:
-        titulo = dados['Titulo']
-        data_publicacao = parsear_data(dados['Data'])
-        texto = dados['Texto']
-        nome_da_categoria = dados['Categoria']
-        autor = dados.get('Autor', '')  # Campo opcional
-        imagens_str = dados.get('Imagens', '')
-        lista_imagens = [img.strip() for img in imagens_str.split(',')] if imagens_str else []
+        registro = mapear(dados, tipo)
+        obrigatorios = TIPOS_DE_CONTEUDO[tipo]['obrigatorios']
+        titulo = registro['titulo']
         
-        if not titulo or not data_publicacao or not texto or not nome_da_categoria:
+        if any(not registro.get(campo) for campo in obrigatorios):
             logging.warning(f"Dados incompletos em {caminho_pasta}")
-            return False
+            return falhou('Dados incompletos')
 
         titulo_truncado = titulo[:120] if len(titulo) > 120 else titulo
         if len(titulo) > 120:
             logging.warning(f"Título truncado (mais de 120 caracteres): {titulo}")
 
         # Acessar página de cadastro
+        etapa = 'abrir_cadastro'
         logging.info('Acessando página de cadastro')
-        WebDriverWait(navegador, 10).until(
-            EC.element_to_be_clickable((By.XPATH, '/html/body/div/div/section[2]/div/div/div/div[1]/div[1]/a'))
-        ).click()
-
-        # Executar fluxo de cadastro
-        steps = [
-            lambda: cadastrar_categoria(navegador, nome_da_categoria),
-            lambda: cadastrar_titulo(navegador, titulo_truncado),
-            lambda: cadastrar_autor(navegador, autor),
-            lambda: cadastrar_data(navegador, data_publicacao),
-            lambda: cadastrar_texto(navegador, texto),
+        with perfil.etapa('cms:abrir_cadastro'):
+            WebDriverWait(navegador, 10).until(
+                EC.element_to_be_clickable((By.XPATH, '/html/body/div/div/section[2]/div/div/div/div[1]/div[1]/a'))
+            ).click()
+
+        # Executar fluxo de cadastro: (nome da etapa, função)
+        steps = []
+        if registro['categoria']:
+            steps.append(('categoria', lambda: cadastrar_categoria(navegador, registro['categoria'], tipo,
+                                                                   'categoria' in obrigatorios)))
+        steps += [
+            ('titulo', lambda: cadastrar_titulo(navegador, titulo_truncado)),
+            ('autor', lambda: cadastrar_autor(navegador, registro['autor'])),
+            ('data', lambda: cadastrar_data(navegador, registro['data'])),
+            ('texto', lambda: cadastrar_texto(navegador, registro['texto'], registro['texto_html'])),
         ]
         
-        # Adicionar passos para cada imagem
-        for img in lista_imagens:
-            steps.append(lambda img=img: adicionar_arquivo(img, navegador, caminho_pasta, titulo))
+        # Adicionar passos para cada imagem ou documento
+        for nome_arquivo, descricao in registro['arquivos']:
+            steps.append((f'arquivo:{nome_arquivo}',
+                          lambda nome_arquivo=nome_arquivo, descricao=descricao:
+                          adicionar_arquivo(nome_arquivo, navegador, caminho_pasta, descricao)))
         
-        steps.append(lambda: clicar_no_salvar(navegador))
+        steps.append(('salvar', lambda: clicar_no_salvar(navegador)))
         
-        for step in steps:
-            if not step():
-                logging.error("Interrompendo processo devido a erro em uma das etapas")
-                return False
+        for etapa, step in steps:
+            # Os arquivos somam numa etapa só ('arquivo:foto.jpg' -> 'cms:arquivo')
+            with perfil.etapa('cms:' + etapa.split(':')[0]):
+                concluida = step()
+            if not concluida:
+                logging.error(f"Interrompendo processo devido a erro na etapa '{etapa}'")
+                return falhou()
                 
         time.sleep(2)
         return True
         
     except Exception as e:
-        logging.error(f"Erro ao processar a notícia em {caminho_pasta}: {str(e)}")
-        return False
+        logging.error(f"Erro ao processar o registro em {caminho_pasta}: {str(e)}")
+        return falhou(e)
 
 #### ---- FUNÇÕES DE PROCESSAMENTO ---- ####
 
-def processar_pastas(pasta_base, navegador):
-    erros_por_pasta = {}
+def listar_registros(pasta_base, tipo='Noticias'):
+    """Encontra os dados.json do tipo na pasta_base, ordenados por página"""
+    # Só as pastas que o scraper do tipo cria: a pasta de notícias é a raiz do
+    # projeto, que também guarda as de licitações e legislações
+    caminhos_json = glob.glob(os.path.join(pasta_base, TIPOS_DE_CONTEUDO[tipo]['padrao']))
+    
+    # Ordena as pastas numericamente (pagina1, pagina2, ..., pagina10)
+    caminhos_json.sort(key=lambda path: [
+        int(parte) if parte.isdigit() else parte.lower()
+        for parte in re.split(r'(\d+)', os.path.relpath(path, pasta_base))
+    ])
+    return caminhos_json
+
+def processar_pastas(pasta_base, navegador, registros=None, publicados=None, tipo='Noticias', erros=None):
+    """Cadastra os registros já validados (valida a pasta_base se não vierem prontos),
+    pulando os que já existem no CMS. Retorna quantos falharam."""
+    falhas = 0
     try:
-        # Lista para armazenar todos os caminhos de dados.json
-        caminhos_json = []
+        if registros is None:
+            registros, invalidos = validar_registros(listar_registros(pasta_base, tipo), tipo,
+                                                     carregar_categorias_em_cache(tipo))
+            falhas += len(invalidos)
+            if erros is not None:
+                for caminho_json, problemas in invalidos.items():
+                    erros.registrar(caminho_json, 'validacao', '; '.join(problemas), tipo)
         
-        # Percorre a pasta_base e encontra todos os dados.json
-        for root, _, files in os.walk(pasta_base):
-            if 'dados.json' in files:
-                caminhos_json.append(os.path.join(root, 'dados.json'))
+        if publicados is not None:
+            pendentes = [(caminho_json, dados) for caminho_json, dados in registros
+                         if not ja_publicado(publicados, dados, tipo)]
+            logging.info(f"{len(registros) - len(pendentes)} registros já existem no CMS e serão pulados")
+            registros = pendentes
+
+        total = len(registros)
+        logging.info(f"Total de registros válidos para cadastro: {total}")
         
-        # Ordena as pastas numericamente (pagina1, pagina2, ...)
-        caminhos_json.sort(key=lambda path: (
-            int(os.path.basename(
-                os.path.dirname(
-                    os.path.dirname(path)
-                )
-            ).replace('pagina', ''))
-        ))
-        
-        total = len(caminhos_json)
-        logging.info(f"Total de notícias encontradas: {total}")
-        
-        for i, caminho_json in enumerate(caminhos_json, 1):
+        for i, (caminho_json, dados) in enumerate(registros, 1):
             logging.info(f"\n{'='*30}")
-            logging.info(f"Processando notícia {i} de {total}")
+            logging.info(f"Processando {tipo} {i} de {total}")
             logging.info(f"Caminho: {caminho_json}")
             logging.info(f"{'='*30}\n")
             
-            try:
-                with open(caminho_json, 'r', encoding='utf-8') as f:
-                    dados = json.load(f)
-                # Log dos dados que serão processados
-                logging.info(f"Dados da notícia: Título='{dados['Titulo']}', Categoria='{dados['Categoria']}', Autor='{dados.get('Autor', 'N/A')}'")
-            except Exception as e:
-                logging.error(f"Erro ao ler {caminho_json}: {str(e)}")
-                erros_por_pasta.setdefault(os.path.dirname(caminho_json), []).append(caminho_json)
-                continue
+            # Log dos dados que serão processados
+            registro = mapear(dados, tipo)
+            logging.info(f"Dados do registro: Título='{registro['titulo']}', Categoria='{registro['categoria']}', Autor='{registro['autor'] or 'N/A'}'")
                 
-            # A pasta da notícia é o diretório que contém o dados.json
-            pasta_noticia = os.path.dirname(caminho_json)
-            sucesso = cadastrar_publicacao_com_upload(dados, pasta_noticia, navegador)
+            # A pasta do registro é o diretório que contém o dados.json
+            pasta_registro = os.path.dirname(caminho_json)
+            sucesso = cadastrar_publicacao_com_upload(dados, pasta_registro, navegador, tipo, erros)
             if not sucesso:
-                erros_por_pasta.setdefault(pasta_noticia, []).append(caminho_json)
+                falhas += 1
+            elif publicados is not None:
+                registrar_publicado(publicados, registro['titulo'], registro['data'])
                 
     except Exception as e:
         logging.error(f"Erro ao processar pastas: {str(e)}")
         
-    return erros_por_pasta
+    return falhas
+
+#### ---- EXECUÇÃO EM LANES PARALELAS (UM NAVEGADOR POR TIPO) ---- ####
+
+_trava_geckodriver = threading.Lock()
+
+def caminho_geckodriver():
+    """Caminho do geckodriver fixado em ARQUIVO_GECKODRIVER (apague o arquivo para atualizar).
+    Sem ele, usa o geckodriver do PATH; o webdriver_manager (que consulta a rede)
+    só é importado e chamado se nenhum dos dois existir."""
+    with _trava_geckodriver:
+        if os.path.exists(ARQUIVO_GECKODRIVER):
+            with open(ARQUIVO_GECKODRIVER, 'r', encoding='utf-8') as f:
+                caminho = f.read().strip()
+            if os.path.isfile(caminho):
+                return caminho
+        caminho = shutil.which('geckodriver')
+        if caminho is None:
+            from webdriver_manager.firefox import GeckoDriverManager
+            caminho = GeckoDriverManager().install()
+        with open(ARQUIVO_GECKODRIVER, 'w', encoding='utf-8') as f:
+            f.write(caminho)
+        logging.info(f"geckodriver fixado em {caminho}")
+        return caminho
+
+def script_pac(hosts):
+    """Proxy auto-config que manda os hosts bloqueados para uma porta fechada"""
+    condicoes = ' || '.join(f'dnsDomainIs(host, "{host}")' for host in hosts)
+    return ('function FindProxyForURL(url, host) { '
+            f'if ({condicoes}) return "PROXY 127.0.0.1:9"; '
+            'return "DIRECT"; }')
+
+def criar_navegador(headless=True, bloquear_recursos=True):
+    """Firefox com perfil de desempenho: sem janela, sem esperar o 'load' da
+    página (os WebDriverWait já esperam cada elemento) e sem imagens, fontes
+    e scripts de analytics, que o cadastro não usa."""
+    carregar_selenium()
+    opcoes = Options()
+    opcoes.page_load_strategy = 'eager'
+    if headless:
+        opcoes.add_argument('-headless')
+    if bloquear_recursos:
+        opcoes.set_preference('permissions.default.image', 2)
+        opcoes.set_preference('browser.display.use_document_fonts', 0)
+        opcoes.set_preference('network.proxy.type', 2)
+        opcoes.set_preference('network.proxy.autoconfig_url',
+                              'data:text/javascript,' + quote(script_pac(HOSTS_BLOQUEADOS)))
+
+    servico = Service(caminho_geckodriver())
+    navegador = webdriver.Firefox(service=servico, options=opcoes)
+    if headless:
+        navegador.set_window_size(1366, 900)  # layout de desktop e capturas de erro legíveis
+    return navegador
+
+def fazer_login(navegador, url, email, password):
+    logging.info('Acessando o CMS')
+    navegador.get(url)
+    navegador.find_element(By.CSS_SELECTOR, 'input[name="email"]').send_keys(email)
+    navegador.find_element(By.CSS_SELECTOR, 'input[name="password"]').send_keys(password)
+    navegador.find_element(By.XPATH, '/html/body/div/div/div[2]/form/div[3]/div[2]/button').click()
+    WebDriverWait(navegador, 15).until(sessao_valida)
+
+def entrar_no_cms(navegador, url, email, password):
+    """Reaproveita a sessão salva; só digita email e senha quando ela expirou"""
+    if restaurar_sessao(navegador, url, ARQUIVO_SESSAO):
+        return
+    fazer_login(navegador, url, email, password)
+    if salvar_sessao(navegador, url, ARQUIVO_SESSAO):
+        logging.info('Sessão do CMS salva para as próximas execuções')
+
+def abrir_menu(navegador, tipo, menu_css):
+    logging.info(f'Clicando em {tipo}')
+    WebDriverWait(navegador, 5).until(
+        EC.element_to_be_clickable((By.CSS_SELECTOR, menu_css))
+    ).click()
+    WebDriverWait(navegador, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, 'table'))
+    )
 
-def escrever_arquivo_erros(erros_global):
-    """Função opcional para gerar um arquivo consolidado ao final"""
-    with open('arquivos-erro-consolidado.txt', 'w', encoding='utf-8') as f:
-        for (pasta_base, pasta), arquivos in erros_global.items():
-            f.write(f"#### {pasta_base} - {pasta} ####\n")
-            for arquivo in arquivos:
-                f.write(f"{arquivo}\n")
-            f.write("\n")
+def executar_lane(tipo, caminho_base, registros, url, email, password, atualizar_publicados=False, erros=None,
+                  opcoes_navegador=None, menu_css=''):
+    """Cadastra um tipo de conteúdo num navegador próprio. Retorna quantos registros falharam."""
+    threading.current_thread().name = tipo
+    navegador = None
+    try:
+        logging.info('# INICIANDO O NAVEGADOR #')
+        with perfil.etapa('cms:navegador'):
+            navegador = criar_navegador(**(opcoes_navegador or {}))
+        with perfil.etapa('cms:login'):
+            entrar_no_cms(navegador, url, email, password)
+            abrir_menu(navegador, tipo, menu_css)
+
+        # Índice do que já está no CMS: torna a execução segura para repetir
+        url_listagem = navegador.current_url.split('?')[0]
+        with perfil.etapa('cms:publicados'):
+            publicados = carregar_publicados(navegador, url_listagem, tipo, atualizar_publicados)
+
+        falhas = processar_pastas(caminho_base, navegador, registros, publicados, tipo, erros)
+        logging.info(f"Processo concluído para {tipo}!")
+        return falhas
+    except Exception as e:
+        logging.error(f"Erro fatal no processamento de {tipo}: {str(e)}")
+        # Nada foi cadastrado nesta lane: todos os registros voltam como pendentes
+        if erros is not None:
+            for caminho_json, _ in registros:
+                erros.registrar(caminho_json, 'inicializacao', e, tipo)
+        return len(registros)
+    finally:
+        if navegador is not None:
+            navegador.quit()
 
 #### ---- EXECUÇÃO PRINCIPAL ---- ####
 if __name__ == "__main__":
-    erros_global = {}
+    parser = adicionar_argumentos(argparse.ArgumentParser(description='Cadastra no CMS os registros coletados'))
+    parser.add_argument('--tipo', action='append', choices=list(TIPOS_DE_CONTEUDO),
+                        help='Tipo de conteúdo a cadastrar (repita para rodar vários em paralelo)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Só valida os dados.json, sem abrir o navegador')
+    parser.add_argument('--atualizar-publicados', action='store_true',
+                        help='Relê a listagem do CMS mesmo com o índice local dentro da validade')
+    parser.add_argument('--visivel', action='store_true',
+                        help='Abre o Firefox com janela (por padrão roda sem interface)')
+    parser.add_argument('--sem-bloqueio', action='store_true',
+                        help='Carrega imagens, fontes e analytics nas páginas do CMS')
+    parser.add_argument('--reprocessar', nargs='?', const=ARQUIVO_ERROS, metavar='ARQUIVO',
+                        help=f'Tenta de novo só o que falhou na última execução (padrão: {ARQUIVO_ERROS})')
+    perfil.adicionar_argumento(parser)
+    args = parser.parse_args()
+    perfil.iniciar(args.perfil)
+
     try:
-        # Configurações fixas
-        url = 'https://juareztavora.maximatecnologia.com.br/cms/'
-        email = 'suporte@maxima.inf.br'
-        password = 'r<nO$=33rc3M}'
-        caminho_base = '/home/newton/juarez_tavora/Noticias'
-        menu_do_cms = 'Noticias'  # Fixamos o menu em Publicações
+        # Configuração: arquivo + ambiente + --set; a senha só vem do ambiente (CMS_SENHA)
+        config = configuracao_dos_argumentos(args)
+        url = config['cms']['url']
+        email = config['cms']['email']
+        password = config['cms']['senha']
+        tipos = list(dict.fromkeys(args.tipo or ['Noticias']))
+        pastas = {tipo: config['upload']['pastas'][TIPOS_DE_CONTEUDO[tipo]['secao']] for tipo in tipos}
+        menus = {tipo: config['upload']['menus'].get(TIPOS_DE_CONTEUDO[tipo]['secao'], '') for tipo in tipos}
+
+        # Arquivos de estado separados por instância
+        ARQUIVO_LOG = caminho_estado(config, ARQUIVO_LOG)
+        ARQUIVO_CATEGORIAS = caminho_estado(config, ARQUIVO_CATEGORIAS)
+        ARQUIVO_PUBLICADOS = caminho_estado(config, ARQUIVO_PUBLICADOS)
+        ARQUIVO_SESSAO = caminho_estado(config, ARQUIVO_SESSAO)
         
-        pasta_nome = os.path.basename(caminho_base)
-        configurar_logging(pasta_nome)
+        nome_execucao = '_'.join(tipos)
+        configurar_logging(nome_execucao)
+
+        if not args.dry_run and not (email and password):
+            logging.error('Credenciais do CMS ausentes: defina CMS_EMAIL e CMS_SENHA no ambiente')
+            raise SystemExit(1)
+        sem_menu = [tipo for tipo in tipos if not menus[tipo]]
+        if not args.dry_run and sem_menu:
+            for tipo in sem_menu:
+                logging.error(f'Seletor do menu de {tipo} no CMS não configurado: use '
+                              f'--set upload.menus.{TIPOS_DE_CONTEUDO[tipo]["secao"]}=<seletor CSS>')
+            raise SystemExit(1)
         
         logging.info(f'\n{"#"*50}')
-        logging.info(f'INICIANDO PROCESSAMENTO PARA: {pasta_nome}')
-        logging.info(f'Menu CMS: {menu_do_cms}')
+        logging.info(f'INICIANDO PROCESSAMENTO PARA: {", ".join(tipos)}')
         logging.info(f'{"#"*50}\n')
-        
-        try:
-            logging.info('# INICIANDO O NAVEGADOR #')
-            servico = Service(GeckoDriverManager().install())
-            navegador = webdriver.Firefox(service=servico)
 
-            logging.info('Acessando o CMS')
-            navegador.get(url)
-            navegador.find_element(By.CSS_SELECTOR, 'input[name="email"]').send_keys(email)
-            navegador.find_element(By.CSS_SELECTOR, 'input[name="password"]').send_keys(password)
-            navegador.find_element(By.XPATH, '/html/body/div/div/div[2]/form/div[3]/div[2]/button').click()
+        # Lida antes de abrir o registro desta execução, que vira a "última"
+        caminhos_por_tipo = {}
+        for tipo in tipos:
+            if args.reprocessar:
+                arquivo = caminho_estado(config, ARQUIVO_ERROS) if args.reprocessar == ARQUIVO_ERROS else args.reprocessar
+                caminhos_por_tipo[tipo] = carregar_para_reprocessar(arquivo, tipo=tipo)
+                logging.info(f"{len(caminhos_por_tipo[tipo])} registros de {tipo} para reprocessar")
+            else:
+                caminhos_por_tipo[tipo] = listar_registros(pastas[tipo], tipo)
+
+        with RegistroErros(caminho_estado(config, ARQUIVO_ERROS), caminho_estado(config, ARQUIVO_ERROS_TEXTO),
+                           caminho_estado(config, PASTA_CAPTURAS)) as erros:
+            # Validação offline: só o que pode ser cadastrado chega ao navegador
+            registros_por_tipo = {}
+            for tipo in tipos:
+                registros, invalidos = validar_registros(caminhos_por_tipo[tipo], tipo,
+                                                         carregar_categorias_em_cache(tipo))
+                registros_por_tipo[tipo] = registros
+                for caminho_json, problemas in invalidos.items():
+                    erros.registrar(caminho_json, 'validacao', '; '.join(problemas), tipo)
+
+            if args.dry_run:
+                logging.info('Modo --dry-run: nenhum registro foi enviado ao CMS')
+                raise SystemExit(0 if not erros.total else 1)
             
-            if menu_do_cms == 'Noticias':
-                logging.info('Clicando em Noticias')
-                WebDriverWait(navegador, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, '.fa-fw.fa-newspaper-o'))
-                ).click()
-
-            if menu_do_cms == 'Publicações':
-                logging.info('Clicando em Publicações')
-                WebDriverWait(navegador, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, '.fa-fw.fa-book'))
-                ).click()
-
-            erros_pasta = processar_pastas(caminho_base, navegador)
-            for pasta, arquivos in erros_pasta.items():
-                erros_global[(pasta_nome, pasta)] = arquivos
-
-            navegador.quit()
-            logging.info(f"Processo concluído para {pasta_nome}!")
-
-        except Exception as e:
-            logging.error(f"Erro fatal no processamento de {pasta_nome}: {str(e)}")
-            if 'navegador' in locals():
-                navegador.quit()
-
-        # Opcional: Gera um arquivo consolidado ao final
-        escrever_arquivo_erros(erros_global)
+            # Uma lane (thread + navegador) por tipo de conteúdo
+            with ThreadPoolExecutor(max_workers=len(tipos)) as pool:
+                futuros = [
+                    pool.submit(perfil.perfilado(executar_lane), tipo, pastas[tipo], registros_por_tipo[tipo],
+                                url, email, password, args.atualizar_publicados, erros,
+                                {'headless': not args.visivel, 'bloquear_recursos': not args.sem_bloqueio},
+                                menus[tipo])
+                    for tipo in tipos
+                ]
+                for futuro in as_completed(futuros):
+                    futuro.result()
+
+            logging.info(f"{erros.total} falhas registradas em {erros.arquivo} "
+                         f"(use --reprocessar para tentar de novo)")
 
     except Exception as e:
         logging.error(f"Erro na inicialização: {str(e)}")
 
-
-
-
-
-
-
 '''
 import os
 import json
@@ -750,8 +1356,8 @@ if __name__ == "__main__":
     try:
         # Configurações fixas
         url = 'https://juareztavora.maximatecnologia.com.br/cms/'
-        email = 'suporte@maxima.inf.br'
-        password = 'r<nO$=33rc3M}'
+        email = os.environ.get('CMS_EMAIL', '')
+        password = os.environ.get('CMS_SENHA', '')
         caminho_base = '/home/newton/juarez_tavora/Noticias'
         menu_do_cms = 'Noticias'  # Fixamos o menu em Publicações
         